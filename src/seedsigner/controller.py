@@ -113,6 +113,7 @@ class Controller(Singleton):
     psbt_seed: Seed = None
     psbt_wif = None
     psbt_parser: PSBTParser = None
+    psbt_qr_type: str = None        # QRType the PSBT arrived as; the signed PSBT goes back out the same way
 
     unverified_address = None
 
@@ -190,6 +191,7 @@ class Controller(Singleton):
         controller.psbt_seed = None
         controller.psbt_wif = None
         controller.psbt_parser = None
+        controller.psbt_qr_type = None
 
         # Configure the Renderer
         Renderer.configure_instance()
@@ -317,6 +319,7 @@ class Controller(Singleton):
                     self.psbt_parser = None
                     self.psbt_seed = None
                     self.psbt_wif = None
+                    self.psbt_qr_type = None
                 
                 logger.info(f"\nback_stack: {self.back_stack}")
 
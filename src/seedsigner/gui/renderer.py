@@ -80,7 +80,8 @@ class Renderer(ConfigurableSingleton):
             # Always write to the current canvas, rather than trying to replace it
             self.canvas.paste(image)
 
-        self.disp.show_image(self.canvas, 0, 0)
+        # Only send the parts of the canvas that changed since the last update
+        self.disp.show_image_windows(self.canvas, self.disp.get_dirty_windows(self.canvas))
 
 
     def show_image_pan(self, image, start_x, start_y, end_x, end_y, rate, alpha_overlay=None):
@@ -7,6 +7,10 @@ from PIL import Image, ImageDraw
 from seedsigner.gui import renderer
 from seedsigner.gui.components import GUIConstants, Fonts, resize_image_to_fill
 from seedsigner.models.decode_qr import DecodeQR
+from seedsigner.models.decode_qr_pool import DecodeQRPool
+from seedsigner.models.scan_frame_decoder import ScanFrameDecoder
+from seedsigner.models.scan_governor import ScanGovernor
+from seedsigner.models.settings import Settings, SettingsConstants
 from seedsigner.models.threads import BaseThread, ThreadsafeCounter
 
 from .screen import BaseScreen
@@ -25,25 +29,17 @@ class ScanScreen(BaseScreen):
     All of this would ideally be rewritten as in C/C++/Rust with python bindings for
     vastly improved performance.
 
-    Until then, we have to balance the resources the Pi Zero has to work with. Thus, we
-    set a modest fps target for the camera: 5fps. At this pace, the decoder and the live
-    display can more or less keep up with the flow of frames without much wasted effort
-    in any of the threads.
-
-    Note: performance tuning was targeted for the Pi Zero.
-
-    The resolution (480x480) has not been tweaked in order to guarantee that our
-    decoding abilities remain as-is. It's possible that more optimizations could be made
-    here (e.g. higher res w/no performance impact? Lower res w/same decoding but faster
-    performance? etc).
+    Until then, we have to balance the resources each Pi model has to work with. The
+    camera starts at a modest 480x480 @ 6fps, the setting originally tuned for the Pi
+    Zero. From there a ScanGovernor watches how the decoder is keeping up and adjusts:
+    throttling the live preview when zbar falls behind, and moving the camera between
+    resolution/framerate profiles (see `ScanGovernor.PROFILES`).
 
     Note: This is quite a lot of important tasks for a Screen to be managing; much of
     this should probably be refactored into the Controller.
     """
     decoder: DecodeQR = None
     instructions_text: str = None
-    resolution: tuple[int,int] = (480, 480)
-    framerate: int = 6  # TODO: alternate optimization for Pi Zero 2W?
     render_rect: tuple[int,int,int,int] = None
 
     FRAME__ADDED_PART = 1
@@ -58,10 +54,15 @@ class ScanScreen(BaseScreen):
         # TODO: Arrange this with UI elements rather than text
         self.instructions_text = "< " + _("back") + "  |  " + _(self.instructions_text)
 
+        self.governor = ScanGovernor()
         self.camera = Camera.get_instance()
-        self.camera.start_video_stream_mode(resolution=self.resolution, framerate=self.framerate, format="rgb")
+        self.camera.start_video_stream_mode(resolution=self.governor.profile.resolution, framerate=self.governor.profile.framerate, format="rgb")
+
+        # Set up in _run() so that it's always cleaned up
+        self.decode_pool = None
 
         self.frames_decode_status = ThreadsafeCounter()
+        self.preview_frame_interval = ThreadsafeCounter(initial_value=self.governor.preview_frame_interval)
 
         self.threads.append(ScanScreen.LivePreviewThread(
             decoder=self.decoder,
@@ -69,11 +70,12 @@ class ScanScreen(BaseScreen):
             instructions_text=self.instructions_text,
             render_rect=self.render_rect,
             frame_decode_status=self.frames_decode_status,
+            preview_frame_interval=self.preview_frame_interval,
         ))
 
 
     class LivePreviewThread(BaseThread):
-        def __init__(self, decoder: DecodeQR, renderer: renderer.Renderer, instructions_text: str, render_rect: tuple[int,int,int,int], frame_decode_status: ThreadsafeCounter):
+        def __init__(self, decoder: DecodeQR, renderer: renderer.Renderer, instructions_text: str, render_rect: tuple[int,int,int,int], frame_decode_status: ThreadsafeCounter, preview_frame_interval: ThreadsafeCounter):
             from seedsigner.hardware.camera import Camera
 
             self.camera = Camera.get_instance()
@@ -85,6 +87,7 @@ class ScanScreen(BaseScreen):
             else:
                 self.render_rect = (0, 0, self.renderer.canvas_width, self.renderer.canvas_height)
             self.frame_decode_status = frame_decode_status
+            self.preview_frame_interval = preview_frame_interval
             self.render_width = self.render_rect[2] - self.render_rect[0]
             self.render_height = self.render_rect[3] - self.render_rect[1]
             self.decoder_fps = "0.0"
@@ -100,8 +103,12 @@ class ScanScreen(BaseScreen):
             progress_text_width = right - left
 
             num_frames = 0
+            seq_num = 0
             while self.keep_running:
-                frame = self.camera.read_video_stream(as_image=True)
+                # Wait for a frame we haven't displayed yet; always skip ahead to the
+                # newest one. When the decoder is struggling the governor has us skip
+                # frames to free up CPU for it.
+                (seq_num, frame) = self.camera.read_next_video_frame(seq_num + self.preview_frame_interval.cur_count - 1, as_image=True, newest=True)
                 if frame is not None:
                     num_frames += 1
                     
@@ -232,35 +239,54 @@ class ScanScreen(BaseScreen):
         from seedsigner.models.decode_qr import DecodeQRStatus
 
         num_frames = 0
+        seq_num = 0
         start_time = time.time()
-        while True:
-            frame = self.camera.read_video_stream()
-            if frame is not None:
-                status = self.decoder.add_image(frame)
-
-                num_frames += 1
-                decoder_fps = f"{num_frames / (time.time() - start_time):0.2f}"
-                self.threads[0].decoder_fps = decoder_fps
-
-                if status in (DecodeQRStatus.COMPLETE, DecodeQRStatus.INVALID):
-                    self.camera.stop_video_stream_mode()
-                    break
-
-                # Notify the live preview thread how our most recent decode went
-                if status == DecodeQRStatus.FALSE:
-                    # Did not find anything to decode in the current frame
-                    self.frames_decode_status.set_value(self.FRAME__MISS)
-
-                else:
-                    if status == DecodeQRStatus.PART_COMPLETE:
-                        # We received a valid frame that added new data
-                        self.frames_decode_status.set_value(self.FRAME__ADDED_PART)
-
-                    elif status == DecodeQRStatus.PART_EXISTING:
-                        # We received a valid frame, but we've already seen in
-                        self.frames_decode_status.set_value(self.FRAME__REPEATED_PART)
-                
+        try:
+            # Optionally spread zbar decoding across the Pi's other cores. Slots must fit
+            # frames from any of the governor's profiles.
+            num_decode_workers = DecodeQRPool.get_num_workers(Settings.get_instance().get_value(SettingsConstants.SETTING__DECODE_WORKERS))
+            self.decode_pool = DecodeQRPool.get_instance(num_workers=num_decode_workers, frame_size=self.governor.max_resolution)
+            frame_decoder = ScanFrameDecoder(camera=self.camera, decoder=self.decoder, governor=self.governor, decode_pool=self.decode_pool)
+
+            while True:
+                # Checked on every pass, including ones where the camera didn't deliver a
+                # frame (e.g. it's stalled or restarting), so the user can always back out.
                 if self.hw_inputs.check_for_low(HardwareButtonsConstants.KEY_RIGHT) or self.hw_inputs.check_for_low(HardwareButtonsConstants.KEY_LEFT):
                     self.camera.stop_video_stream_mode()
                     return False
 
+                # Waits for a frame we haven't decoded yet. With decode workers, the
+                # statuses are for whichever earlier frames have finished since the last
+                # pass, in frame order.
+                (seq_num, luminance) = self.camera.read_next_video_frame(seq_num, as_luminance=True)
+                for (frame_seq_num, status) in frame_decoder.decode_frame(seq_num, luminance):
+                    num_frames += 1
+                    decoder_fps = f"{num_frames / (time.time() - start_time):0.2f}"
+                    self.threads[0].decoder_fps = decoder_fps
+
+                    if status in (DecodeQRStatus.COMPLETE, DecodeQRStatus.INVALID):
+                        self.camera.stop_video_stream_mode()
+                        return
+
+                    self.preview_frame_interval.set_value(self.governor.preview_frame_interval)
+
+                    # Notify the live preview thread how our most recent decode went
+                    if status == DecodeQRStatus.FALSE:
+                        # Did not find anything to decode in the current frame
+                        self.frames_decode_status.set_value(self.FRAME__MISS)
+
+                    else:
+                        if status == DecodeQRStatus.PART_COMPLETE:
+                            # We received a valid frame that added new data
+                            self.frames_decode_status.set_value(self.FRAME__ADDED_PART)
+
+                        elif status == DecodeQRStatus.PART_EXISTING:
+                            # We received a valid frame, but we've already seen in
+                            self.frames_decode_status.set_value(self.FRAME__REPEATED_PART)
+
+        finally:
+            if self.decode_pool:
+                # The workers stay up for the next scan; just drop this one's frames
+                self.decode_pool.reset()
+                self.decode_pool = None
+
@@ -1,5 +1,6 @@
 import math
 import logging
+import threading
 import time
 
 from dataclasses import dataclass, field
@@ -13,7 +14,9 @@ from seedsigner.gui.components import (GUIConstants,
     SeedSignerIconConstants, TopNav, TextArea, load_image)
 from seedsigner.gui.keyboard import Keyboard, TextEntryDisplay
 from seedsigner.hardware.buttons import HardwareButtonsConstants, HardwareButtons
-from seedsigner.models.encode_qr import BaseQrEncoder
+from seedsigner.helpers.qr import QR
+from seedsigner.models.encode_qr import BaseFountainQrEncoder, BaseQrEncoder
+from seedsigner.models.frame_scheduler import FrameScheduler
 from seedsigner.models.settings import SettingsConstants
 from seedsigner.models.threads import BaseThread, ThreadsafeCounter
 
@@ -742,15 +745,110 @@ class LargeButtonScreen(BaseTopNavScreen):
 @dataclass
 class QRDisplayScreen(BaseScreen):
     qr_encoder: BaseQrEncoder = None
+    target_fps: float = None                # default: SETTING__QR_ANIMATION_FPS
+    extra_fountain_parts: int = None        # fountain parts cached beyond the first full cycle; default: 2 * seq_len
+    max_cached_frames: int = 500
+
+    class QRFrameProducerThread(BaseThread):
+        """
+            Renders the encoder's parts ahead of the display thread as compact,
+            one-pixel-per-module palette images (see `QR.qrimage_palette()`).
+
+            If the animation's loop (one full cycle of `seq_len` parts, plus
+            `extra_fountain_parts` more parts for fountain-coded QRs) fits in
+            `max_cached_frames`, it is rendered once and then replayed. Otherwise parts
+            are rendered continuously into a buffer of up to `max_cached_frames`.
+
+            A fountain-coded loop needs those extra parts: a scanner that misses a
+            pure part otherwise has to wait a whole loop to see it again, whereas any
+            new mixed part can fill the gap. With 20% of frames lost, a loop of
+            3 * `seq_len` parts completes about as fast as endless new parts (see
+            tools/benchmarks/channel.py).
+        """
+        def __init__(self, qr_encoder: BaseQrEncoder, border: int, extra_fountain_parts: int, max_cached_frames: int):
+            super().__init__()
+            self.qr_encoder = qr_encoder
+            self.border = border
+            self.max_cached_frames = max_cached_frames
+
+            num_loop_frames = qr_encoder.seq_len()
+            if isinstance(qr_encoder, BaseFountainQrEncoder):
+                if extra_fountain_parts is None:
+                    extra_fountain_parts = 2 * num_loop_frames
+                num_loop_frames += extra_fountain_parts
+            self.num_loop_frames = num_loop_frames if num_loop_frames <= max_cached_frames else None
+
+            self.frames: List[Image.Image] = []
+            self.num_discarded_frames = 0
+            self.condition = threading.Condition()
+
+
+        @property
+        def is_looping(self) -> bool:
+            return self.num_loop_frames is not None
+
+
+        @property
+        def is_complete(self) -> bool:
+            """ True once the whole loop is cached """
+            return self.is_looping and len(self.frames) == self.num_loop_frames
+
+
+        def run(self):
+            while self.keep_running:
+                with self.condition:
+                    if self.is_complete:
+                        # Nothing left to do
+                        break
+
+                    if not self.is_looping and len(self.frames) >= self.max_cached_frames:
+                        # Wait for the display thread to consume some frames
+                        self.condition.wait(timeout=0.1)
+                        continue
+
+                frame = self.qr_encoder.part_to_palette_image(self.qr_encoder.next_part(), border=self.border)
+
+                with self.condition:
+                    self.frames.append(frame)
+                    self.condition.notify_all()
+
+
+        def get_frame(self, frame_num: int, timeout: float) -> Image.Image:
+            """
+                Returns the animation's `frame_num`th frame, waiting up to `timeout`
+                seconds for it to be rendered (None if it still isn't ready).
+
+                When streaming, `frame_num` must not go backwards; earlier frames are
+                discarded.
+            """
+            with self.condition:
+                if self.is_looping:
+                    index = frame_num % self.num_loop_frames
+                else:
+                    if frame_num > self.num_discarded_frames:
+                        num_consumed = min(frame_num - self.num_discarded_frames, len(self.frames))
+                        del self.frames[:num_consumed]
+                        self.num_discarded_frames += num_consumed
+                        self.condition.notify_all()
+                    index = frame_num - self.num_discarded_frames
+
+                if not self.condition.wait_for(lambda: index < len(self.frames), timeout=timeout):
+                    return None
+                return self.frames[index]
+
+
 
     class QRDisplayThread(BaseThread):
-        def __init__(self, qr_encoder: BaseQrEncoder, qr_brightness: ThreadsafeCounter, tips_start_time: ThreadsafeCounter):
+        def __init__(self, qr_brightness: ThreadsafeCounter, tips_start_time: ThreadsafeCounter, frame_producer: "QRDisplayScreen.QRFrameProducerThread", target_fps: float):
             from seedsigner.gui.renderer import Renderer
             super().__init__()
-            self.qr_encoder = qr_encoder
             self.qr_brightness = qr_brightness
             self.renderer = Renderer.get_instance()
             self.tips_start_time = tips_start_time
+            self.frame_producer = frame_producer
+
+            # Exposes the measured fps and jitter vs `target_fps`
+            self.scheduler = FrameScheduler(fps=target_fps)
 
 
         def render_brightness_tip(self, image: Image.Image) -> None:
@@ -833,32 +931,68 @@ class QRDisplayScreen(BaseScreen):
             is_brightness_tip_enabled = cur_brightness_setting == SettingsConstants.OPTION__ENABLED
             pending_encoder_restart = False
 
+            # Frames come pre-rendered from the frame producer; this thread only scales,
+            # colors, and shows them. Brightness changes just recolor the background
+            # palette entry.
+            frame_num = 0
+            num_frames_shown = 0
+            qr_image = None
+            self.scheduler.start()
+
             # Loop whether the QR is a single frame or animated; each loop might adjust
             # brightness setting.
             while self.keep_running:
-                # convert the self.qr_brightness integer (31-255) into hex triplets
-                hex_color = (hex(self.qr_brightness.cur_count).split('x')[1]) * 3
+                is_new_frame = False
 
                 # Display the brightness tips toast
                 duration = 10 ** 9 * 1.2  # 1.2 seconds
-                if is_brightness_tip_enabled and time.time_ns() - self.tips_start_time.cur_count < duration:
-                    image = self.qr_encoder.part_to_image(self.qr_encoder.cur_part(), 240, 240, border=2, background_color=hex_color)
-                    self.render_brightness_tip(image)
+                is_tip_visible = is_brightness_tip_enabled and time.time_ns() - self.tips_start_time.cur_count < duration
+                if is_tip_visible:
+                    # Hold the current frame under the tip
+                    if qr_image is None:
+                        qr_image = self.frame_producer.get_frame(frame_num, timeout=self.scheduler.frame_interval)
                     pending_encoder_restart = True
                 else:
                     # Only advance the QR animation when the brightness tip is not displayed
                     if pending_encoder_restart:
                         # Animated QRs should restart their frame sequence after the
-                        # brightness tip is stowed.
-                        self.qr_encoder.restart()
+                        # brightness tip is stowed (can't rewind a stream, though).
+                        if self.frame_producer.is_looping:
+                            frame_num = 0
                         pending_encoder_restart = False
-                    image = self.qr_encoder.next_part_image(240, 240, border=2, background_color=hex_color)
+
+                    # If the producer is behind, hold the current frame
+                    frame = self.frame_producer.get_frame(frame_num, timeout=self.scheduler.frame_interval)
+                    if frame is not None:
+                        qr_image = frame
+                        is_new_frame = True
+
+                if qr_image is None:
+                    # Nothing rendered yet
+                    continue
+
+                # self.qr_brightness is an integer (31-255) gray level
+                brightness = self.qr_brightness.cur_count
+                image = QR.set_background_color(qr_image.resize((240, 240), Image.Resampling.NEAREST), (brightness, brightness, brightness))
+
+                if is_tip_visible:
+                    # Only pay for an RGBA copy to composite onto while the tip is up
+                    image = image.convert("RGBA")
+                    self.render_brightness_tip(image)
 
                 with self.renderer.lock:
                     self.renderer.show_image(image)
+                self.scheduler.frame_shown()
+
+                num_frames_shown += 1
+                if num_frames_shown % FrameScheduler.STATS_WINDOW_SIZE == 0:
+                    self.scheduler.log_stats("QR animation")
 
-                # Target n held frames per second before rendering next QR image
-                time.sleep(5 / 30.0)
+                # Late frames can only be skipped once they're all cached; otherwise
+                # every part still has to be shown.
+                num_frames = self.scheduler.wait_for_next_frame(can_skip=self.frame_producer.is_complete)
+                if is_new_frame:
+                    frame_num += num_frames
 
 
     def __post_init__(self):
@@ -871,10 +1005,23 @@ class QRDisplayScreen(BaseScreen):
             initial_value=settings.get_value(SettingsConstants.SETTING__QR_BRIGHTNESS))
         self.tips_start_time = ThreadsafeCounter(initial_value=time.time_ns())
 
-        self.threads.append(QRDisplayScreen.QRDisplayThread(
+        if self.target_fps is None:
+            self.target_fps = settings.get_value(SettingsConstants.SETTING__QR_ANIMATION_FPS)
+
+        self.frame_producer = QRDisplayScreen.QRFrameProducerThread(
             qr_encoder=self.qr_encoder,
+            border=2,
+            extra_fountain_parts=self.extra_fountain_parts,
+            max_cached_frames=self.max_cached_frames,
+        )
+        self.threads.append(self.frame_producer)
+
+        # Must be the last thread; `_run` waits on it to exit
+        self.threads.append(QRDisplayScreen.QRDisplayThread(
             qr_brightness=self.qr_brightness,
-            tips_start_time=self.tips_start_time
+            tips_start_time=self.tips_start_time,
+            frame_producer=self.frame_producer,
+            target_fps=self.target_fps,
         ))
 
 
@@ -1,4 +1,5 @@
 import io
+import time
 
 from gettext import gettext as _
 from PIL import Image
@@ -41,6 +42,30 @@ class Camera(Singleton):
             raise CameraConnectionError()
 
 
+    def restart_video_stream_mode(self, resolution, framerate, format="bgr"):
+        """
+        Switches the running video stream to a new resolution/framerate. Frame sequence
+        numbers carry on from the old stream so `read_next_video_frame` callers don't
+        need to know the stream was swapped out.
+        """
+        from picamera import PiCameraError
+        from seedsigner.hardware.pivideostream import PiVideoStream
+        old_video_stream = self._video_stream
+        if old_video_stream is None:
+            raise Exception("Must call start_video_stream first.")
+
+        # Leave the stopped stream in place (rather than None) until the new one is up
+        # so that readers just wait instead of erroring out.
+        old_video_stream.stop()
+        try:
+            video_stream = PiVideoStream(resolution=resolution, framerate=framerate, format=format, first_seq_num=old_video_stream.frame_seq_num)
+            video_stream.start()
+        except PiCameraError:
+            self._video_stream = None
+            raise CameraConnectionError()
+        self._video_stream = video_stream
+
+
     def read_video_stream(self, as_image=False):
         if not self._video_stream:
             raise Exception("Must call start_video_stream first.")
@@ -49,10 +74,51 @@ class Camera(Singleton):
             return frame
         else:
             if frame is not None:
-                return Image.fromarray(frame.astype('uint8'), 'RGB').convert('RGBA').rotate(90 + self._camera_rotation)
+                return self.frame_to_image(frame)
         return None
 
 
+    def read_next_video_frame(self, last_seq_num=0, as_image=False, as_luminance=False, newest=False, timeout=0.5):
+        """
+        Waits for a frame the caller hasn't seen yet (see `PiVideoStream.read_next`).
+
+        Returns (seq_num, frame); pass `seq_num` back in on the next call. If no new
+        frame arrives within `timeout` seconds, returns (last_seq_num, None).
+
+        `as_luminance` returns the frame as a (pixels, width, height) grayscale triple
+        for `DecodeQR.add_luminance`.
+        """
+        video_stream = self._video_stream
+        if not video_stream:
+            raise Exception("Must call start_video_stream first.")
+        result = video_stream.read_next(last_seq_num, newest=newest, timeout=timeout)
+        if result is None:
+            if video_stream.is_stopped:
+                # The stream is being restarted; don't spin on it
+                time.sleep(0.05)
+            return (last_seq_num, None)
+
+        (seq_num, timestamp, frame) = result
+        if as_image:
+            frame = self.frame_to_image(frame)
+        elif as_luminance:
+            frame = self.frame_to_luminance(frame)
+        return (seq_num, frame)
+
+
+    def frame_to_image(self, frame):
+        # Frames are normally uint8 already; don't copy them just to be sure
+        return Image.fromarray(frame.astype('uint8', copy=False), 'RGB').convert('RGBA').rotate(90 + self._camera_rotation)
+
+
+    @staticmethod
+    def frame_to_luminance(frame):
+        # The green channel carries most of an RGB image's luminance, which is all zbar
+        # looks at. One strided copy out of the frame; no grayscale math, no PIL.
+        (height, width) = frame.shape[:2]
+        return (frame[:, :, 1].tobytes(), width, height)
+
+
     def stop_video_stream_mode(self):
         if self._video_stream is not None:
             self._video_stream.stop()
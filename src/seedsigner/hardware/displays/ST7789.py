@@ -148,16 +148,16 @@ class ST7789(object):
     
     def show_image(self,Image,Xstart,Ystart):
         """Set buffer to value of Python Imaging Library image."""
-        """Write display buffer to physical display"""
+        """Write display buffer to physical display; a smaller image only updates its window at (Xstart, Ystart)"""
         imwidth, imheight = Image.size
-        if imwidth != self.width or imheight != self.height:
-            raise ValueError('Image must be same dimensions as display \
+        if Xstart + imwidth > self.width or Ystart + imheight > self.height:
+            raise ValueError('Image must fit within the display \
                 ({0}x{1}).' .format(self.width, self.height))
         # convert 24-bit RGB-8:8:8 to gBRG-3:5:5:3; then per-pixel byteswap to 16-bit RGB-5:6:5
         arr = array.array("H", Image.convert("BGR;16").tobytes())
         arr.byteswap()
         pix = arr.tobytes()
-        self.SetWindows ( 0, 0, self.width, self.height)
+        self.SetWindows ( Xstart, Ystart, Xstart + imwidth, Ystart + imheight)
         GPIO.output(self._dc,GPIO.HIGH)
         self._spi.writebytes2(pix)	
         
@@ -1,3 +1,5 @@
+from PIL import Image, ImageChops
+
 DISPLAY_TYPE__ST7789 = "st7789"
 DISPLAY_TYPE__ILI9341 = "ili9341"
 DISPLAY_TYPE__ILI9486 = "ili9486"
@@ -6,11 +8,19 @@ ALL_DISPLAY_TYPES = [DISPLAY_TYPE__ST7789, DISPLAY_TYPE__ILI9341, DISPLAY_TYPE__
 
 
 class DisplayDriver:
+    # Rows per band when diffing a new frame against the one on the display
+    DIRTY_BAND_HEIGHT = 16
+
+
     def __init__(self, display_type: str = DISPLAY_TYPE__ST7789, width: int = None, height: int = None):
         if display_type not in ALL_DISPLAY_TYPES:
             raise ValueError(f"Invalid display type: {display_type}")
         self.display_type = display_type
 
+        # What's on the panel, as last written through this driver; None until a full
+        # frame has been written.
+        self.frame: Image.Image = None
+
         if self.display_type == DISPLAY_TYPE__ST7789:
             if width not in [240, 320] or height != 240:
                 raise ValueError("ST7789 display only supports 240x240 or 320x240 resolutions")
@@ -57,4 +67,53 @@ class DisplayDriver:
 
 
     def show_image(self, image, x_start: int = 0, y_start: int = 0):
-        self.display.show_image(image, x_start, y_start)
\ No newline at end of file
+        """Writes a full frame, or a window of one at (x_start, y_start)"""
+        self.display.show_image(image, x_start, y_start)
+
+        if (x_start, y_start) == (0, 0) and (self.frame is None or image.size == self.frame.size):
+            self.frame = image.convert("RGB") if image.mode != "RGB" else image.copy()
+        elif self.frame is not None:
+            self.frame.paste(image, (x_start, y_start))
+
+
+    def get_dirty_windows(self, image: Image.Image) -> list[tuple[int, int, int, int]]:
+        """
+        The (left, top, right, bottom) windows of a full frame `image` that differ from
+        what's on the display: the bounding box of the changes in each band of
+        DIRTY_BAND_HEIGHT rows, with adjacent changed bands merged into one window.
+        """
+        if self.frame is None or image.size != self.frame.size:
+            return [(0, 0, image.width, image.height)]
+
+        diff = ImageChops.difference(image if image.mode == "RGB" else image.convert("RGB"), self.frame)
+        bbox = diff.getbbox()
+        if bbox is None:
+            return []
+
+        (left, top, right, bottom) = bbox
+        windows = []
+        prev_band_changed = False
+        for band_top in range(top - top % self.DIRTY_BAND_HEIGHT, bottom, self.DIRTY_BAND_HEIGHT):
+            band_bbox = diff.crop((left, band_top, right, min(band_top + self.DIRTY_BAND_HEIGHT, bottom))).getbbox()
+            if band_bbox is None:
+                prev_band_changed = False
+                continue
+
+            window = (left + band_bbox[0], band_top + band_bbox[1], left + band_bbox[2], band_top + band_bbox[3])
+            if prev_band_changed:
+                prev_window = windows[-1]
+                windows[-1] = (min(prev_window[0], window[0]), prev_window[1], max(prev_window[2], window[2]), window[3])
+            else:
+                windows.append(window)
+            prev_band_changed = True
+
+        return windows
+
+
+    def show_image_windows(self, image: Image.Image, windows: list[tuple[int, int, int, int]]):
+        """Writes just the (left, top, right, bottom) `windows` of a full frame `image`"""
+        for window in windows:
+            if window == (0, 0, image.width, image.height):
+                self.show_image(image, 0, 0)
+            else:
+                self.show_image(image.crop(window), window[0], window[1])
\ No newline at end of file
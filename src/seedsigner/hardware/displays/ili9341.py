@@ -344,17 +344,37 @@ class ILI9341(object):
         self.data(y1)                    # YEND
         self.command(ILI9341_RAMWR)        # write to RAM
 
+    def rotated_origin(self, image, x_start: int = 0, y_start: int = 0):
+        """Where the top left corner of `image`, placed at (x_start, y_start) on the
+        rotated display, lands on the natively-oriented panel once the image is
+        rotated by `rotation`.
+        """
+        if self.rotation in [90, 270]:
+            rotated_width, rotated_height = self.height, self.width
+        else:
+            rotated_width, rotated_height = self.width, self.height
+
+        if self.rotation == 90:
+            return (y_start, rotated_width - (x_start + image.width))
+        elif self.rotation == 180:
+            return (rotated_width - (x_start + image.width), rotated_height - (y_start + image.height))
+        elif self.rotation == 270:
+            return (rotated_height - (y_start + image.height), x_start)
+        return (x_start, y_start)
+
     def show_image(self, image=None, x_start: int = 0, y_start: int = 0):
         """Write the display buffer or provided image to the hardware.  If no
         image parameter is provided the display buffer will be written to the
-        hardware.  If an image is provided, it should be RGB format and the
-        same dimensions as the display hardware.
+        hardware.  If an image is provided, it should be RGB format and either
+        the same dimensions as the (rotated) display or a window of it, placed
+        at (x_start, y_start) in the rotated display's coordinates.
         """
         # By default write the internal buffer to the display.
         if image is None:
             image = self.buffer
         
         output_image = image.rotate(self.rotation, expand=True)
+        x_start, y_start = self.rotated_origin(image, x_start, y_start)
         self.set_window(x_start, y_start, x_start + output_image.width - 1, y_start + output_image.height - 1)
 
         # Convert image to array of 16bit 565 RGB data bytes.
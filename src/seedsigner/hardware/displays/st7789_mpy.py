@@ -346,13 +346,13 @@ class ST7789:
 
     def show_image(self, image, x_start: int = 0, y_start: int = 0):
         """Set buffer to value of Python Imaging Library image."""
-        """Write display buffer to physical display"""
+        """Write display buffer to physical display; a smaller image only updates its window at (x_start, y_start)"""
 
         # image = image.rotate(90, expand=True)
 
         imwidth, imheight = image.size
-        if imwidth != self.width or imheight != self.height:
-            raise ValueError('Image must be same dimensions as display \
+        if x_start + imwidth > self.width or y_start + imheight > self.height:
+            raise ValueError('Image must fit within the display \
                 ({0}x{1}).' .format(self.width, self.height))
 
         # convert 24-bit RGB-8:8:8 to gBRG-3:5:5:3; then per-pixel byteswap to 16-bit RGB-5:6:5
@@ -360,7 +360,7 @@ class ST7789:
         arr.byteswap()
         pix = arr.tobytes()
 
-        self._set_window(x_start, y_start, self.width, self.height)
+        self._set_window(x_start, y_start, x_start + imwidth - 1, y_start + imheight - 1)
         GPIO.output(self.dc,GPIO.HIGH)
         self._write(data=pix)
 
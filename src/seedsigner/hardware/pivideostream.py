@@ -2,7 +2,7 @@
 import logging
 from picamera.array import PiRGBArray
 from picamera import PiCamera
-from threading import Thread
+from threading import Condition, Event, Thread
 import time
 
 logger = logging.getLogger(__name__)
@@ -10,7 +10,10 @@ logger = logging.getLogger(__name__)
 
 # Modified from: https://github.com/jrosebr1/imutils
 class PiVideoStream:
-	def __init__(self, resolution=(320, 240), framerate=32, format="bgr", **kwargs):
+	# How many of the most recent frames are kept available to consumers
+	FRAME_BUFFER_SIZE = 4
+
+	def __init__(self, resolution=(320, 240), framerate=32, format="bgr", first_seq_num=0, **kwargs):
 		# initialize the camera
 		self.camera = PiCamera(resolution=resolution, framerate=framerate, **kwargs)
 
@@ -24,13 +27,24 @@ class PiVideoStream:
 		self.frame = None
 		self.should_stop = False
 		self.is_stopped = True
+		self.stopped_event = Event()
+		self.stopped_event.set()
+
+		# Ring buffer of (seq_num, timestamp, frame) for the most recent frames. Every
+		# captured frame gets the next sequence number so consumers can tell new frames
+		# from ones they've already processed.
+		self.frame_buffer = [None] * self.FRAME_BUFFER_SIZE
+		self.frame_seq_num = first_seq_num
+		self.frame_condition = Condition()
 
 	def start(self):
 		# start the thread to read frames from the video stream
 		t = Thread(target=self.update, args=())
 		t.daemon = True
-		t.start()
+		self.should_stop = False
+		self.stopped_event.clear()
 		self.is_stopped = False
+		t.start()
 		return self
 
 	def update(self):
@@ -38,9 +52,17 @@ class PiVideoStream:
 		for f in self.stream:
 			# grab the frame from the stream and clear the stream in
 			# preparation for the next frame
-			self.frame = f.array
+			frame = f.array
 			self.rawCapture.truncate(0)
 
+			with self.frame_condition:
+				self.frame_seq_num += 1
+				self.frame_buffer[self.frame_seq_num % self.FRAME_BUFFER_SIZE] = (self.frame_seq_num, time.time(), frame)
+				self.frame = frame
+
+				# wake up any consumers waiting on a new frame
+				self.frame_condition.notify_all()
+
 			# if the thread indicator variable is set, stop the thread
 			# and resource camera resources
 			if self.should_stop:
@@ -49,17 +71,44 @@ class PiVideoStream:
 				self.rawCapture.close()
 				self.camera.close()
 				self.should_stop = False
-				self.is_stopped = True
+				with self.frame_condition:
+					self.is_stopped = True
+					self.frame_condition.notify_all()
+				self.stopped_event.set()
 				return
 
 	def read(self):
 		# return the frame most recently read
 		return self.frame
 
+	def read_next(self, last_seq_num=0, newest=False, timeout=None):
+		"""
+		Blocks until a frame newer than `last_seq_num` is available and returns it as
+		(seq_num, timestamp, frame).
+
+		By default returns the oldest such frame still in the ring buffer so a consumer
+		that falls slightly behind (e.g. the decoder) still sees each frame once, in
+		order. `newest=True` skips straight to the latest frame (e.g. live preview).
+
+		Returns None if `timeout` (in seconds) expires or the stream is stopped first.
+		"""
+		with self.frame_condition:
+			if not self.frame_condition.wait_for(lambda: self.frame_seq_num > last_seq_num or self.is_stopped, timeout=timeout):
+				return None
+			if self.frame_seq_num <= last_seq_num:
+				# stopped without a new frame
+				return None
+
+			if newest:
+				seq_num = self.frame_seq_num
+			else:
+				# oldest unseen frame that hasn't been overwritten yet
+				seq_num = max(last_seq_num + 1, self.frame_seq_num - self.FRAME_BUFFER_SIZE + 1)
+			return self.frame_buffer[seq_num % self.FRAME_BUFFER_SIZE]
+
 	def stop(self):
 		# indicate that the thread should be stopped
 		self.should_stop = True
 
 		# Block in this thread until stopped
-		while not self.is_stopped:
-			pass
+		self.stopped_event.wait()
@@ -1,8 +1,7 @@
 import qrcode
 from qrcode.image.styledpil import StyledPilImage
 from qrcode.image.styles.moduledrawers import CircleModuleDrawer, GappedSquareModuleDrawer
-from PIL import Image, ImageDraw
-import subprocess
+from PIL import Image, ImageColor, ImageDraw
 
 class QR:
     STYLE__DEFAULT = 1
@@ -90,18 +89,48 @@ class QR:
                 ).resize((width,height)).convert('RGBA')
 
 
-    def qrimage_io(self, data, width=240, height=240, border=3, background_color="808080"):
-        if 1 <= border <= 10:
-            border_str = str(border)
-        else:
-            border_str = "3"
+    def qrimage_palette(self, data, width=240, height=240, border=3) -> Image.Image:
+        """
+            Fast path for QRDisplayScreen's animated frames: paints the QR's module
+            matrix straight into a 2-color palette ("P") image instead of going through
+            qrcode's image factories.
+
+            Palette index 1 is the black modules and index 0 the background, whose
+            color is left to `set_background_color()` so that the QR can be rendered
+            once and then shown at any brightness.
+
+            With no `width` and `height` the image is left at one pixel per module.
+        """
+        if not 1 <= border <= 10:
+            border = 3
+
+        qr = qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_L, border=border)
+        qr.add_data(data)
+        qr.make(fit=True)
 
-        cmd = f"""qrencode -m {border_str} -s 3 -l L --foreground=000000 --background={background_color} -t PNG -o "/tmp/qrcode.png" "{str(data)}" """
-        rv = subprocess.call(cmd, shell=True)
+        # One byte per module: 0 = background, 1 = black
+        matrix = qr.get_matrix()
+        img = Image.frombytes("P", (len(matrix), len(matrix)), bytes(module for row in matrix for module in row))
+        if width and height:
+            img = img.resize((width, height), Image.Resampling.NEAREST)
+        return QR.set_background_color(img, "ffffff")
 
-        # if qrencode fails, fall back to only encoder
-        if rv != 0:
-            return self.qrimage(data,width,height,border)
-        img = Image.open("/tmp/qrcode.png").resize((width,height), Image.Resampling.NEAREST).convert("RGBA")
 
+    @staticmethod
+    def set_background_color(img: Image.Image, background_color) -> Image.Image:
+        """
+            Recolors a `qrimage_palette()` image in place by swapping its palette;
+            `background_color` can be an (r, g, b) tuple, a PIL color name, or a hex
+            triplet with or without the leading "#".
+        """
+        if isinstance(background_color, str):
+            if not background_color.startswith("#") and all(c in "0123456789abcdefABCDEF" for c in background_color):
+                background_color = "#" + background_color
+            background_color = ImageColor.getrgb(background_color)
+        img.putpalette(tuple(background_color[:3]) + (0, 0, 0))
         return img
+
+
+    def qrimage_io(self, data, width=240, height=240, border=3, background_color="808080"):
+        img = self.qrimage_palette(data, width, height, border)
+        return QR.set_background_color(img, background_color).convert("RGBA")
@@ -0,0 +1,119 @@
+import math
+
+import qrcode
+from qrcode.util import BIT_LIMIT_TABLE, MODE_8BIT_BYTE, MODE_ALPHA_NUM, length_in_bits
+
+"""
+    How much data fits in a QR code of a given version at error correction level L (the
+    level `QR` renders at), so that the animated QR encoders can size their parts to
+    fill a QR version rather than picking a byte count and hoping.
+
+    Capacities come from the `qrcode` library's own tables, so a part sized here renders
+    at exactly the version it was sized for.
+"""
+
+# Fountain parts keep counting up past `seq_len` while an animation loops (see
+# QRDisplayScreen.QRFrameProducerThread); leave room in each part's header for seq
+# nums up to this multiple of `seq_len`.
+SEQ_NUM_HEADROOM = 4
+
+
+
+def _data_bits(version: int) -> int:
+    return BIT_LIMIT_TABLE[qrcode.constants.ERROR_CORRECT_L][version]
+
+
+
+def alphanumeric_capacity(version: int) -> int:
+    """ Max chars of [0-9A-Z $%*+-./:] in one alphanumeric-mode segment """
+    available_bits = _data_bits(version) - 4 - length_in_bits(MODE_ALPHA_NUM, version)
+
+    # 11 bits per pair of chars, 6 for a trailing odd char
+    (num_pairs, remaining_bits) = divmod(available_bits, 11)
+    return 2 * num_pairs + (1 if remaining_bits >= 6 else 0)
+
+
+
+def byte_capacity(version: int) -> int:
+    """ Max bytes in one byte-mode segment """
+    return (_data_bits(version) - 4 - length_in_bits(MODE_8BIT_BYTE, version)) // 8
+
+
+
+def _cbor_uint_len(value: int) -> int:
+    """ Length of a CBOR unsigned int (or of a byte string's length header) """
+    if value < 24:
+        return 1
+    elif value < 2**8:
+        return 2
+    elif value < 2**16:
+        return 3
+    elif value < 2**32:
+        return 5
+    return 9
+
+
+
+def ur_part_len(ur_type: str, fragment_len: int, seq_num: int, seq_len: int, message_len: int) -> int:
+    """
+        Length of a multi-part UR (`UREncoder.encode_part`):
+            ur:<type>/<seq_num>-<seq_len>/<bytewords minimal>
+
+        The bytewords body is 2 chars per byte of the CBOR-encoded fountain `Part`
+        plus its 4-byte CRC-32.
+    """
+    cbor_len = (
+        1                                   # array(5)
+        + _cbor_uint_len(seq_num)
+        + _cbor_uint_len(seq_len)
+        + _cbor_uint_len(message_len)
+        + 5                                 # CRC-32 checksum; assume it needs all 32 bits
+        + _cbor_uint_len(fragment_len) + fragment_len
+    )
+    return len(f"ur:{ur_type}/{seq_num}-{seq_len}/") + 2 * (cbor_len + 4)
+
+
+
+def max_ur_fragment_len(ur_type: str, message_len: int, version: int) -> int:
+    """
+        The largest fountain fragment length whose (uppercased, alphanumeric) UR parts
+        fit in a QR of `version`, for parts up to seq num `SEQ_NUM_HEADROOM` * `seq_len`.
+    """
+    capacity = alphanumeric_capacity(version)
+
+    # Start from the most that could fit with the smallest possible header and shrink
+    # until the header for the resulting `seq_len` fits too. Smaller fragments mean
+    # more parts and a longer header, so this only ever moves down.
+    fragment_len = (capacity - len(f"ur:{ur_type}/1-1/")) // 2 - 14
+    while fragment_len > 1:
+        seq_len = math.ceil(message_len / fragment_len)
+        if ur_part_len(ur_type, fragment_len, SEQ_NUM_HEADROOM * seq_len, seq_len, message_len) <= capacity:
+            break
+        fragment_len -= 1
+    return max(fragment_len, 1)
+
+
+
+def max_pxofy_fragment_len(data_len: int, version: int) -> int:
+    """
+        The largest fragment of a "pXofY " prefixed (byte mode) part that fits in a QR
+        of `version`.
+    """
+    capacity = byte_capacity(version)
+    fragment_len = capacity - len("p1of1 ")
+    while fragment_len > 1:
+        num_parts = math.ceil(data_len / fragment_len)
+        if len(f"p{num_parts}of{num_parts} ") + fragment_len <= capacity:
+            break
+        fragment_len -= 1
+    return max(fragment_len, 1)
+
+
+
+def max_bbqr_fragment_len(version: int) -> int:
+    """
+        The most base32 chars after a BBQr part's 8 char header that fit in a QR of
+        `version`. Every part but the last must hold whole 8 char base32 groups so
+        that each part decodes on its own.
+    """
+    return (alphanumeric_capacity(version) - len("B$ZP0000")) // 8 * 8
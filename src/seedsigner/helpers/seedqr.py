@@ -0,0 +1,76 @@
+import hashlib
+
+from seedsigner.models.seed import Seed
+from seedsigner.models.settings_definition import SettingsConstants
+
+"""
+    SeedQR and CompactSeedQR encoding of BIP-39 mnemonics.
+
+    Standard SeedQR: each word's wordlist index as 4 decimal digits.
+    CompactSeedQR: the mnemonic's entropy bytes, i.e. the words' 11-bit indices packed
+    together minus the trailing checksum bits.
+
+    see: https://github.com/SeedSigner/seedsigner/blob/main/docs/seed_qr/README.md
+"""
+
+# {wordlist_language_code: {word: wordlist index}}
+_word_indexes = {}
+
+
+
+def get_word_indexes(wordlist_language_code: str = SettingsConstants.WORDLIST_LANGUAGE__ENGLISH) -> dict[str, int]:
+    """ Maps each word of the language's BIP-39 wordlist to its index; built on first use """
+    if wordlist_language_code not in _word_indexes:
+        _word_indexes[wordlist_language_code] = {word: index for (index, word) in enumerate(Seed.get_wordlist(wordlist_language_code))}
+    return _word_indexes[wordlist_language_code]
+
+
+
+def mnemonic_to_seedqr(mnemonic: list[str], wordlist_language_code: str = SettingsConstants.WORDLIST_LANGUAGE__ENGLISH) -> str:
+    word_indexes = get_word_indexes(wordlist_language_code)
+    return "".join("%04d" % word_indexes[word] for word in mnemonic)
+
+
+
+def seedqr_to_mnemonic(seedqr: str, wordlist_language_code: str = SettingsConstants.WORDLIST_LANGUAGE__ENGLISH) -> list[str]:
+    """ Any trailing digits that don't make up a whole word are ignored """
+    wordlist = Seed.get_wordlist(wordlist_language_code)
+    num_words = len(seedqr) // 4
+    seedqr = seedqr[:num_words * 4]
+    if not (seedqr.isascii() and seedqr.isdigit()):
+        raise ValueError("SeedQR must be numeric")
+
+    value = int(seedqr)
+    indexes = []
+    for i in range(num_words):
+        (value, index) = divmod(value, 10000)
+        indexes.append(index)
+    return [wordlist[index] for index in reversed(indexes)]
+
+
+
+def mnemonic_to_compact_seedqr(mnemonic: list[str], wordlist_language_code: str = SettingsConstants.WORDLIST_LANGUAGE__ENGLISH) -> bytes:
+    word_indexes = get_word_indexes(wordlist_language_code)
+    value = 0
+    for word in mnemonic:
+        value = (value << 11) | word_indexes[word]
+
+    # Drop the checksum bits at the end: 4 in a 12-word mnemonic, 8 in a 24-word one
+    num_checksum_bits = len(mnemonic) * 11 // 33
+    num_entropy_bytes = (len(mnemonic) * 11 - num_checksum_bits) // 8
+    return (value >> num_checksum_bits).to_bytes(num_entropy_bytes, "big")
+
+
+
+def compact_seedqr_to_mnemonic(entropy: bytes, wordlist_language_code: str = SettingsConstants.WORDLIST_LANGUAGE__ENGLISH) -> list[str]:
+    if len(entropy) not in (16, 20, 24, 28, 32):
+        raise ValueError(f"CompactSeedQR entropy must be 16-32 bytes, in multiples of 4; got {len(entropy)}")
+    wordlist = Seed.get_wordlist(wordlist_language_code)
+
+    # Recompute the checksum bits that CompactSeedQR leaves out
+    num_checksum_bits = len(entropy) // 4
+    checksum = hashlib.sha256(entropy).digest()[0] >> (8 - num_checksum_bits)
+    value = (int.from_bytes(entropy, "big") << num_checksum_bits) | checksum
+
+    num_words = (len(entropy) * 8 + num_checksum_bits) // 11
+    return [wordlist[(value >> (11 * i)) & 0x7FF] for i in reversed(range(num_words))]
@@ -5,71 +5,50 @@
 # Licensed under the "BSD-2-Clause Plus Patent License"
 #
 
-from .utils import crc32_bytes, partition
+import sys
+
+from .utils import crc32_bytes
 
 BYTEWORDS = 'ableacidalsoapexaquaarchatomauntawayaxisbackbaldbarnbeltbetabiasbluebodybragbrewbulbbuzzcalmcashcatschefcityclawcodecolacookcostcruxcurlcuspcyandarkdatadaysdelidicedietdoordowndrawdropdrumdulldutyeacheasyechoedgeepicevenexamexiteyesfactfairfernfigsfilmfishfizzflapflewfluxfoxyfreefrogfuelfundgalagamegeargemsgiftgirlglowgoodgraygrimgurugushgyrohalfhanghardhawkheathelphighhillholyhopehornhutsicedideaidleinchinkyintoirisironitemjadejazzjoinjoltjowljudojugsjumpjunkjurykeepkenokeptkeyskickkilnkingkitekiwiknoblamblavalazyleaflegsliarlimplionlistlogoloudloveluaulucklungmainmanymathmazememomenumeowmildmintmissmonknailnavyneednewsnextnoonnotenumbobeyoboeomitonyxopenovalowlspaidpartpeckplaypluspoempoolposepuffpumapurrquadquizraceramprealredorichroadrockroofrubyruinrunsrustsafesagascarsetssilkskewslotsoapsolosongstubsurfswantacotasktaxitenttiedtimetinytoiltombtoystriptunatwinuglyundouniturgeuservastveryvetovialvibeviewvisavoidvowswallwandwarmwaspwavewaxywebswhatwhenwhizwolfworkyankyawnyellyogayurtzapszerozestzinczonezoom'
-WORD_ARRAY = None
 
-def decode_word(word, word_len):
-    global WORD_ARRAY
-    global BYTEWORDS
+# Byte value -> word, one table per style. Built once at import since every displayed
+# and scanned UR frame goes through here.
+WORDS = [BYTEWORDS[i * 4:i * 4 + 4] for i in range(256)]
+MINIMAL_WORDS = [word[0] + word[3] for word in WORDS]
 
-    if len(word) != word_len:
-        raise ValueError('Invalid Bytewords.')
+# (lowercase) word -> byte value. The first and last letters of each Byteword are
+# unique, so the two-letter minimal words are just as unambiguous as the full ones.
+WORD_VALUES = {word: i for i, word in enumerate(WORDS)}
+MINIMAL_WORD_VALUES = {word: i for i, word in enumerate(MINIMAL_WORDS)}
 
-    dim = 26
-
-    # Since the first and last letters of each Byteword are unique,
-    # we can use them as indexes into a two-dimensional lookup table.
-    # This table is generated lazily.
-    if WORD_ARRAY == None:
-        WORD_ARRAY = [-1] * (dim * dim)  # create empty array
-
-        for i in range(256):
-            byteword_offset = i * 4
-            x = ord(BYTEWORDS[byteword_offset]) - ord('a')
-            y = ord(BYTEWORDS[byteword_offset + 3]) - ord('a')
-            array_offset = y * dim + x
-            WORD_ARRAY[array_offset] = i
-
-    # If the coordinates generated by the first and last letters are out of bounds,
-    # or the lookup table contains -1 at the coordinates, then the word is not valid.
-    x = ord(word[0].lower()) - ord('a')
-    y = ord((word[3 if len(word) == 4 else 1]).lower()) - ord('a')
-    if not (0 <= x and x < dim and 0 <= y and y < dim):
-        raise ValueError('Invalid Bytewords.')
+# Minimal words are decoded in bulk by viewing the ASCII string as an array of
+# native-endian uint16 letter pairs; map every upper/lowercase pair to its value.
+MINIMAL_PAIR_VALUES = {}
+for word, value in MINIMAL_WORD_VALUES.items():
+    for first in (word[0], word[0].upper()):
+        for last in (word[1], word[1].upper()):
+            MINIMAL_PAIR_VALUES[int.from_bytes((first + last).encode(), sys.byteorder)] = value
 
-    offset = y * dim + x
-    value = WORD_ARRAY[offset]
-    if value == -1:
+def decode_word(word, word_len):
+    if len(word) != word_len:
         raise ValueError('Invalid Bytewords.')
 
-    # If we're decoding a full four-letter word, verify that the two middle letters are correct.
-    if len(word) == 4:
-        byteword_offset = value * 4
-        c1 = word[1].lower()
-        c2 = word[2].lower()
-        if c1 != BYTEWORDS[byteword_offset + 1] or c2 != BYTEWORDS[byteword_offset + 2]:
-            raise ValueError('Invalid Bytewords.')
+    values = WORD_VALUES if word_len == 4 else MINIMAL_WORD_VALUES
+    value = values.get(word.lower())
+    if value == None:
+        raise ValueError('Invalid Bytewords.')
 
     # Successful decode.
     return value
 
 def get_word(index):
-    byteword_offset = index * 4
-    return BYTEWORDS[byteword_offset:byteword_offset + 4]
+    return WORDS[index]
 
 def get_minimal_word(index):
-    byteword_offset = index * 4
-    return BYTEWORDS[byteword_offset] + BYTEWORDS[byteword_offset + 3]
+    return MINIMAL_WORDS[index]
 
 def encode(buf, separator):
-    words = []
-    for i in range(len(buf)):
-        byte = buf[i]
-        words.append(get_word(byte))
-
-    return separator.join(words)
+    return separator.join([WORDS[byte] for byte in buf])
 
 def add_crc(buf):
     crc_buf = crc32_bytes(buf)
@@ -80,35 +59,31 @@ def encode_with_separator(buf, separator):
     return encode(crc_buf, separator)
 
 def encode_minimal(buf):
-    result = ''
-
     crc_buf = add_crc(buf)
-    for i in range(len(crc_buf)):
-        byte = crc_buf[i]
-        result += get_minimal_word(byte)
-
-    return result
+    return ''.join([MINIMAL_WORDS[byte] for byte in crc_buf])
 
 def decode(s, separator, word_len):
-    buf = bytearray()
-
-    if word_len == 4:
-        words = s.split(separator)
-    else:
-        words = partition(s, 2)
-
-    for word in words:
-        buf.append(decode_word(word, word_len))
+    try:
+        if word_len == 4:
+            # Don't consider case
+            buf = bytearray([WORD_VALUES[word] for word in s.lower().split(separator)])
+        else:
+            if len(s) % 2 != 0:
+                raise ValueError('Invalid Bytewords.')
+            # Non-ASCII input raises UnicodeEncodeError, itself a ValueError
+            pairs = memoryview(s.encode('ascii')).cast('H')
+            buf = bytearray(map(MINIMAL_PAIR_VALUES.__getitem__, pairs))
+    except KeyError:
+        raise ValueError('Invalid Bytewords.')
 
     if len(buf) < 5:
         raise ValueError('Invalid Bytewords.') 
 
-    # Validate checksum
-    body = buf[0:-4]
-    body_checksum = buf[-4:]
-    checksum = crc32_bytes(body)
-    # if checksum != body_checksum:
+    # Checksum validation is intentionally not enforced
+    # body_checksum = buf[-4:]
+    # if crc32_bytes(body) != body_checksum:
     #     raise ValueError('Invalid Bytewords.')
+    body = buf[0:-4]
 
     return body
 
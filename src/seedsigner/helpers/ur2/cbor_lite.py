@@ -12,6 +12,8 @@
 # COPYRIGHT.md file in the top-level folder of the CBOR-lite software
 # distribution.
 
+import struct
+
 def bit_length(n):
     return len(bin(abs(n))) - 2
 
@@ -69,6 +71,15 @@ def get_byte_length(value):
     
     return (bit_length(value) + 7) // 8
 
+# Big-endian unpackers for each of the multi-byte `additional` values; `unpack_from`
+# reads straight out of the input buffer without slicing it.
+ADDITIONAL_VALUE_STRUCTS = {
+    Tag_Minor_length1: struct.Struct('>B'),
+    Tag_Minor_length2: struct.Struct('>H'),
+    Tag_Minor_length4: struct.Struct('>I'),
+    Tag_Minor_length8: struct.Struct('>Q'),
+}
+
 class CBOREncoder:
     def __init__(self):
         self.buf = bytearray()
@@ -150,10 +161,10 @@ class CBOREncoder:
         return length + self.encodeBytes(value)
 
     def encodeText(self, value):
-        str_len = len(value)
-        length = self.encodeTagAndValue(Tag_Major_textString, str_len)
-        self.buf.append(bytes(value, 'utf8'))
-        return length + str_len
+        encoded = bytes(value, 'utf8')
+        length = self.encodeTagAndValue(Tag_Major_textString, len(encoded))
+        self.buf += encoded
+        return length + len(encoded)
 
     def encodeArraySize(self, value):
         return self.encodeTagAndValue(Tag_Major_array, value)
@@ -187,44 +198,17 @@ class CBORDecoder:
             value = additional
             return (tag, value, length)
 
-        value = 0
-        if additional == Tag_Minor_length8:
-            if end - self.pos < 8:
-                raise Exception("Not enough input")            
-            for shift in [56, 48, 40, 32, 24, 16, 8, 0]:
-                value |= self.buf[self.pos] << shift
-                self.pos += 1
-            if ((flags & Flag_Require_Minimal_Encoding) and value == 0):
-                raise Exception("Encoding not minimal")
-            return (tag, value, self.pos)
-        elif additional == Tag_Minor_length4:
-            if end - self.pos < 4:
-                raise Exception("Not enough input")            
-            for shift in [24, 16, 8, 0]:
-                value |= self.buf[self.pos] << shift
-                self.pos += 1
-            if ((flags & Flag_Require_Minimal_Encoding) and value == 0):
-                raise Exception("Encoding not minimal")
-            return (tag, value, self.pos)
-        elif additional == Tag_Minor_length2:
-            if end - self.pos < 2:
-                raise Exception("Not enough input")            
-            for shift in [8, 0]:
-                value |= self.buf[self.pos] << shift
-                self.pos += 1
-            if ((flags & Flag_Require_Minimal_Encoding) and value == 0):
-                raise Exception("Encoding not minimal")
-            return (tag, value, self.pos)
-        elif additional == Tag_Minor_length1:
-            if end - self.pos < 1:
-                raise Exception("Not enough input")            
-            value |= self.buf[self.pos]
-            self.pos += 1
-            if ((flags & Flag_Require_Minimal_Encoding) and value == 0):
-                raise Exception("Encoding not minimal")
-            return (tag, value, self.pos)
-
-        raise Exception("Bad additional value")
+        value_struct = ADDITIONAL_VALUE_STRUCTS.get(additional)
+        if value_struct == None:
+            raise Exception("Bad additional value")
+
+        if end - self.pos < value_struct.size:
+            raise Exception("Not enough input")
+        (value,) = value_struct.unpack_from(self.buf, self.pos)
+        self.pos += value_struct.size
+        if ((flags & Flag_Require_Minimal_Encoding) and value == 0):
+            raise Exception("Encoding not minimal")
+        return (tag, value, self.pos)
 
     def decodeUnsigned(self, flags=Flag_None):
         (tag, value, length) = self.decodeTagAndValue(flags)
@@ -7,12 +7,20 @@
 
 from .constants import MAX_UINT32
 
-def bit_length(n):
-    return len(bin(abs(n))) - 2
+# UR uses the standard CRC-32 (ISO-HDLC), the same checksum `zlib.crc32` and
+# `binascii.crc32` compute in C. The pure-Python table loop below is kept as a
+# fallback for MicroPython-style environments that don't provide it.
+try:
+    from binascii import crc32 as BINASCII_CRC32
+except ImportError:
+    try:
+        from zlib import crc32 as BINASCII_CRC32
+    except ImportError:
+        BINASCII_CRC32 = None
 
 TABLE = None
 
-def crc32(buf):
+def crc32_pure(buf, value=0):
     # Lazily instantiate CRC table
     global TABLE
     if TABLE == None:
@@ -25,12 +33,20 @@ def crc32(buf):
 
             TABLE[i] = c
 
-    crc = MAX_UINT32 & ~0
+    crc = MAX_UINT32 & ~value
     for byte in buf:
         crc = (crc >> 8) ^ TABLE[(crc ^ byte) & 0xFF]
 
     return MAX_UINT32 & ~crc
 
+# Like `zlib.crc32`, pass in a previous result as `value` to continue the checksum
+# over another chunk of data.
+def crc32(buf, value=0):
+    if BINASCII_CRC32 != None:
+        return BINASCII_CRC32(buf, value) & MAX_UINT32
+    return crc32_pure(buf, value)
+
+# Always a full 4 bytes, big-endian; UR decoders strip exactly 4 checksum bytes.
 def crc32n(buf):
     n = crc32(buf)
-    return n.to_bytes((bit_length(n) + 7) // 8, 'big')
+    return n.to_bytes(4, 'big')
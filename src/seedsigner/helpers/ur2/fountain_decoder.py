@@ -5,8 +5,15 @@
 # Licensed under the "BSD-2-Clause Plus Patent License"
 #
 import time
-from .fountain_utils import choose_fragments, contains, is_strict_subset, set_difference
-from .utils import join_lists, join_bytes, crc32_int, xor_with, take_first
+from .fountain_utils import FragmentSelectionTable, choose_fragments, contains, is_strict_subset, set_difference
+from .utils import join_lists, join_bytes, crc32_int, xor_bytes, take_first
+
+# Cap on how much a fragment index that's only known via mixed parts can count
+# towards the weighted progress estimate.
+MAX_MIXED_INDEX_SCORE = 0.75
+
+# Below this a running mixed index score is float residue from removals
+MIN_MIXED_INDEX_SCORE = 1e-9
 
 class InvalidPart(Exception):
     pass
@@ -50,6 +57,13 @@ class FountainDecoder:
         self.simple_parts = {}
         self.mixed_parts = {}
         self.queued_parts = []
+        self.fragment_selection = None
+
+        # Running totals for the weighted `estimated_percent_complete()`:
+        # {fragment index: sum of 1/len(indexes) over the mixed parts that include it}
+        self.mixed_index_scoring = {}
+        # sum of each index's (capped) score
+        self.mixed_score = 0.0
 
     def expected_part_count(self):
         return len(self.expected_part_indexes)  # TODO: Handle None?
@@ -78,6 +92,10 @@ class FountainDecoder:
             * counts completed frames
             * counts each additional frame that is currently XORed in a mixed frame; its
                 score is weighted by the number of frames mixed together (1/num frames mixed).
+
+        The mixed frame score is kept up to date as mixed parts come and go (see
+        `add_mixed_part`/`remove_mixed_part`) so this is constant time no matter how
+        many mixed parts are buffered.
         """
         if self.is_complete():
             return 1
@@ -89,36 +107,41 @@ class FountainDecoder:
             estimated_input_parts = self.expected_part_count() * 1.75
             return min(0.99, self.processed_parts_count / estimated_input_parts)
         else:
-            parts = self.expected_part_count() if self.expected_part_indexes != None else 'None'
-            mixed = []
-            mixed_index_scoring = {}
-            mixed_set = set()
-            for indexes, p in self.mixed_parts.items():
-                if not indexes:
-                    continue
-                mixed.append(self.indexes_to_string(indexes))
-                mixed_set.update(indexes)
-                score = 1.0 / float(len(indexes))
-                for index in indexes:
-                    if index not in mixed_index_scoring:
-                        mixed_index_scoring[index] = 0.0
-                    
-                    # sum up partial scores
-                    mixed_index_scoring[index] += score
-
-            mixed_score = 0.0
-            for index, score in mixed_index_scoring.items():
-                # set a ceiling; don't let an index in a mixed/XOR frame
-                # achieve equal weight as a fully decoded frame. Also if
-                # the ceiling is too high, can potentially see your
-                # reported progress percentage DECREASE during a decode.
-                mixed_score += min(score, 0.75)
-
             num_complete = len(self.received_part_indexes)
-            weighted_estimate = (num_complete + mixed_score) / float(parts)
+            weighted_estimate = (num_complete + self.mixed_score) / float(self.expected_part_count())
             return weighted_estimate
 
 
+    def update_mixed_index_scores(self, indexes, score):
+        for index in indexes:
+            prev_score = self.mixed_index_scoring.get(index, 0.0)
+            new_score = prev_score + score
+            if new_score < MIN_MIXED_INDEX_SCORE:
+                # Removed the last mixed part with this index; drop any float residue
+                new_score = 0.0
+                del self.mixed_index_scoring[index]
+            else:
+                self.mixed_index_scoring[index] = new_score
+
+            # set a ceiling; don't let an index in a mixed/XOR frame
+            # achieve equal weight as a fully decoded frame. Also if
+            # the ceiling is too high, can potentially see your
+            # reported progress percentage DECREASE during a decode.
+            self.mixed_score += min(new_score, MAX_MIXED_INDEX_SCORE) - min(prev_score, MAX_MIXED_INDEX_SCORE)
+
+
+    def add_mixed_part(self, p):
+        if p.indexes in self.mixed_parts:
+            self.remove_mixed_part(p.indexes)
+        self.mixed_parts[p.indexes] = p
+        self.update_mixed_index_scores(p.indexes, 1.0 / float(len(p.indexes)))
+
+
+    def remove_mixed_part(self, indexes):
+        del self.mixed_parts[indexes]
+        self.update_mixed_index_scores(indexes, -1.0 / float(len(indexes)))
+
+
     def receive_part(self, encoder_part):
         # Don't process the part if we're already done
         if self.is_complete():
@@ -129,7 +152,7 @@ class FountainDecoder:
             return False
 
         # Add this part to the queue
-        p = FountainDecoder.Part.from_encoder_part(encoder_part)
+        p = FountainDecoder.Part(self.fragment_selection.get(encoder_part.seq_num), encoder_part.data[:])
         self.last_part_indexes = p.indexes
         self.enqueue(p)
 
@@ -177,23 +200,21 @@ class FountainDecoder:
 
     def reduce_mixed_by(self, p):
         # Reduce all the current mixed parts by the given part
-        reduced_parts = []
-        for value in self.mixed_parts.values():
-            reduced_parts.append(self.reduce_part_by_part(value, p))
+        for indexes, value in list(self.mixed_parts.items()):
+            reduced_part = self.reduce_part_by_part(value, p)
+            if reduced_part is value:
+                # Not reducible by `p`
+                continue
+
+            self.remove_mixed_part(indexes)
 
-        # Collect all the remaining mixed parts
-        new_mixed = {}
-        for reduced_part in reduced_parts:
             # If this reduced part is now simple
             if reduced_part.is_simple():
                 # Add it to the queue
                 self.enqueue(reduced_part)
             else:
-                # Otherwise, add it to the dict of current mixed parts
-                new_mixed[reduced_part.indexes] = reduced_part
-
-        self.mixed_parts = new_mixed
-        # print(self.mixed_parts.keys())
+                # Otherwise, add it back to the dict of current mixed parts
+                self.add_mixed_part(reduced_part)
 
     def reduce_part_by_part(self, a, b):
         # If the fragments mixed into `b` are a strict (proper) subset of those in `a`...
@@ -201,7 +222,7 @@ class FountainDecoder:
             # The new fragments in the revised part are `a` - `b`.
             new_indexes = set_difference(a.indexes, b.indexes)
             # The new data in the revised part are `a` XOR `b`
-            new_data = xor_with(bytearray(a.data), b.data)
+            new_data = xor_bytes(a.data, b.data)
             return self.Part(new_indexes, new_data)
         else:
             # `a` is not reducable by `b`, so return a
@@ -245,9 +266,8 @@ class FountainDecoder:
 
     def process_mixed_part(self, p):
         # Don't process duplicate parts
-        for r in self.mixed_parts.values():
-            if r == p.indexes:
-                return
+        if p.indexes in self.mixed_parts:
+            return
 
         # Reduce this part by all the others
         p2 = p  # TODO: Does this need to make a copy of p?
@@ -265,7 +285,7 @@ class FountainDecoder:
             # Reduce all the mixed parts by this one
             self.reduce_mixed_by(p2)
             # Record this new mixed part
-            self.mixed_parts[p2.indexes] = p2
+            self.add_mixed_part(p2)
 
     def validate_part(self, p):
         # If this is the first part we've seen
@@ -278,6 +298,9 @@ class FountainDecoder:
             self.expected_message_len = p.message_len
             self.expected_checksum = p.checksum
             self.expected_fragment_len = len(p.data)
+
+            # Repeated frames and animation loops will keep revisiting the same seq_nums
+            self.fragment_selection = FragmentSelectionTable(p.seq_len, p.checksum)
         else:
             # If this part's values don't match the first part's values, throw away the part
             if self.expected_part_count() != p.seq_len:
@@ -339,3 +362,90 @@ class FountainDecoder:
         except Exception as e:
             import traceback
             traceback.print_exc()
+
+
+
+class GaussianFountainDecoder(FountainDecoder):
+    """
+    Alternate decoding engine that solves the fountain code as a system of linear
+    equations over GF(2) instead of by peeling.
+
+    Each received part is a row: a bitmask of the fragment indexes it mixes plus its
+    data as an int (XOR is then a single int op). Rows are kept in reduced row echelon
+    form, keyed by their pivot fragment index, and updated incrementally as each part
+    arrives. The message is solved as soon as the matrix reaches full rank, so
+    completion only needs about `seq_len` linearly independent parts, whereas peeling
+    can stall on mixed parts that never get reduced to a single fragment.
+    """
+    def __init__(self):
+        super().__init__()
+        # {pivot index: [indexes bitmask, data as int]}
+        self.rows = {}
+
+
+    def estimated_percent_complete(self, weight_mixed_frames: bool = False):
+        if not weight_mixed_frames or self.is_complete() or self.expected_part_indexes == None:
+            return super().estimated_percent_complete(weight_mixed_frames=weight_mixed_frames)
+
+        # The rank of the system is exactly how many of the `seq_len` independent
+        # parts we've collected.
+        return len(self.rows) / float(self.expected_part_count())
+
+
+    def receive_part(self, encoder_part):
+        # Don't process the part if we're already done
+        if self.is_complete():
+            return False
+
+        # Don't continue if this part doesn't validate
+        if not self.validate_part(encoder_part):
+            return False
+
+        indexes = self.fragment_selection.get(encoder_part.seq_num)
+        self.last_part_indexes = indexes
+        self.processed_parts_count += 1
+
+        mask = 0
+        for index in indexes:
+            mask |= 1 << index
+        data = int.from_bytes(encoder_part.data, 'little')
+
+        # Reduce the new row by every existing pivot row it mixes in
+        for pivot, (row_mask, row_data) in self.rows.items():
+            if mask >> pivot & 1:
+                mask ^= row_mask
+                data ^= row_data
+
+        if mask == 0:
+            # Linearly dependent on what we already have; no new info
+            return False
+
+        # Eliminate the new pivot from the existing rows
+        pivot = (mask & -mask).bit_length() - 1
+        for row_pivot, row in self.rows.items():
+            if row[0] >> pivot & 1:
+                row[0] ^= mask
+                row[1] ^= data
+                if row[0] == 1 << row_pivot:
+                    self.received_part_indexes.add(row_pivot)
+
+        self.rows[pivot] = [mask, data]
+        if mask == 1 << pivot:
+            self.received_part_indexes.add(pivot)
+
+        # At full rank every row has been reduced to a single fragment
+        if len(self.rows) == self.expected_part_count():
+            fragments = []
+            for index in range(self.expected_part_count()):
+                fragments.append(self.rows[index][1].to_bytes(self.expected_fragment_len, 'little'))
+
+            message = self.join_fragments(fragments, self.expected_message_len)
+
+            # Verify the message checksum and note success or failure
+            checksum = crc32_int(message)
+            if(checksum == self.expected_checksum):
+                self.result = bytes(message)
+            else:
+                self.result = InvalidChecksum()
+
+        return True
@@ -7,8 +7,8 @@
 
 import math
 from .cbor_lite import CBORDecoder, CBOREncoder
-from .fountain_utils import choose_fragments
-from .utils import split, crc32_int, xor_into, data_to_hex
+from .fountain_utils import FragmentSelectionTable
+from .utils import split, crc32_int, xor_all, data_to_hex
 from .constants import MAX_UINT32, MAX_UINT64
 
 class InvalidHeader(Exception):
@@ -91,6 +91,10 @@ class FountainEncoder:
         self.fragments = FountainEncoder.partition_message(message, self.fragment_len)
         self.seq_num = first_seq_num
         self.current_part: Part = None
+
+        # Animations loop back to the start via `restart()`; don't re-derive the
+        # fragment indexes for each pass.
+        self.fragment_selection = FragmentSelectionTable(self.seq_len(), self.checksum)
     
     @staticmethod
     def find_nominal_fragment_length(message_len, min_fragment_len, max_fragment_len):
@@ -141,9 +145,8 @@ class FountainEncoder:
     def next_part(self):
         self.seq_num += 1
         self.seq_num = self.seq_num % MAX_UINT32  # wrap at period 2^32
-        indexes = choose_fragments(self.seq_num, self.seq_len(), self.checksum)
-        mixed = self.mix(indexes)
-        data = bytes(mixed)
+        indexes = self.fragment_selection.get(self.seq_num)
+        data = self.mix(indexes)
         self.current_part = Part(self.seq_num, self.seq_len(), self.message_len, self.checksum, data)
         return self.current_part
     
@@ -157,7 +160,4 @@ class FountainEncoder:
 
 
     def mix(self, indexes):
-        result = [0] * self.fragment_len
-        for index in indexes:
-            xor_into(result, self.fragments[index])
-        return result
+        return xor_all((self.fragments[index] for index in indexes), self.fragment_len)
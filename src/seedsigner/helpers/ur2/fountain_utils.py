@@ -20,12 +20,28 @@ def shuffled(items, rng):
 
     return result
 
-def choose_degree(seq_len, rng):
-    degree_probabilities = []
-    for i in range(1, seq_len + 1):
-        degree_probabilities.append(1.0 / i)
+# The degree alias table only depends on `seq_len`, so each one is built once and
+# reused for every mixed part (by both the encoder and the decoder).
+DEGREE_SAMPLERS = {}
+MAX_DEGREE_SAMPLERS = 4
+
+def get_degree_sampler(seq_len):
+    sampler = DEGREE_SAMPLERS.get(seq_len)
+    if sampler == None:
+        if len(DEGREE_SAMPLERS) >= MAX_DEGREE_SAMPLERS:
+            DEGREE_SAMPLERS.clear()
+
+        degree_probabilities = []
+        for i in range(1, seq_len + 1):
+            degree_probabilities.append(1.0 / i)
+
+        sampler = RandomSampler(degree_probabilities)
+        DEGREE_SAMPLERS[seq_len] = sampler
+
+    return sampler
 
-    degree_chooser = RandomSampler(degree_probabilities)
+def choose_degree(seq_len, rng):
+    degree_chooser = get_degree_sampler(seq_len)
     return degree_chooser.next(lambda: rng.next_double()) + 1
 
 def choose_fragments(seq_num, seq_len, checksum):
@@ -38,18 +54,49 @@ def choose_fragments(seq_num, seq_len, checksum):
         seed = int_to_bytes(seq_num) + int_to_bytes(checksum)
         rng = Xoshiro256.from_bytes(seed)
         degree = choose_degree(seq_len, rng)
-        indexes = []
 
-        for i in range(seq_len):
-            indexes.append(i)
-        shuffled_indexes = shuffled(indexes, rng)
-        return set(shuffled_indexes[0:degree])
+        # Partial Fisher-Yates shuffle: only the first `degree` shuffled indexes are
+        # kept, so stop drawing once we have them. Draws the exact same sequence as
+        # `shuffled()` up to that point.
+        remaining = list(range(seq_len))
+        indexes = set()
+        for i in range(degree):
+            indexes.add(remaining.pop(rng.next_int(0, len(remaining) - 1)))
+        return indexes
+
+class FragmentSelectionTable:
+    """
+    Memoized `choose_fragments` results for a single message.
+
+    Animated QRs loop and cameras capture the same frame more than once, so the same
+    `seq_num` is seen again and again. Only the first `cycle_len` seq_nums are kept
+    (defaults to two passes through the fragments) so a long-running animation can't
+    grow the table without bound. Call `precompute()` to pay for a whole animation
+    cycle up front.
+    """
+    def __init__(self, seq_len, checksum, cycle_len = None):
+        self.seq_len = seq_len
+        self.checksum = checksum
+        self.cycle_len = cycle_len if cycle_len != None else 2 * seq_len
+        self.table = {}
+
+    def precompute(self):
+        for seq_num in range(1, self.cycle_len + 1):
+            self.get(seq_num)
+
+    def get(self, seq_num):
+        indexes = self.table.get(seq_num)
+        if indexes == None:
+            indexes = frozenset(choose_fragments(seq_num, self.seq_len, self.checksum))
+            if seq_num <= self.cycle_len:
+                self.table[seq_num] = indexes
+        return indexes
 
 def contains(set_or_list, el):
     return el in set_or_list
 
 def is_strict_subset(a, b):
-    return a.issubset(b)
+    return a < b
 
 def set_difference(a, b):
     return a.difference(b)
\ No newline at end of file
@@ -27,8 +27,10 @@ class InvalidFragment(Exception):
     pass
 
 class URDecoder:
-    def __init__(self):
-        self.fountain_decoder = FountainDecoder()
+    # `fountain_decoder_class` selects the fountain decoding engine: the default
+    # peeling `FountainDecoder` or the `GaussianFountainDecoder`.
+    def __init__(self, fountain_decoder_class=FountainDecoder):
+        self.fountain_decoder = fountain_decoder_class()
         self.expected_type = None
         self.result = None
 
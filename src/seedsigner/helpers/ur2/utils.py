@@ -55,11 +55,24 @@ def join_bytes(list_of_ba):
         out.extend(ba)
     return out
 
+# XOR is done on whole fragments at once: each buffer is loaded as a single
+# arbitrary-precision int so the work happens in C, word by word, rather than
+# one Python-level byte at a time.
+def xor_bytes(a, b):
+    count = len(a)
+    assert count == len(b) # Must be the same length
+    return (int.from_bytes(a, 'little') ^ int.from_bytes(b, 'little')).to_bytes(count, 'little')
+
+# XOR together any number of equal-length buffers, returning `count` bytes.
+def xor_all(bufs, count):
+    acc = 0
+    for buf in bufs:
+        assert len(buf) == count # Must be the same length
+        acc ^= int.from_bytes(buf, 'little')
+    return acc.to_bytes(count, 'little')
+
 def xor_into(target, source):
-    count = len(target)
-    assert count == len(source) # Must be the same length
-    for i in range(count):
-        target[i] ^= source[i]
+    target[:] = xor_bytes(target, source)
 
 def xor_with(a, b):
     target = a
@@ -5,8 +5,9 @@ import re
 import zlib
 
 from binascii import a2b_base64, b2a_base64
+from collections import OrderedDict
 from enum import IntEnum
-from embit import psbt, bip39, ec
+from embit import psbt, ec
 from pyzbar import pyzbar
 from pyzbar.pyzbar import ZBarSymbol
 from urtypes.crypto import PSBT as UR_PSBT
@@ -14,6 +15,7 @@ from urtypes.crypto import Account, Output
 from urtypes.bytes import Bytes
 from base64 import b32encode, b32decode
 
+from seedsigner.helpers import seedqr
 from seedsigner.helpers.ur2.ur_decoder import URDecoder
 from seedsigner.models.qr_type import QRType
 from seedsigner.models.seed import Seed
@@ -36,16 +38,113 @@ class DecodeQRStatus(IntEnum):
 
 
 
+# `DecodeQR.detect_segment_type` runs on every scanned frame; compile its patterns once
+UR_PSBT_PATTERN = re.compile("^UR:CRYPTO-PSBT/", re.IGNORECASE)
+UR_OUTPUT_PATTERN = re.compile("^UR:CRYPTO-OUTPUT/", re.IGNORECASE)
+UR_ACCOUNT_PATTERN = re.compile("^UR:CRYPTO-ACCOUNT/", re.IGNORECASE)
+UR_BYTES_PATTERN = re.compile("^UR:BYTES/", re.IGNORECASE)
+SPECTER_PSBT_PATTERN = re.compile(r'^p(\d+)of(\d+) ([A-Za-z0-9+\/=]+$)', re.IGNORECASE)  # must be base64 characters only in segment
+SPECTER_SEGMENT_PATTERN = re.compile(r'^p(\d+)of(\d+) ', re.IGNORECASE)
+BBQR_PATTERN = re.compile(r"^B\$[2HZ]P[0-9A-Z]{4}")  # https://github.com/coinkite/BBQr/blob/master/BBQr.md#spliting-the-data
+SPECTER_WALLET_JSON_PATTERN = re.compile(r'^\{\"label\".*\"descriptor\"\:.*', re.IGNORECASE)
+SEEDQR_PATTERN = re.compile(r'\d{48,96}')
+BITCOIN_URI_PATTERN = re.compile(r'^bitcoin\:.*', re.IGNORECASE)
+BITCOIN_ADDRESS_PATTERN = re.compile(r'^((bc1|tb1|bcr|[123]|[mn])[a-zA-HJ-NP-Z0-9]{25,62})$', re.IGNORECASE)
+
+# Anything else fails in the full decode anyway; these just get there faster
+BASE64_PSBT_PREFIX = "cHNidP"  # b64encode(b"psbt\xff")[:6]
+BASE43_PATTERN = re.compile(r'^[0-9A-Z$*+\-./:]+$')
+WIF_PATTERN = re.compile(r'^[1-9A-HJ-NP-Za-km-z]{37,52}$')  # base58 of 37 or 38 bytes
+
+
+# (characters the segment can start with or None if it can start with anything, test, QRType)
+# in order of precedence. The mnemonic checks come last and need the wordlist, so
+# they're handled separately.
+SEGMENT_TYPE_RULES = [
+    # PSBT
+    ("Uu", UR_PSBT_PATTERN.match, QRType.PSBT__UR2),
+    ("Uu", UR_OUTPUT_PATTERN.match, QRType.OUTPUT__UR),
+    ("Uu", UR_ACCOUNT_PATTERN.match, QRType.ACCOUNT__UR),
+    ("pP", SPECTER_PSBT_PATTERN.match, QRType.PSBT__SPECTER),
+    ("Uu", UR_BYTES_PATTERN.match, QRType.BYTES__UR),
+    (BASE64_PSBT_PREFIX[0], lambda s: DecodeQR.is_base64_psbt(s), QRType.PSBT__BASE64),
+    ("B", BBQR_PATTERN.match, QRType.PSBT__BBQR),
+
+    # Wallet Descriptor
+    # when not a SPECTER Base64 PSBT from above, assume it's json
+    ("pP", SPECTER_SEGMENT_PATTERN.match, QRType.WALLET__SPECTER),
+    # if json starting with label and contains descriptor, assume specter wallet json
+    ("{ \n", lambda s: SPECTER_WALLET_JSON_PATTERN.match(s.replace("\n","").replace(" ","")), QRType.WALLET__SPECTER),
+    (None, lambda s: "multisig setup file" in s.lower(), QRType.WALLET__CONFIGFILE),
+    (None, lambda s: "sortedmulti" in s, QRType.WALLET__GENERIC),
+
+    # Seed
+    (None, SEEDQR_PATTERN.search, QRType.SEED__SEEDQR),
+
+    # Bitcoin Address
+    ("bBtT123mMnN", lambda s: DecodeQR.is_bitcoin_address(s), QRType.BITCOIN_ADDRESS),
+
+    # WIF private key
+    (None, lambda s: DecodeQR.is_wif(s), QRType.PRIVATE_KEY__WIF),
+
+    # message signing
+    ("s", lambda s: s.startswith("signmessage"), QRType.SIGN_MESSAGE),
+
+    # config data
+    ("s", lambda s: s.startswith("settings::"), QRType.SETTINGS),
+]
+
+# {first character: rules that segment could match}; segments starting with any
+# other character only need the rules that aren't anchored to the start.
+SEGMENT_TYPE_RULES_ANYWHERE = tuple(rule for rule in SEGMENT_TYPE_RULES if rule[0] is None)
+SEGMENT_TYPE_RULES_BY_FIRST_CHAR = {
+    first_char: tuple(rule for rule in SEGMENT_TYPE_RULES if rule[0] is None or first_char in rule[0])
+    for first_chars in [rule[0] for rule in SEGMENT_TYPE_RULES if rule[0]]
+    for first_char in first_chars
+}
+
+
+
 class DecodeQR:
     """
         Used to process images or string data from animated qr codes.
     """
+    # How many recently accepted raw payloads to remember. Animated QRs loop and the
+    # camera often captures the same frame several times in a row; byte-identical
+    # repeats are answered from this cache without being re-parsed.
+    RECENT_PAYLOADS_MAX_SIZE = 256
+
+    # An animated QR held up to the camera barely moves between frames. After a
+    # successful decode, later frames are first scanned only in a region of interest
+    # (ROI) around where the QR was, padded on each side by this fraction of the QR's
+    # size.
+    ROI_MARGIN = 0.25
+
+    # Frames the ROI missed still get a full-frame scan. After this many misses in a
+    # row, stop trying the ROI first until the next successful decode.
+    ROI_MAX_MISSES = 3
+
+    # {wordlist_language_code: (full words, 4 letter words)}; see get_wordlist_lookups()
+    _wordlist_lookups = {}
+
     def __init__(self, wordlist_language_code: str = SettingsConstants.WORDLIST_LANGUAGE__ENGLISH):
         self.wordlist_language_code = wordlist_language_code
         self.complete = False
         self.qr_type = None
         self.decoder = None
 
+        # LRU of raw payloads that were already accepted as a part
+        self.recent_payloads = OrderedDict()
+        self.recent_payloads_hits = 0
+        self.recent_payloads_misses = 0
+
+        # (left, top, right, bottom) to scan first in luminance frames, if any
+        self.roi = None
+        self.roi_frame_size = None
+        self.roi_misses = 0
+        self.roi_scans = 0
+        self.full_frame_scans = 0
+
 
     def add_image(self, image):
         data = DecodeQR.extract_qr_data(image, is_binary=True)
@@ -55,10 +154,87 @@ class DecodeQR:
         return self.add_data(data)
 
 
+    def add_luminance(self, pixels: bytes, width: int, height: int):
+        barcode = None
+        if self.roi and self.roi_frame_size != (width, height):
+            # The camera resolution changed; the ROI no longer applies
+            self.roi = None
+            self.roi_misses = 0
+
+        if self.roi:
+            (left, top, right, bottom) = self.roi
+            self.roi_scans += 1
+            barcode = DecodeQR.decode_luminance(DecodeQR.crop_luminance(pixels, width, self.roi), right - left, bottom - top, is_binary=True)
+            if barcode:
+                self.roi_misses = 0
+                self.update_roi(barcode.rect, width, height, offset=(left, top))
+            else:
+                self.roi_misses += 1
+                if self.roi_misses >= self.ROI_MAX_MISSES:
+                    # The QR has moved or is gone; stop paying for the extra ROI scan
+                    self.roi = None
+
+        if not barcode:
+            # Either there's no ROI yet or the QR wasn't in it; a frame is never
+            # dropped just because the ROI missed it.
+            self.full_frame_scans += 1
+            barcode = DecodeQR.decode_luminance(pixels, width, height, is_binary=True)
+            if not barcode:
+                return DecodeQRStatus.FALSE
+            self.roi_misses = 0
+            self.update_roi(barcode.rect, width, height)
+
+        return self.add_data(barcode.data)
+
+
+    def update_roi(self, rect, width: int, height: int, offset: tuple[int, int] = (0, 0)):
+        """
+            Sets the ROI to the bounding `rect` (left, top, width, height) zbar reported
+            for the last decode, plus a margin, clamped to the frame. `offset` is the
+            top left corner of the cropped region `rect` was found in.
+        """
+        margin = int(max(rect.width, rect.height) * self.ROI_MARGIN)
+        left = max(0, offset[0] + rect.left - margin)
+        top = max(0, offset[1] + rect.top - margin)
+        right = min(width, offset[0] + rect.left + rect.width + margin)
+        bottom = min(height, offset[1] + rect.top + rect.height + margin)
+        if right - left >= width and bottom - top >= height:
+            # Nothing to gain from cropping
+            self.roi = None
+        else:
+            self.roi = (left, top, right, bottom)
+            self.roi_frame_size = (width, height)
+
+
     def add_data(self, data):
         if data == None:
             return DecodeQRStatus.FALSE
 
+        if data in self.recent_payloads:
+            # Exact repeat of a frame we've already processed
+            self.recent_payloads.move_to_end(data)
+            self.recent_payloads_hits += 1
+            if self.complete:
+                return DecodeQRStatus.COMPLETE
+            return DecodeQRStatus.PART_EXISTING
+
+        self.recent_payloads_misses += 1
+        rt = self.process_data(data)
+
+        # Only remember payloads that were accepted as a part; anything else (invalid
+        # data, completing frames, etc) keeps going through the full decode.
+        if rt in [DecodeQRStatus.PART_COMPLETE, DecodeQRStatus.PART_EXISTING]:
+            self.recent_payloads[data] = None
+            if len(self.recent_payloads) > self.RECENT_PAYLOADS_MAX_SIZE:
+                self.recent_payloads.popitem(last=False)
+
+        if rt == DecodeQRStatus.COMPLETE:
+            logger.debug(f"{self.qr_type} decode complete; repeated frames skipped: {self.recent_payloads_hits}, frames decoded: {self.recent_payloads_misses}")
+
+        return rt
+
+
+    def process_data(self, data):
         qr_type = DecodeQR.detect_segment_type(data, wordlist_language_code=self.wordlist_language_code)
 
         if self.qr_type == None:
@@ -341,6 +517,39 @@ class DecodeQR:
             return barcode.data
 
 
+    @staticmethod
+    def extract_qr_data_from_luminance(pixels: bytes, width: int, height: int, is_binary: bool = False) -> str | None:
+        """
+            `pixels` is an 8-bit grayscale image, one byte per pixel in row order. It's
+            handed to zbar as-is; no PIL or numpy conversion on the way in.
+        """
+        barcode = DecodeQR.decode_luminance(pixels, width, height, is_binary=is_binary)
+        if barcode:
+            return barcode.data
+
+
+    @staticmethod
+    def decode_luminance(pixels: bytes, width: int, height: int, is_binary: bool = False):
+        """
+            Returns the first QR pyzbar finds in the grayscale `pixels` (with its `data`
+            and bounding `rect`), or None.
+        """
+        if pixels is None:
+            return None
+
+        barcodes = pyzbar.decode((pixels, width, height), symbols=[ZBarSymbol.QRCODE], binary=is_binary)
+        for barcode in barcodes:
+            # Only pull and return the first barcode
+            return barcode
+
+
+    @staticmethod
+    def crop_luminance(pixels: bytes, width: int, roi: tuple[int, int, int, int]) -> bytes:
+        (left, top, right, bottom) = roi
+        view = memoryview(pixels)
+        return b"".join(view[row + left:row + right] for row in range(top * width, bottom * width, width))
+
+
     @staticmethod
     def detect_segment_type(s, wordlist_language_code=None):
 
@@ -355,77 +564,19 @@ class DecodeQR:
             logger.debug(f"segment string: {s}")
             logger.debug(f"segment string length: {len(s)}")
 
-            # PSBT
-            if re.search("^UR:CRYPTO-PSBT/", s, re.IGNORECASE):
-                return QRType.PSBT__UR2
-
-            elif re.search("^UR:CRYPTO-OUTPUT/", s, re.IGNORECASE):
-                return QRType.OUTPUT__UR
-
-            elif re.search("^UR:CRYPTO-ACCOUNT/", s, re.IGNORECASE):
-                return QRType.ACCOUNT__UR
-
-            elif re.search(r'^p(\d+)of(\d+) ([A-Za-z0-9+\/=]+$)', s, re.IGNORECASE): #must be base64 characters only in segment
-                return QRType.PSBT__SPECTER
-
-            elif re.search("^UR:BYTES/", s, re.IGNORECASE):
-                return QRType.BYTES__UR
-
-            elif DecodeQR.is_base64_psbt(s):
-                return QRType.PSBT__BASE64
-
-            elif re.search(r"^B\$[2HZ]P[0-9A-Z]{4}", s): # https://github.com/coinkite/BBQr/blob/master/BBQr.md#spliting-the-data
-                return QRType.PSBT__BBQR
-
-            # Wallet Descriptor
-            desc_str = s.replace("\n","").replace(" ","")
-            if re.search(r'^p(\d+)of(\d+) ', s, re.IGNORECASE):
-                # when not a SPECTER Base64 PSBT from above, assume it's json
-                return QRType.WALLET__SPECTER
-
-            elif re.search(r'^\{\"label\".*\"descriptor\"\:.*', desc_str, re.IGNORECASE):
-                # if json starting with label and contains descriptor, assume specter wallet json
-                return QRType.WALLET__SPECTER
-
-            elif "multisig setup file" in s.lower():
-                return QRType.WALLET__CONFIGFILE
-
-            elif "sortedmulti" in s:
-                return QRType.WALLET__GENERIC
+            # Only try the formats that can start with this segment's first character
+            for (first_chars, test, qr_type) in SEGMENT_TYPE_RULES_BY_FIRST_CHAR.get(s[:1], SEGMENT_TYPE_RULES_ANYWHERE):
+                if test(s):
+                    return qr_type
 
             # Seed
-            if re.search(r'\d{48,96}', s):
-                return QRType.SEED__SEEDQR
-
-            # Bitcoin Address
-            elif DecodeQR.is_bitcoin_address(s):
-                return QRType.BITCOIN_ADDRESS
-
-            # WIF private key
-            elif DecodeQR.is_wif(s):
-                return QRType.PRIVATE_KEY__WIF
-
-            # message signing
-            elif s.startswith("signmessage"):
-                return QRType.SIGN_MESSAGE
-
-            # config data
-            if s.startswith("settings::"):
-                return QRType.SETTINGS
-
-            # Seed
-            # create 4 letter wordlist only if not PSBT (performance gain)
-            wordlist = Seed.get_wordlist(wordlist_language_code)
-            try:
-                _4LETTER_WORDLIST = [word[:4].strip() for word in wordlist]
-            except:
-                _4LETTER_WORDLIST = []
-
-            if all(x in wordlist for x in s.strip().split(" ")):
+            (wordlist, _4LETTER_WORDLIST) = DecodeQR.get_wordlist_lookups(wordlist_language_code)
+            words = s.strip().split(" ")
+            if all(x in wordlist for x in words):
                 # checks if all words in list are in BIP-39 word list
                 return QRType.SEED__MNEMONIC
 
-            elif all(x in _4LETTER_WORDLIST for x in s.strip().split(" ")):
+            elif all(x in _4LETTER_WORDLIST for x in words):
                 # checks if all 4 letter words are in list are in 4 letter BIP-39 word list
                 return QRType.SEED__FOUR_LETTER_MNEMONIC
 
@@ -448,20 +599,23 @@ class DecodeQR:
 
         # 32 bytes for 24-word CompactSeedQR; 16 bytes for 12-word CompactSeedQR
         if len(s) == 32 or len(s) == 16:
-            try:
-                bitstream = ""
-                for b in s:
-                    bitstream += bin(b).lstrip('0b').zfill(8)
-                # print(bitstream)
-
-                return QRType.SEED__COMPACTSEEDQR
-            except Exception as e:
-                # Couldn't extract byte data; assume it's not a byte format
-                pass
+            return QRType.SEED__COMPACTSEEDQR
 
         return QRType.INVALID
 
 
+    @staticmethod
+    def get_wordlist_lookups(wordlist_language_code) -> tuple[dict[str, int], set[str]]:
+        """
+            Returns lookups of the language's full BIP-39 words (the SeedQR word ->
+            index dict) and their 4 letter abbreviations, built on first use.
+        """
+        if wordlist_language_code not in DecodeQR._wordlist_lookups:
+            word_indexes = seedqr.get_word_indexes(wordlist_language_code)
+            DecodeQR._wordlist_lookups[wordlist_language_code] = (word_indexes, set(word[:4].strip() for word in word_indexes))
+        return DecodeQR._wordlist_lookups[wordlist_language_code]
+
+
     @staticmethod   
     def is_base64(s):
         try:
@@ -472,6 +626,8 @@ class DecodeQR:
 
     @staticmethod   
     def is_base64_psbt(s):
+        if not s.startswith(BASE64_PSBT_PREFIX):
+            return False
         try:
             if DecodeQR.is_base64(s):
                 psbt.PSBT.parse(a2b_base64(s))
@@ -483,6 +639,8 @@ class DecodeQR:
 
     @staticmethod
     def is_base43_psbt(s):
+        if isinstance(s, str) and not BASE43_PATTERN.match(s):
+            return False
         try:
             psbt.PSBT.parse(DecodeQR.base43_decode(s))
             return True
@@ -529,17 +687,20 @@ class DecodeQR:
 
     @staticmethod
     def is_bitcoin_address(s):
-        if re.search(r'^bitcoin\:.*', s, re.IGNORECASE):
+        if BITCOIN_URI_PATTERN.match(s):
             return True
-        elif re.search(r'^((bc1|tb1|bcr|[123]|[mn])[a-zA-HJ-NP-Z0-9]{25,62})$', s, re.IGNORECASE):
+        elif BITCOIN_ADDRESS_PATTERN.match(s):
             return True
         else:
             return False
 
     @staticmethod
     def is_wif(s):
+        s = s.strip()
+        if not WIF_PATTERN.match(s):
+            return False
         try:
-            ec.PrivateKey.from_wif(s.strip())
+            ec.PrivateKey.from_wif(s)
             return True
         except Exception:
             return False
@@ -680,8 +841,13 @@ class BaseAnimatedQrDecoder(BaseQrDecoder):
         raise Exception("Not implemented in child class")
 
     def parse_segment(self, segment) -> str:
+        """ Returns the segment's payload, or None if it can't be parsed """
         raise Exception("Not implemented in child class")
     
+    def segment_added(self, segment_num: int):
+        """ Optional hook to process each new segment as soon as it's stored """
+        pass
+
     @property
     def is_valid(self) -> bool:
         return True
@@ -695,8 +861,14 @@ class BaseAnimatedQrDecoder(BaseQrDecoder):
 
         current_segment_num = self.current_segment_num(segment)
         if self.segments[current_segment_num - 1] == None:
-            self.segments[current_segment_num - 1] = self.parse_segment(segment)
+            parsed_segment = self.parse_segment(segment)
+            if parsed_segment is None:
+                # Bad read; leave the slot open so a clean re-scan of this part can fill it
+                return DecodeQRStatus.FALSE
+
+            self.segments[current_segment_num - 1] = parsed_segment
             self.collected_segments += 1
+            self.segment_added(current_segment_num)
             if self.total_segments == self.collected_segments:
                 if self.is_valid:
                     self.complete = True
@@ -747,35 +919,42 @@ class SpecterPsbtQrDecoder(BaseAnimatedQrDecoder):
 class BBQRPsbtQrDecoder(BaseAnimatedQrDecoder):
     """
         Used to decode BBQR Animated PSBT encoding.
+
+        Each segment is decoded to bytes as it arrives, and every run of segments
+        that's contiguous with the ones before it goes straight into the zlib
+        decompressor; the frame that completes the PSBT only has to finish off the
+        last chunk.
     """
     def __init__(self):
         super().__init__()
         self.encoding = None
+        self.decompressor = None
+        self.num_decoded_segments = 0   # segments [0, n) are already in `data`
+        self.data = bytearray()
+        self.decode_error = None
 
 
-    def get_data(self) -> str:
-        logger.debug("BBQRPsbtQrDecoder get_data")
-        data = "".join(self.segments)
-        if self.complete and self.encoding:
-            if self.encoding == 'H':
-                return b''.join(bytes.fromhex(s) for s in self.segments)
+    @property
+    def is_valid(self) -> bool:
+        return self.decode_error is None
 
-            # base32 decode, but insert padding for API
-            rv = b''
-            for p in self.segments:
-                padding = (8 - (len(p) % 8)) % 8
-                rv += b32decode(p + (padding*'='))
 
-            if self.encoding == 'Z':
-                # decompress
-                z = zlib.decompressobj(wbits=-10)
-                rv = z.decompress(rv)
-                rv += z.flush()
+    def add(self, segment, qr_type=None):
+        status = super().add(segment, qr_type)
+        if self.decode_error:
+            # The deflate stream is broken; no point scanning the remaining parts
+            return DecodeQRStatus.INVALID
+        return status
 
-            return rv
+
+    def get_data(self) -> bytes:
+        logger.debug("BBQRPsbtQrDecoder get_data")
+        if self.complete and self.encoding:
+            return self.data
 
         return None
 
+
     def current_segment_num(self, segment) -> int:
         current_segment = int(segment[6:8], 36) + 1
         logger.debug(f"BBQRPsbtQrDecoder current_segment_num {current_segment}")
@@ -788,12 +967,47 @@ class BBQRPsbtQrDecoder(BaseAnimatedQrDecoder):
         return total_segments
 
 
-    def parse_segment(self, segment) -> str:
+    def parse_segment(self, segment) -> bytes:
         self.encoding = segment[2]
         file_type = segment[3]
-        data = segment[8:]
+        data = segment[8:].strip()
 
-        return data.strip()
+        try:
+            if self.encoding == 'H':
+                return bytes.fromhex(data)
+
+            # base32 decode, but insert padding for API
+            padding = (8 - (len(data) % 8)) % 8
+            return b32decode(data + (padding*'='))
+
+        except ValueError as e:
+            # Bad hex or base32 (binascii.Error is a ValueError)
+            logger.debug(f"BBQRPsbtQrDecoder couldn't parse segment: {e}")
+            return None
+
+
+    def segment_added(self, segment_num: int):
+        if self.encoding == 'Z' and self.decompressor is None:
+            self.decompressor = zlib.decompressobj(wbits=-10)
+
+        try:
+            while self.num_decoded_segments < self.total_segments and self.segments[self.num_decoded_segments] is not None:
+                decoded = self.segments[self.num_decoded_segments]
+                if self.decompressor:
+                    decoded = self.decompressor.decompress(decoded)
+                self.data += decoded
+
+                # Still not None, so it reads as collected, but no longer held in memory
+                self.segments[self.num_decoded_segments] = b''
+                self.num_decoded_segments += 1
+
+            if self.num_decoded_segments == self.total_segments:
+                if self.decompressor:
+                    self.data += self.decompressor.flush()
+                self.data = bytes(self.data)
+
+        except zlib.error as e:
+            self.decode_error = e
 
 
 
@@ -863,14 +1077,8 @@ class SeedQrDecoder(BaseSingleFrameQrDecoder):
         # `segment` data will either be bytes or str, depending on the qr_type
         if qr_type == QRType.SEED__SEEDQR:
             try:
-                self.seed_phrase = []
-
                 # Parse 12 or 24-word QR code
-                num_words = int(len(segment) / 4)
-                for i in range(0, num_words):
-                    index = int(segment[i * 4: (i*4) + 4])
-                    word = self.wordlist[index]
-                    self.seed_phrase.append(word)
+                self.seed_phrase = seedqr.seedqr_to_mnemonic(segment, self.wordlist_language_code)
                 if len(self.seed_phrase) > 0:
                     if self.is_12_or_24_word_phrase() == False:
                         return DecodeQRStatus.INVALID
@@ -884,7 +1092,7 @@ class SeedQrDecoder(BaseSingleFrameQrDecoder):
 
         if qr_type == QRType.SEED__COMPACTSEEDQR:
             try:
-                self.seed_phrase = bip39.mnemonic_from_bytes(segment).split()
+                self.seed_phrase = seedqr.compact_seedqr_to_mnemonic(segment, self.wordlist_language_code)
                 self.complete = True
                 self.collected_segments = 1
                 return DecodeQRStatus.COMPLETE
@@ -0,0 +1,258 @@
+import atexit
+import logging
+import os
+import select
+import struct
+import subprocess
+import sys
+import time
+
+from collections import deque
+from multiprocessing.shared_memory import SharedMemory
+
+from seedsigner.models import decode_qr_worker
+from seedsigner.models.decode_qr_worker import RESULT_FORMAT, TASK_FORMAT, read_exactly
+from seedsigner.models.settings_definition import SettingsConstants
+
+
+logger = logging.getLogger(__name__)
+
+
+
+class DecodeQRPool:
+    """
+        Decodes camera frames in worker processes so that zbar can use the cores that
+        otherwise sit idle (under the GIL) while scanning.
+
+        Frames are copied into preallocated `SharedMemory` slots; only the tiny
+        (seq_num, slot, width, height) tasks go through the workers' pipes. Raw QR
+        payloads are handed back in the order the frames were submitted so they can be
+        fed to `DecodeQR.add_data()` exactly as if they'd been decoded in-process.
+
+        Starting the workers isn't free, so one long-lived pool is shared by every scan;
+        see `get_instance()`.
+    """
+    _instance: "DecodeQRPool" = None
+
+
+    def __init__(self, num_workers: int, frame_size: tuple[int, int], num_slots: int = None):
+        self.num_workers = num_workers
+        self.frame_size = frame_size
+        (width, height) = frame_size
+        self.frame_len = width * height
+        if not num_slots:
+            # Enough for every worker to be busy with one frame while the next is queued
+            num_slots = 2 * num_workers
+
+        self.slots = [SharedMemory(create=True, size=self.frame_len) for i in range(num_slots)]
+        self.free_slots = deque(range(num_slots))
+
+        # seq_nums of submitted frames, in order
+        self.pending = deque()
+
+        # {seq_num: payload} of decoded frames waiting on an earlier frame
+        self.results = {}
+
+        # Each worker is a standalone `decode_qr_worker` process (see its docstring for
+        # why not multiprocessing).
+        self.workers: list[subprocess.Popen] = []
+
+        # {worker: {seq_num: slot_index}} of the tasks each worker hasn't answered yet
+        self.assigned = {}
+
+        # Make sure the workers can import seedsigner even if it isn't installed
+        package_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(decode_qr_worker.__file__))))
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [package_root, os.environ.get("PYTHONPATH")])))
+
+        slot_names = [slot.name for slot in self.slots]
+        for i in range(num_workers):
+            worker = subprocess.Popen(
+                [sys.executable, "-m", decode_qr_worker.__name__] + slot_names,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                env=env,
+                bufsize=0,
+            )
+            self.workers.append(worker)
+            self.assigned[worker] = {}
+        logger.info(f"Started {num_workers} QR decode workers")
+
+
+    @classmethod
+    def get_instance(cls, num_workers: int, frame_size: tuple[int, int]) -> "DecodeQRPool":
+        """
+            Returns the shared pool, starting it the first time it's needed and
+            restarting it if `num_workers` or `frame_size` changed or a worker died.
+            Returns None (and stops any running pool) if `num_workers` is 0.
+        """
+        pool = cls._instance
+        if pool and (pool.num_workers != num_workers or pool.frame_size != frame_size or len(pool.workers) != pool.num_workers):
+            pool.shutdown()
+            cls._instance = None
+
+        if num_workers and not cls._instance:
+            cls._instance = cls(num_workers=num_workers, frame_size=frame_size)
+            atexit.register(cls._instance.shutdown)
+
+        return cls._instance
+
+
+    @staticmethod
+    def get_num_workers(decode_workers_setting: str, cpu_count: int = None) -> int:
+        """
+            How many decode workers to run for the SETTING__DECODE_WORKERS value; 0
+            means decode in-process as usual. One core is always left for the camera,
+            live preview, and main threads.
+        """
+        if cpu_count is None:
+            cpu_count = os.cpu_count() or 1
+
+        if decode_workers_setting == SettingsConstants.OPTION__DISABLED:
+            return 0
+
+        elif decode_workers_setting == SettingsConstants.OPTION__ENABLED:
+            return max(1, cpu_count - 1)
+
+        else:
+            # Auto: only worth the extra processes' memory and startup time with at least
+            # two cores to spare (e.g. Pi Zero 2W, Pi 4; not the single core Pi Zero).
+            if cpu_count >= 3:
+                return cpu_count - 1
+            return 0
+
+
+    def submit(self, seq_num: int, pixels: bytes, width: int, height: int) -> bool:
+        """
+            Queues the grayscale frame for decoding. Returns False (and drops the
+            frame) if every slot is still in use, i.e. the workers are behind.
+        """
+        if len(pixels) > self.frame_len:
+            raise Exception(f"Frame is larger than the {self.frame_len} byte shared memory slots")
+
+        if not self.free_slots or not self.workers:
+            return False
+
+        slot_index = self.free_slots.popleft()
+        self.slots[slot_index].buf[:len(pixels)] = pixels
+
+        # Hand it to whichever worker has the least queued up
+        worker = min(self.workers, key=lambda worker: len(self.assigned[worker]))
+        self.pending.append(seq_num)
+        self.assigned[worker][seq_num] = slot_index
+        try:
+            worker.stdin.write(struct.pack(TASK_FORMAT, seq_num, slot_index, width, height))
+        except (BrokenPipeError, OSError):
+            self._remove_worker(worker)
+            return False
+        return True
+
+
+    def get_results(self, timeout: float = None) -> list[tuple[int, bytes]]:
+        """
+            Returns the (seq_num, payload) of every decoded frame that's ready, in
+            submission order; payload is None if there was no QR in the frame.
+
+            With a `timeout` (in seconds), first waits that long for a result to come
+            in; otherwise never blocks.
+
+            Frames held by a worker that died are dropped so that later frames aren't
+            stuck waiting on them forever.
+        """
+        result_len = struct.calcsize(RESULT_FORMAT)
+        wait = timeout or 0
+        while self.workers:
+            workers_by_fd = {worker.stdout.fileno(): worker for worker in self.workers}
+            (readable, _, _) = select.select(list(workers_by_fd.keys()), [], [], wait)
+            if not readable:
+                break
+            wait = 0
+
+            for fd in readable:
+                worker = workers_by_fd[fd]
+                result = read_exactly(worker.stdout, result_len)
+                if not result:
+                    # Closed its end of the pipe: it exited
+                    self._remove_worker(worker)
+                    continue
+
+                (seq_num, slot_index, data_len) = struct.unpack(RESULT_FORMAT, result)
+                data = read_exactly(worker.stdout, data_len) if data_len >= 0 else None
+                del self.assigned[worker][seq_num]
+                self.free_slots.append(slot_index)
+                self.results[seq_num] = data
+
+        for worker in list(self.workers):
+            if worker.poll() is not None:
+                self._remove_worker(worker)
+
+        finished = []
+        while self.pending and self.pending[0] in self.results:
+            seq_num = self.pending.popleft()
+            finished.append((seq_num, self.results.pop(seq_num)))
+        return finished
+
+
+    def _remove_worker(self, worker: subprocess.Popen):
+        """ Stops using a worker that died (e.g. zbar crashed) and drops its frames """
+        if worker not in self.workers:
+            return
+
+        self.workers.remove(worker)
+        lost = self.assigned.pop(worker)
+        for (seq_num, slot_index) in lost.items():
+            self.pending.remove(seq_num)
+            self.free_slots.append(slot_index)
+
+        if worker.poll() is None:
+            # Still running but stuck (see `reset()`)
+            worker.kill()
+        self._stop_worker(worker)
+        logger.warning(f"Dropped QR decode worker {worker.pid} (exit code {worker.returncode}) and its {len(lost)} frames")
+
+
+    @staticmethod
+    def _stop_worker(worker: subprocess.Popen, timeout: float = None):
+        for stream in (worker.stdin, worker.stdout):
+            try:
+                stream.close()
+            except OSError:
+                pass
+
+        try:
+            # Closing its stdin tells it to exit
+            worker.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            logger.warning(f"QR decode worker {worker.pid} didn't exit; terminating")
+            worker.kill()
+            worker.wait()
+
+
+    def reset(self, timeout: float = 1.0):
+        """
+            Discards every frame still in flight so the next scan starts clean. Waits up
+            to `timeout` seconds for the workers to finish them; any worker that's still
+            busy after that is stopped.
+        """
+        deadline = time.time() + timeout
+        while any(self.assigned.values()) and time.time() < deadline:
+            self.get_results(timeout=0.05)
+
+        for worker in list(self.workers):
+            if self.assigned[worker]:
+                self._remove_worker(worker)
+
+        self.pending.clear()
+        self.results.clear()
+
+
+    def shutdown(self):
+        for worker in self.workers:
+            self._stop_worker(worker, timeout=1.0)
+        self.workers = []
+        self.assigned = {}
+
+        for slot in self.slots:
+            slot.close()
+            slot.unlink()
+        self.slots = []
+        logger.info("Stopped QR decode workers")
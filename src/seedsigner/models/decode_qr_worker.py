@@ -0,0 +1,75 @@
+import struct
+import sys
+
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+"""
+    Entry point for DecodeQRPool's worker processes:
+        python3 -m seedsigner.models.decode_qr_worker <slot name> [<slot name> ...]
+
+    Run as its own process rather than as a multiprocessing child: those re-run the
+    parent's `__main__` imports (i.e. all of SeedSigner) in every worker. This only
+    loads pyzbar.
+
+    Reads (seq_num, slot_index, width, height) tasks from stdin and answers each with
+    (seq_num, slot_index, payload length) and the raw QR payload on stdout; a length of
+    -1 means there was no QR in the frame. Exits when stdin is closed.
+"""
+
+TASK_FORMAT = "<IHHH"
+RESULT_FORMAT = "<IHi"
+
+
+
+def read_exactly(stream, num_bytes: int) -> bytes:
+    """ Returns `num_bytes` from `stream`, or b'' if it closed first """
+    data = b''
+    while len(data) < num_bytes:
+        chunk = stream.read(num_bytes - len(data))
+        if not chunk:
+            return b''
+        data += chunk
+    return data
+
+
+
+def main(slot_names: list[str]):
+    from pyzbar import pyzbar
+    from pyzbar.pyzbar import ZBarSymbol
+
+    # The pool owns the slots and unlinks them; don't let this process start its own
+    # resource tracker, which would unlink them out from under the pool when we exit.
+    resource_tracker.register = lambda name, rtype: None
+    slots = [SharedMemory(name=name) for name in slot_names]
+
+    task_len = struct.calcsize(TASK_FORMAT)
+    try:
+        while True:
+            task = read_exactly(sys.stdin.buffer, task_len)
+            if not task:
+                # The pool shut down (or exited)
+                break
+
+            (seq_num, slot_index, width, height) = struct.unpack(TASK_FORMAT, task)
+            pixels = bytes(slots[slot_index].buf[:width * height])
+
+            data = None
+            for barcode in pyzbar.decode((pixels, width, height), symbols=[ZBarSymbol.QRCODE], binary=True):
+                # Only pull and return the first barcode
+                data = barcode.data
+                break
+
+            if data is None:
+                sys.stdout.buffer.write(struct.pack(RESULT_FORMAT, seq_num, slot_index, -1))
+            else:
+                sys.stdout.buffer.write(struct.pack(RESULT_FORMAT, seq_num, slot_index, len(data)) + data)
+            sys.stdout.buffer.flush()
+    finally:
+        for slot in slots:
+            slot.close()
+
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,13 +1,16 @@
 import math
+import zlib
 
 from embit import bip32
 from embit.networks import NETWORKS
+from base64 import b32encode
 from binascii import hexlify
 from dataclasses import dataclass
 from typing import List
 from embit import bip32
 from embit.networks import NETWORKS
 from embit.psbt import PSBT
+from seedsigner.helpers import qr_capacity, seedqr
 from seedsigner.helpers.ur2.ur_encoder import UREncoder
 from seedsigner.helpers.ur2.ur import UR
 from seedsigner.helpers.qr import QR
@@ -57,6 +60,11 @@ class BaseQrEncoder:
         return self.qr.qrimage_io(part, width, height, border, background_color=background_color)
 
 
+    def part_to_palette_image(self, part, width=None, height=None, border: int = 3):
+        """ See `QR.qrimage_palette()`; color it in with `QR.set_background_color()` """
+        return self.qr.qrimage_palette(part, width, height, border)
+
+
     def next_part_image(self, width=240, height=240, border=3, background_color="bdbdbd"):
         part = self.next_part()
         return self.part_to_image(part, width, height, border, background_color=background_color)
@@ -90,14 +98,10 @@ class SeedQrEncoder(BaseStaticQrEncoder):
 
 
     def __post_init__(self):
-        self.wordlist = Seed.get_wordlist(self.wordlist_language_code)
         super().__post_init__()
 
-        self.data = ""
         # Output as Numeric data format
-        for word in self.mnemonic:
-            index = self.wordlist.index(word)
-            self.data += str("%04d" % index)
+        self.data = seedqr.mnemonic_to_seedqr(self.mnemonic, self.wordlist_language_code)
     
 
     def next_part(self):
@@ -108,31 +112,9 @@ class SeedQrEncoder(BaseStaticQrEncoder):
 @dataclass
 class CompactSeedQrEncoder(SeedQrEncoder):
     def next_part(self):
-        # Output as binary data format
-        binary_str = ""
-        for word in self.mnemonic:
-            index = self.wordlist.index(word)
-
-            # Convert index to binary, strip out '0b' prefix; zero-pad to 11 bits
-            binary_str += bin(index).split('b')[1].zfill(11)
-
-        # We can exclude the checksum bits at the end
-        if len(self.mnemonic) == 24:
-            # 8 checksum bits in a 24-word seed
-            binary_str = binary_str[:-8]
-
-        elif len(self.mnemonic) == 12:
-            # 4 checksum bits in a 12-word seed
-            binary_str = binary_str[:-4]
-
-        # Now convert to bytes, 8 bits at a time
-        as_bytes = bytearray()
-        for i in range(0, math.ceil(len(binary_str) / 8)):
-            # int conversion reads byte data as a string prefixed with '0b'
-            as_bytes.append(int('0b' + binary_str[i*8:(i+1)*8], 2))
-        
-        # Must return data as `bytes` for `qrcode` to properly recognize it as byte data
-        return bytes(as_bytes)
+        # Output as binary data format; must return data as `bytes` for `qrcode` to
+        # properly recognize it as byte data
+        return seedqr.mnemonic_to_compact_seedqr(self.mnemonic, self.wordlist_language_code)
 
 
 
@@ -244,20 +226,27 @@ class SpecterLegacyXPubQrEncoder(BaseSimpleAnimatedQREncoder, BaseXpubQrEncoder)
     Specter Desktop. Can probably eventually be removed.
     """
     @property
-    def qr_max_fragment_size(self):
+    def qr_version(self):
+        """ Each part fills a QR of this version """
         density_mapping = {
-            SettingsConstants.DENSITY__LOW: 40,
-            SettingsConstants.DENSITY__MEDIUM: 65,
-            SettingsConstants.DENSITY__HIGH: 90,
+            SettingsConstants.DENSITY__LOW: 3,
+            SettingsConstants.DENSITY__MEDIUM: 4,
+            SettingsConstants.DENSITY__HIGH: 5,
         }
-        return density_mapping.get(self.qr_density, 65)
+        return density_mapping.get(self.qr_density, 4)
+
+
+    @property
+    def qr_max_fragment_size(self):
+        return qr_capacity.max_pxofy_fragment_len(len(self.xpubstring), self.qr_version)
 
 
     def _create_parts(self):
         self.prep_xpub()
+        fragment_size = self.qr_max_fragment_size
         start = 0
-        stop = self.qr_max_fragment_size
-        qr_cnt = ((len(self.xpubstring)-1) // self.qr_max_fragment_size) + 1
+        stop = fragment_size
+        qr_cnt = ((len(self.xpubstring)-1) // fragment_size) + 1
 
         if qr_cnt == 1:
             self.parts.append(self.xpubstring[start:stop])
@@ -267,14 +256,72 @@ class SpecterLegacyXPubQrEncoder(BaseSimpleAnimatedQREncoder, BaseXpubQrEncoder)
             part = "p" + str(cnt+1) + "of" + str(qr_cnt) + " " + self.xpubstring[start:stop]
             self.parts.append(part)
 
-            start = start + self.qr_max_fragment_size
-            stop = stop + self.qr_max_fragment_size
+            start = start + fragment_size
+            stop = stop + fragment_size
             if stop > len(self.xpubstring):
                 stop = len(self.xpubstring)
             cnt += 1
 
 
 
+@dataclass
+class BBQrPsbtQrEncoder(BaseSimpleAnimatedQREncoder):
+    """
+    Coinkite's BBQr format (https://github.com/coinkite/BBQr/blob/master/BBQr.md). Each
+    part is "B$" + encoding + file type ("P" for PSBT) + the number of parts and the
+    part's index as 2 digit base36, followed by the PSBT as unpadded base32; zlib
+    compressed first ("Z" encoding) whenever that makes it smaller.
+
+    base32 stays within the QR alphanumeric charset, so parts are much denser than
+    byte mode base64.
+    """
+    psbt: PSBT = None
+
+    BASE36_DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+    @property
+    def qr_version(self):
+        """ Each part fills a QR of this version """
+        density_mapping = {
+            SettingsConstants.DENSITY__LOW: 4,
+            SettingsConstants.DENSITY__MEDIUM: 5,
+            SettingsConstants.DENSITY__HIGH: 9,
+        }
+        return density_mapping.get(self.qr_density, 5)
+
+
+    @classmethod
+    def base36(cls, value: int) -> str:
+        return cls.BASE36_DIGITS[value // 36] + cls.BASE36_DIGITS[value % 36]
+
+
+    def _create_parts(self):
+        data = self.psbt.serialize()
+
+        # Raw deflate with a 1KB window, as BBQRPsbtQrDecoder expects
+        compressor = zlib.compressobj(wbits=-10)
+        compressed = compressor.compress(data) + compressor.flush()
+        if len(compressed) < len(data):
+            encoding = "Z"
+            data = compressed
+        else:
+            encoding = "2"
+
+        body = b32encode(data).decode().rstrip("=")
+
+        # Fewest parts that fit `qr_version`, then spread the data evenly across them
+        num_parts = math.ceil(len(body) / qr_capacity.max_bbqr_fragment_len(self.qr_version))
+        if num_parts > 36**2 - 1:
+            raise Exception(f"PSBT too large for BBQr at {self.qr_density} density")
+        fragment_len = math.ceil(len(body) / num_parts / 8) * 8
+
+        for part_num in range(num_parts):
+            fragment = body[part_num * fragment_len:(part_num + 1) * fragment_len]
+            self.parts.append(f"B${encoding}P{self.base36(num_parts)}{self.base36(part_num)}{fragment}")
+
+
+
 """**************************************************************************************
     Fountain encoded animated QR encoders
 **************************************************************************************"""
@@ -292,13 +339,22 @@ class BaseFountainQrEncoder(BaseQrEncoder):
 
 
     @property
-    def qr_max_fragment_size(self):
+    def qr_version(self):
+        """ Each part fills a QR of this version """
+        # Matches the largest QRs the old fixed fragment lengths (10, 30, 120 bytes)
+        # produced. At High, 120 byte fragments only fit v8 for PSBTs under ~500 bytes
+        # (where they're shrunk to even out the parts); anything bigger was already v9.
         density_mapping = {
-            SettingsConstants.DENSITY__LOW: 10,
-            SettingsConstants.DENSITY__MEDIUM: 30,
-            SettingsConstants.DENSITY__HIGH: 120,
+            SettingsConstants.DENSITY__LOW: 4,
+            SettingsConstants.DENSITY__MEDIUM: 5,
+            SettingsConstants.DENSITY__HIGH: 9,
         }
-        return density_mapping.get(self.qr_density, 30)
+        return density_mapping.get(self.qr_density, 5)
+
+
+    def max_fragment_len(self, ur: UR) -> int:
+        """ Fragments that fill `qr_version`; the fountain encoder then evens them out """
+        return qr_capacity.max_ur_fragment_len(ur.type, len(ur.cbor), self.qr_version)
 
 
     def _create_parts(self):
@@ -392,7 +448,7 @@ class UrXpubQrEncoder(BaseFountainQrEncoder, BaseXpubQrEncoder):
 
         qr_ur_bytes = UR("crypto-account", ur_account.to_cbor())
 
-        self.ur2_encode = UREncoder(ur=qr_ur_bytes, max_fragment_len=self.qr_max_fragment_size)
+        self.ur2_encode = UREncoder(ur=qr_ur_bytes, max_fragment_len=self.max_fragment_len(qr_ur_bytes))
 
 
 
@@ -403,4 +459,4 @@ class UrPsbtQrEncoder(BaseFountainQrEncoder):
     def __post_init__(self):
         super().__post_init__()
         qr_ur_bytes = UR("crypto-psbt", UR_PSBT(self.psbt.serialize()).to_cbor())
-        self.ur2_encode = UREncoder(ur=qr_ur_bytes, max_fragment_len=self.qr_max_fragment_size)
+        self.ur2_encode = UREncoder(ur=qr_ur_bytes, max_fragment_len=self.max_fragment_len(qr_ur_bytes))
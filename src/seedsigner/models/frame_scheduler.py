@@ -0,0 +1,114 @@
+import logging
+import time
+
+from collections import deque
+
+
+logger = logging.getLogger(__name__)
+
+
+
+class FrameScheduler:
+    """
+        Paces an animation against absolute deadlines: frame n is due at
+        `start() + n / fps` on the monotonic clock, no matter how long it took to get
+        the previous frames out, so the frame rate doesn't drift with PSBT size or
+        Pi model.
+
+        When a frame goes out late the schedule either:
+        * skips: jumps over the frames whose deadlines were already missed so the
+          animation stays on time (for frames that are cheap to skip), or
+        * holds: shows the next frame right away and restarts the schedule from
+          there (for frames that still have to be shown, e.g. not rendered yet).
+
+        How late each frame went out (its jitter) is kept for the last
+        `STATS_WINDOW_SIZE` frames.
+    """
+    STATS_WINDOW_SIZE = 60
+
+
+    def __init__(self, fps: float, clock=time.monotonic, sleep=time.sleep):
+        self.fps = fps
+        self.frame_interval = 1 / fps
+        self.clock = clock
+        self.sleep = sleep
+        self.start()
+
+
+    def start(self):
+        """ (Re)starts the schedule with frame 0 due now """
+        self.start_time = self.clock()
+        self.frame_num = 0
+        self.num_skipped_frames = 0
+        self.num_late_frames = 0
+        self.shown_times = deque(maxlen=self.STATS_WINDOW_SIZE)
+        self.jitters = deque(maxlen=self.STATS_WINDOW_SIZE)
+
+
+    @property
+    def deadline(self) -> float:
+        """ When the current frame is due """
+        return self.start_time + self.frame_num * self.frame_interval
+
+
+    def frame_shown(self):
+        """ Records that the current frame just went out """
+        now = self.clock()
+        self.shown_times.append(now)
+        self.jitters.append(max(0.0, now - self.deadline))
+
+
+    def wait_for_next_frame(self, can_skip: bool = True) -> int:
+        """
+            Sleeps until the next frame is due. Returns how many frames the animation
+            should advance: 1, or more if it's running late and frames were skipped.
+        """
+        now = self.clock()
+        next_deadline = self.deadline + self.frame_interval
+        if now < next_deadline:
+            self.sleep(next_deadline - now)
+            self.frame_num += 1
+            return 1
+
+        # Late; how many deadlines have passed since the current frame's?
+        num_frames_due = int((now - self.deadline) / self.frame_interval)
+        if num_frames_due == 1:
+            # Only just missed the next deadline; show it now and stay on schedule
+            self.frame_num += 1
+            return 1
+
+        self.num_late_frames += 1
+        if can_skip:
+            self.num_skipped_frames += num_frames_due - 1
+            self.frame_num += num_frames_due
+            return num_frames_due
+
+        # Hold: the next frame is due now
+        self.start_time = now - (self.frame_num + 1) * self.frame_interval
+        self.frame_num += 1
+        return 1
+
+
+    @property
+    def measured_fps(self) -> float:
+        """ Actual frame rate over the stats window, to compare with `fps` """
+        if len(self.shown_times) < 2:
+            return 0.0
+        return (len(self.shown_times) - 1) / (self.shown_times[-1] - self.shown_times[0])
+
+
+    @property
+    def mean_jitter(self) -> float:
+        """ Average seconds that frames in the stats window went out after their deadline """
+        if not self.jitters:
+            return 0.0
+        return sum(self.jitters) / len(self.jitters)
+
+
+    @property
+    def max_jitter(self) -> float:
+        return max(self.jitters, default=0.0)
+
+
+    def log_stats(self, name: str):
+        logger.debug(f"{name}: {self.measured_fps:0.1f} fps (target: {self.fps:0.1f}), jitter: {self.mean_jitter * 1000:0.1f}ms mean / {self.max_jitter * 1000:0.1f}ms max, {self.num_late_frames} late, {self.num_skipped_frames} skipped")
@@ -0,0 +1,55 @@
+from seedsigner.hardware.camera import Camera
+from seedsigner.models.decode_qr import DecodeQR, DecodeQRStatus
+from seedsigner.models.decode_qr_pool import DecodeQRPool
+from seedsigner.models.scan_governor import ScanGovernor
+
+
+
+class ScanFrameDecoder:
+    """
+        The per-frame decode step of a camera scan, shared by `ScanScreen._run()` and
+        the scan replay benchmark (tools/benchmarks/scan.py) so that the benchmark
+        measures exactly what the scan screen runs.
+
+        Each new camera frame goes to the `DecodeQRPool` workers if there are any left,
+        otherwise it's decoded in-process. Every finished decode is recorded with the
+        `ScanGovernor`, which may switch the camera to a new profile.
+    """
+    def __init__(self, camera: Camera, decoder: DecodeQR, governor: ScanGovernor, decode_pool: DecodeQRPool = None):
+        self.camera = camera
+        self.decoder = decoder
+        self.governor = governor
+        self.decode_pool = decode_pool
+
+
+    def decode_frame(self, seq_num: int, luminance: tuple[bytes, int, int] | None) -> list[tuple[int, DecodeQRStatus]]:
+        """
+            `luminance` is camera frame `seq_num`, or None if the camera didn't deliver a
+            new frame.
+
+            Returns (seq_num, status) for each frame whose decode finished, in frame
+            order, stopping at the first COMPLETE or INVALID. With decode workers these
+            are earlier frames (possibly none yet), and the ones still in flight are
+            collected even on passes without a new frame.
+        """
+        if self.decode_pool and self.decode_pool.workers:
+            if luminance is not None:
+                self.decode_pool.submit(seq_num, *luminance)
+            # Lazily, so that nothing past a COMPLETE/INVALID frame is fed to the decoder
+            statuses = ((frame_seq_num, self.decoder.add_data(data) if data is not None else DecodeQRStatus.FALSE) for (frame_seq_num, data) in self.decode_pool.get_results())
+        elif luminance is not None:
+            statuses = [(seq_num, self.decoder.add_luminance(*luminance))]
+        else:
+            statuses = []
+
+        results = []
+        for (frame_seq_num, status) in statuses:
+            results.append((frame_seq_num, status))
+            if status in (DecodeQRStatus.COMPLETE, DecodeQRStatus.INVALID):
+                break
+
+            new_profile = self.governor.record(status)
+            if new_profile:
+                self.camera.restart_video_stream_mode(resolution=new_profile.resolution, framerate=new_profile.framerate, format="rgb")
+
+        return results
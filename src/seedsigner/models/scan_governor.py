@@ -0,0 +1,147 @@
+import logging
+import time
+
+from dataclasses import dataclass
+
+from seedsigner.models.decode_qr import DecodeQRStatus
+
+
+logger = logging.getLogger(__name__)
+
+
+
+@dataclass(frozen=True)
+class ScanProfile:
+    resolution: tuple[int, int]
+    framerate: int
+
+
+
+class ScanGovernor:
+    """
+        Tunes the camera during a scan instead of relying on one hardcoded resolution
+        and framerate for every Pi model.
+
+        `PROFILES` runs from the most detail per frame to the most frames per second.
+        After every `WINDOW_SIZE` decodes the governor looks at decode throughput and
+        outcomes:
+        * zbar falling behind the camera: first skip live preview frames (the preview
+          competes for the same CPU), then step to a lower framerate profile.
+        * a QR is in view but most frames miss: step back to the nearest profile with
+          more resolution, if there is one.
+        * either way, a profile that was stepped away from isn't retried during this
+          scan so the camera doesn't bounce between profiles.
+        * keeping up with few misses: restore the live preview, then try the next
+          faster profile.
+
+        Switching profiles restarts the camera, so changes are at least
+        `MIN_PROFILE_SECONDS` apart.
+    """
+    PROFILES = [
+        ScanProfile(resolution=(480, 480), framerate=4),
+        ScanProfile(resolution=(480, 480), framerate=6),
+        ScanProfile(resolution=(400, 400), framerate=10),
+        ScanProfile(resolution=(320, 320), framerate=15),
+    ]
+
+    # The original fixed (480x480, 6fps) setting
+    DEFAULT_PROFILE_INDEX = 1
+
+    WINDOW_SIZE = 12
+    MIN_PROFILE_SECONDS = 3.0
+
+    # Decode rate as a fraction of the camera framerate
+    BEHIND_THRESHOLD = 0.8
+    KEEPING_UP_THRESHOLD = 0.95
+
+    # Fraction of frames with no QR found
+    HIGH_MISS_RATE = 0.5
+    LOW_MISS_RATE = 0.25
+
+    # Render at most every Nth camera frame in the live preview
+    MAX_PREVIEW_FRAME_INTERVAL = 3
+
+
+    def __init__(self, profile_index: int = DEFAULT_PROFILE_INDEX, clock=time.monotonic):
+        self.clock = clock
+        self.profile_index = profile_index
+        self.max_profile_index = len(self.PROFILES) - 1
+        self.preview_frame_interval = 1
+
+        self.profile_start_time = self.clock()
+        self.reset_window()
+
+
+    @property
+    def profile(self) -> ScanProfile:
+        return self.PROFILES[self.profile_index]
+
+
+    @property
+    def max_resolution(self) -> tuple[int, int]:
+        return max(profile.resolution for profile in self.PROFILES)
+
+
+    def reset_window(self):
+        # Timed from the window's first decode so that gaps between windows (e.g. while
+        # the camera restarts) don't count against the decode rate.
+        self.window_start_time = None
+        self.window_decodes = 0
+        self.window_misses = 0
+        self.window_parts = 0
+
+
+    def record(self, status: DecodeQRStatus) -> ScanProfile | None:
+        """
+            Records the outcome of one decoded frame. Returns the new ScanProfile if the
+            camera should be switched to it, otherwise None.
+        """
+        if self.window_start_time is None:
+            self.window_start_time = self.clock()
+        self.window_decodes += 1
+        if status == DecodeQRStatus.FALSE:
+            self.window_misses += 1
+        elif status in (DecodeQRStatus.PART_COMPLETE, DecodeQRStatus.PART_EXISTING):
+            self.window_parts += 1
+
+        if self.window_decodes < self.WINDOW_SIZE:
+            return None
+
+        elapsed = self.clock() - self.window_start_time
+        decode_fps = (self.window_decodes - 1) / elapsed if elapsed > 0 else float(self.profile.framerate)
+        miss_rate = self.window_misses / self.window_decodes
+        qr_in_view = self.window_parts > 0
+        self.reset_window()
+
+        can_switch = self.clock() - self.profile_start_time >= self.MIN_PROFILE_SECONDS
+        new_profile_index = self.profile_index
+
+        if decode_fps < self.profile.framerate * self.BEHIND_THRESHOLD:
+            # Cut the live preview before cutting frames we could be decoding
+            if self.preview_frame_interval < self.MAX_PREVIEW_FRAME_INTERVAL:
+                self.preview_frame_interval += 1
+            elif can_switch and self.profile_index > 0:
+                new_profile_index = self.profile_index - 1
+                self.max_profile_index = new_profile_index
+
+        elif qr_in_view and miss_rate > self.HIGH_MISS_RATE:
+            # Probably a dense QR that needs more pixels per frame. Fewer frames at the
+            # same resolution won't help, so skip past those profiles.
+            higher_resolution_indexes = [i for i in range(self.profile_index) if self.PROFILES[i].resolution > self.profile.resolution]
+            if can_switch and higher_resolution_indexes:
+                new_profile_index = higher_resolution_indexes[-1]
+                self.max_profile_index = new_profile_index
+
+        elif decode_fps >= self.profile.framerate * self.KEEPING_UP_THRESHOLD:
+            if self.preview_frame_interval > 1:
+                self.preview_frame_interval -= 1
+            elif can_switch and qr_in_view and miss_rate < self.LOW_MISS_RATE and self.profile_index < self.max_profile_index:
+                new_profile_index = self.profile_index + 1
+
+        if new_profile_index == self.profile_index:
+            return None
+
+        logger.info(f"Scan profile {self.profile} -> {self.PROFILES[new_profile_index]} (decode fps: {decode_fps:0.2f}, miss rate: {miss_rate:0.2f})")
+        self.profile_index = new_profile_index
+        self.profile_start_time = self.clock()
+        return self.profile
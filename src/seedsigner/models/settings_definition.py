@@ -243,6 +243,25 @@ class SettingsConstants:
         (CAMERA_ROTATION__270, _mft("270°")),
     ]
 
+    # Decoding scanned QR frames in worker processes
+    DECODE_WORKERS__AUTO = "A"
+    ALL_DECODE_WORKERS_OPTIONS = [
+        # TRANSLATOR_NOTE: Multi-core QR scanning option; "Auto" = only if the board has enough CPU cores
+        (DECODE_WORKERS__AUTO, _mft("Auto")),
+        (OPTION__ENABLED, _mft("Enabled")),
+        (OPTION__DISABLED, _mft("Disabled")),
+    ]
+
+    # Animated QR frames per second; match it to the speed of the coordinator's scanner
+    QR_ANIMATION_FPS__DEFAULT = 6
+    ALL_QR_ANIMATION_FPS = [
+        (4, _mft("4 fps")),
+        (6, _mft("6 fps")),
+        (8, _mft("8 fps")),
+        (10, _mft("10 fps")),
+        (12, _mft("12 fps")),
+    ]
+
     # QR code constants
     DENSITY__LOW = "L"
     DENSITY__MEDIUM = "M"
@@ -340,9 +359,11 @@ class SettingsConstants:
 
     SETTING__DISPLAY_CONFIGURATION = "display_config"
     SETTING__DISPLAY_COLOR_INVERTED = "color_inverted"
+    SETTING__DECODE_WORKERS = "decode_workers"
 
     SETTING__NETWORK = "network"
     SETTING__QR_DENSITY = "qr_density"
+    SETTING__QR_ANIMATION_FPS = "qr_fps"
     SETTING__SIG_TYPES = "sig_types"
     SETTING__SCRIPT_TYPES = "script_types"
     SETTING__XPUB_DETAILS = "xpub_details"
@@ -603,6 +624,15 @@ class SettingsDefinition:
                       selection_options=SettingsConstants.ALL_DENSITIES,
                       default_value=SettingsConstants.DENSITY__MEDIUM),
 
+        SettingsEntry(category=SettingsConstants.CATEGORY__FEATURES,
+                      attr_name=SettingsConstants.SETTING__QR_ANIMATION_FPS,
+                      # TRANSLATOR_NOTE: How fast animated QR codes cycle through their frames
+                      display_name=_mft("Animated QR speed"),
+                      type=SettingsConstants.TYPE__SELECT_1,
+                      visibility=SettingsConstants.VISIBILITY__ADVANCED,
+                      selection_options=SettingsConstants.ALL_QR_ANIMATION_FPS,
+                      default_value=SettingsConstants.QR_ANIMATION_FPS__DEFAULT),
+
         SettingsEntry(category=SettingsConstants.CATEGORY__FEATURES,
                       attr_name=SettingsConstants.SETTING__SIG_TYPES,
                       abbreviated_name="sigs",
@@ -738,6 +768,18 @@ class SettingsDefinition:
                       visibility=SettingsConstants.VISIBILITY__HARDWARE,
                       default_value=SettingsConstants.OPTION__DISABLED),
 
+        SettingsEntry(category=SettingsConstants.CATEGORY__SYSTEM,
+                      attr_name=SettingsConstants.SETTING__DECODE_WORKERS,
+                      abbreviated_name="decoders",
+                      # TRANSLATOR_NOTE: Hardware settings option to decode scanned QR codes on multiple CPU cores
+                      display_name=_mft("Multi-core QR scan"),
+                      type=SettingsConstants.TYPE__SELECT_1,
+                      visibility=SettingsConstants.VISIBILITY__HARDWARE,
+                      selection_options=SettingsConstants.ALL_DECODE_WORKERS_OPTIONS,
+                      # TODO: Default to Auto once the workers' memory and startup cost
+                      # has been measured on a Pi Zero 2W.
+                      default_value=SettingsConstants.OPTION__DISABLED),
+
 
         # Developer options
         # TODO: No real Developer options needed yet. Disable for now.
@@ -640,9 +640,16 @@ class PSBTWIFFinalizeView(View):
 
 class PSBTSignedQRDisplayView(View):
     def run(self):
-        from seedsigner.models.encode_qr import UrPsbtQrEncoder
+        from seedsigner.models.encode_qr import BBQrPsbtQrEncoder, UrPsbtQrEncoder
+        from seedsigner.models.qr_type import QRType
 
-        qr_encoder = UrPsbtQrEncoder(
+        # Reply in BBQr if that's how the PSBT came in; otherwise UR2 crypto-psbt
+        if self.controller.psbt_qr_type == QRType.PSBT__BBQR:
+            qr_encoder_cls = BBQrPsbtQrEncoder
+        else:
+            qr_encoder_cls = UrPsbtQrEncoder
+
+        qr_encoder = qr_encoder_cls(
             psbt=self.controller.psbt,
             qr_density=self.settings.get_value(SettingsConstants.SETTING__QR_DENSITY),
         )
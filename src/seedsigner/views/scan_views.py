@@ -95,6 +95,7 @@ class ScanView(View):
                 self.controller.psbt = psbt
                 self.controller.psbt_parser = None
                 self.controller.psbt_wif = None
+                self.controller.psbt_qr_type = self.decoder.qr_type
                 return Destination(PSBTSelectSeedView, skip_current_view=True)
 
             elif self.decoder.is_settings:
@@ -0,0 +1,140 @@
+import qrcode
+import pytest
+
+from multiprocessing.shared_memory import SharedMemory
+from PIL import Image
+
+from seedsigner.models.decode_qr_pool import DecodeQRPool
+from seedsigner.models.settings_definition import SettingsConstants
+
+
+
+FRAME_SIZE = (240, 240)
+
+
+def render_luminance_frame(payload: str = None) -> bytes:
+    frame = Image.new("L", FRAME_SIZE, 127)
+    if payload:
+        qr_image = qrcode.make(payload, border=2).get_image().convert("L").resize((200, 200), Image.Resampling.NEAREST)
+        frame.paste(qr_image, (20, 20))
+    return frame.tobytes()
+
+
+
+def test_get_num_workers():
+    # Always leaves a core for the camera/preview/main threads
+    assert DecodeQRPool.get_num_workers(SettingsConstants.DECODE_WORKERS__AUTO, cpu_count=4) == 3
+    assert DecodeQRPool.get_num_workers(SettingsConstants.OPTION__ENABLED, cpu_count=4) == 3
+
+    # Auto is off on single and dual core boards (e.g. the original Pi Zero)
+    assert DecodeQRPool.get_num_workers(SettingsConstants.DECODE_WORKERS__AUTO, cpu_count=1) == 0
+    assert DecodeQRPool.get_num_workers(SettingsConstants.DECODE_WORKERS__AUTO, cpu_count=2) == 0
+
+    # ...but can be forced on
+    assert DecodeQRPool.get_num_workers(SettingsConstants.OPTION__ENABLED, cpu_count=1) == 1
+
+    assert DecodeQRPool.get_num_workers(SettingsConstants.OPTION__DISABLED, cpu_count=4) == 0
+
+
+
+def test_pool_returns_payloads_in_frame_order():
+    payloads = [f"frame {i}" if i % 3 else None for i in range(8)]
+    frames = [render_luminance_frame(payload) for payload in payloads]
+
+    pool = DecodeQRPool(num_workers=2, frame_size=FRAME_SIZE, num_slots=len(frames))
+    slot_names = [slot.name for slot in pool.slots]
+    try:
+        for seq_num, frame in enumerate(frames, start=1):
+            assert pool.submit(seq_num, frame, *FRAME_SIZE)
+
+        # Every slot is in use
+        assert not pool.submit(100, frames[0], *FRAME_SIZE)
+
+        results = []
+        for i in range(100):
+            results += pool.get_results(timeout=0.1)
+            if len(results) == len(frames):
+                break
+    finally:
+        pool.shutdown()
+
+    assert [seq_num for (seq_num, data) in results] == list(range(1, len(frames) + 1))
+    assert [data for (seq_num, data) in results] == [payload.encode() if payload else None for payload in payloads]
+
+    # Shared memory is released on shutdown
+    for name in slot_names:
+        with pytest.raises(FileNotFoundError):
+            SharedMemory(name=name)
+
+
+
+def test_dead_worker_frames_dropped():
+    """ A worker that dies mid-frame mustn't leave later frames (or its slots) stuck """
+    frame = render_luminance_frame("frame")
+    pool = DecodeQRPool(num_workers=1, frame_size=FRAME_SIZE, num_slots=2)
+    try:
+        assert pool.submit(1, frame, *FRAME_SIZE)
+        assert pool.submit(2, frame, *FRAME_SIZE)
+
+        # e.g. zbar segfaulted
+        worker = pool.workers[0]
+        worker.kill()
+        worker.wait()
+
+        for i in range(10):
+            pool.get_results(timeout=0.1)
+            if not pool.workers:
+                break
+
+        assert pool.workers == []
+        assert not pool.pending
+        assert len(pool.free_slots) == 2
+
+        # Nothing left to decode with
+        assert not pool.submit(3, frame, *FRAME_SIZE)
+    finally:
+        pool.shutdown()
+
+
+
+def test_get_instance():
+    """ One pool is kept across scans and only restarted when it has to be """
+    try:
+        pool = DecodeQRPool.get_instance(num_workers=1, frame_size=FRAME_SIZE)
+        assert DecodeQRPool.get_instance(num_workers=1, frame_size=FRAME_SIZE) is pool
+
+        # Different setting
+        pool2 = DecodeQRPool.get_instance(num_workers=2, frame_size=FRAME_SIZE)
+        assert pool2 is not pool
+        assert pool.slots == []
+
+        # Lost a worker
+        pool2._remove_worker(pool2.workers[0])
+        pool3 = DecodeQRPool.get_instance(num_workers=2, frame_size=FRAME_SIZE)
+        assert pool3 is not pool2
+        assert len(pool3.workers) == 2
+
+        # Disabled
+        assert DecodeQRPool.get_instance(num_workers=0, frame_size=FRAME_SIZE) is None
+        assert pool3.slots == []
+    finally:
+        if DecodeQRPool._instance:
+            DecodeQRPool._instance.shutdown()
+        DecodeQRPool._instance = None
+
+
+
+def test_reset_discards_in_flight_frames():
+    frame = render_luminance_frame("frame")
+    pool = DecodeQRPool(num_workers=1, frame_size=FRAME_SIZE, num_slots=2)
+    try:
+        pool.submit(1, frame, *FRAME_SIZE)
+        pool.submit(2, frame, *FRAME_SIZE)
+        pool.reset()
+
+        assert not pool.pending
+        assert not pool.results
+        assert len(pool.free_slots) == 2
+        assert pool.get_results() == []
+    finally:
+        pool.shutdown()
@@ -1,8 +1,17 @@
+import qrcode
+import random
+
 from binascii import a2b_base64
 from embit import bip32
 from embit.psbt import PSBT
+from PIL import Image
+from urtypes.bytes import Bytes
+
+from seedsigner.helpers.ur2.ur import UR
+from seedsigner.helpers.ur2.ur_encoder import UREncoder
 
 from seedsigner.models.decode_qr import DecodeQR, DecodeQRStatus
+from seedsigner.models.encode_qr import BBQrPsbtQrEncoder
 from seedsigner.models.psbt_parser import PSBTParser
 from seedsigner.models.qr_type import QRType
 from seedsigner.models.seed import Seed
@@ -131,6 +140,122 @@ def test_ur2_sparrow_singlesig_to_self():
     assert str(tx) == d.get_base64_psbt()
 
 
+def test_repeated_frames_skip_decoding():
+    """ Byte-identical repeats of an already-accepted frame are answered from the cache """
+    message = bytes(range(256)) * 4
+    encoder = UREncoder(UR("bytes", Bytes(message).to_cbor()), 100)
+    parts = [encoder.next_part().upper().encode() for i in range(encoder.fountain_encoder.seq_len())]
+
+    d = DecodeQR()
+    assert d.add_data(parts[0]) == DecodeQRStatus.PART_COMPLETE
+    assert d.add_data(parts[0]) == DecodeQRStatus.PART_EXISTING
+    assert d.add_data(parts[0]) == DecodeQRStatus.PART_EXISTING
+    assert d.recent_payloads_hits == 2
+    assert d.recent_payloads_misses == 1
+
+    status = None
+    for part in parts[1:]:
+        status = d.add_data(part)
+        if status == DecodeQRStatus.COMPLETE:
+            assert d.add_data(part) == DecodeQRStatus.COMPLETE
+        else:
+            assert d.add_data(part) == DecodeQRStatus.PART_EXISTING
+    assert status == DecodeQRStatus.COMPLETE
+    assert d.is_complete
+    assert d.recent_payloads_hits == 2 + len(parts) - 2
+    # The completing frame is never cached, so its repeat is decoded again
+    assert d.recent_payloads_misses == len(parts) + 1
+
+
+
+def test_extract_qr_data_from_luminance():
+    """ A raw 8-bit grayscale buffer decodes the same as the PIL image it came from """
+    payload = "UR:CRYPTO-PSBT/1-3/LPADAXCFAOOECYMSTBHDCSHDVYHTAXLATPBEOEDPAYIAWSYNAMSGSARSURCLDRKNFYZEWLHLMDTNATNYNSETJN"
+    image = qrcode.make(payload, border=2).get_image().convert("L")
+
+    data = DecodeQR.extract_qr_data_from_luminance(image.tobytes(), image.width, image.height, is_binary=True)
+    assert data == payload.encode()
+    assert data == DecodeQR.extract_qr_data(image, is_binary=True)
+
+
+
+def render_luminance_frame(payload: str = None, offset: tuple[int, int] = (0, 0), frame_size: int = 480, qr_size: int = 280) -> bytes:
+    """ A grayscale camera frame with the QR for `payload` (if any) pasted at `offset` """
+    frame = Image.new("L", (frame_size, frame_size), 127)
+    if payload:
+        qr_image = qrcode.make(payload, border=2).get_image().convert("L")
+        frame.paste(qr_image.resize((qr_size, qr_size), Image.Resampling.NEAREST), offset)
+    return frame.tobytes()
+
+
+def test_roi_tracking_replay():
+    """
+    Replays an animated QR held in a slightly shaky hand that occasionally moves and
+    drops out of view: ROI scanning must take over most of the work without missing
+    any frame that a full-frame scan would have decoded.
+    """
+    rand = random.Random(11)
+    message = bytes(rand.getrandbits(8) for i in range(600))
+    encoder = UREncoder(UR("bytes", Bytes(message).to_cbor()), 60)
+
+    frames = []
+    (x, y) = (90, 110)
+    for i in range(encoder.fountain_encoder.seq_len() * 3):
+        if i % 12 == 11:
+            # moved to a new spot
+            (x, y) = (rand.randint(0, 200), rand.randint(0, 200))
+        else:
+            (x, y) = (min(200, max(0, x + rand.randint(-4, 4))), min(200, max(0, y + rand.randint(-4, 4))))
+
+        if i % 9 == 8:
+            # glare/out of view
+            frames.append(render_luminance_frame())
+        frames.append(render_luminance_frame(encoder.next_part().upper(), (x, y)))
+
+    def replay(use_roi: bool):
+        d = DecodeQR()
+        statuses = []
+        for frame in frames:
+            if not use_roi:
+                d.roi = None
+            statuses.append(d.add_luminance(frame, 480, 480))
+            if statuses[-1] == DecodeQRStatus.COMPLETE:
+                break
+        return (d, statuses)
+
+    (full_frame, full_frame_statuses) = replay(use_roi=False)
+    (roi, roi_statuses) = replay(use_roi=True)
+
+    assert full_frame.is_complete and roi.is_complete
+    assert roi.decoder.result_message().cbor == full_frame.decoder.result_message().cbor
+
+    # Identical decode results frame by frame
+    assert roi_statuses == full_frame_statuses
+
+    # ...but most frames were only scanned in the (much smaller) ROI
+    assert full_frame.roi_scans == 0
+    assert roi.roi_scans > 2 * roi.full_frame_scans
+
+
+def test_update_roi():
+    from types import SimpleNamespace
+    d = DecodeQR()
+    d.update_roi(SimpleNamespace(left=100, top=50, width=200, height=200), 480, 480)
+    assert d.roi == (50, 0, 350, 300)
+
+    # Coordinates from a scan of the cropped ROI are relative to its corner
+    d.update_roi(SimpleNamespace(left=20, top=30, width=200, height=200), 480, 480, offset=d.roi[:2])
+    assert d.roi == (20, 0, 320, 280)
+
+    # A QR filling the frame leaves nothing to crop
+    d.update_roi(SimpleNamespace(left=0, top=0, width=470, height=470), 480, 480)
+    assert d.roi is None
+
+    pixels = bytes(range(16))
+    assert DecodeQR.crop_luminance(pixels, 4, (1, 2, 3, 4)) == bytes([9, 10, 13, 14])
+
+
+
 def test_base64_2_input_p2wsh():
     base64_psbt = "cHNidP8BALICAAAAAq1DhxRK+mUH4T6uUNob8bUaZ7MP+44MW4+Y9bOxpjhZAAAAAAD9////aWclWQ+45HKrI07r878E2UrAupT2paT4QurbmtNjYNQBAAAAAP3///8CQEIPAAAAAAAiACCpkDPDhmIzPlkJrjw9A71xjbIUWf3VUB7ooFJhTVm04tjSIQEAAAAAIgAgjQKFDauIXsV5u23LBdYgOwX1FwGGrLiQfWzBtFKZ7dIAAAAATwEENYfPBD5i336AAAACQStJhNVJul7vHKbo83VdmuAW2m0WaXLKDlFANn7dUNoCNbhLMdw4Knz7Q7o6exdL6UFhQegW9nJb0SUStbLEpawUAgjLdzAAAIABAACAAAAAgAIAAIBPAQQ1h88EnbHQAIAAAAI/2Nc7x7iMpJNapTe/OJTV4oifqzQcYY9KV2+PGRjCdQJoww1WnSNqfcxXGyux0q1PqfmzUqgJNqKJCpmqI9t47BQmu4PEMAAAgAEAAIAAAACAAgAAgE8BBDWHzwS6wUg5gAAAAh1Pvr3ZZ+GvcUwJl9OPz2cLXOnTAcBEC7zDtqIOt3IcA1aOofNgUZFu0baQw54SqOcGA7KAvTDOXygfKRilU2OqFHPF2gowAACAAQAAgAAAAIACAACAAAEBK4CWmAAAAAAAIgAgiYAxcG7dnrEiZ4VHFVHOo18XCalvhZYuMqBr9n7HESQBBWlSIQJOjQgMfX26XEf+trHIEk3rYkEX5Y2NfrFKQARPcd2X8iEDBWHUgq25PfHvE+hlcBryJG7wo2y8jKUSPY7sd85OOMchA2iVcuKLD+2p1pgcAjfZ5d7b/sFt5xQ/aAoC7V0Vn3WHU64iBgJOjQgMfX26XEf+trHIEk3rYkEX5Y2NfrFKQARPcd2X8hwmu4PEMAAAgAEAAIAAAACAAgAAgAAAAAABAAAAIgYDBWHUgq25PfHvE+hlcBryJG7wo2y8jKUSPY7sd85OOMccAgjLdzAAAIABAACAAAAAgAIAAIAAAAAAAQAAACIGA2iVcuKLD+2p1pgcAjfZ5d7b/sFt5xQ/aAoC7V0Vn3WHHHPF2gowAACAAQAAgAAAAIACAACAAAAAAAEAAAAAAQErgJaYAAAAAAAiACAzd60wM9EFnPHSNbsSJfyipL8myVLVP2/vwzotVUSNxQEFaVIhAiKCMRLlzIhLkRbLIUIMx5KYJM0v6LcjW/mS6K7eFGwiIQKDzUflU23LeecRgzDo5IBCEvaWGfHW7JkNxzXvuc7FdCEDC5DtLoa61/Kk/pdpu0F9e6nKoRJIB9v7Ni377rZefgFTriIGAiKCMRLlzIhLkRbLIUIMx5KYJM0v6LcjW/mS6K7eFGwiHAIIy3cwAACAAQAAgAAAAIACAACAAAAAAAAAAAAiBgKDzUflU23LeecRgzDo5IBCEvaWGfHW7JkNxzXvuc7FdBwmu4PEMAAAgAEAAIAAAACAAgAAgAAAAAAAAAAAIgYDC5DtLoa61/Kk/pdpu0F9e6nKoRJIB9v7Ni377rZefgEcc8XaCjAAAIABAACAAAAAgAIAAIAAAAAAAAAAAAABAWlSIQKtIdmtKKuZrH7f2R4iIU8RWVOrCdHVWBCS+0e9pZJy/iEDoH074LrWPIA10hyXtBCJDT06GdLkA6+z/PxoJqomPHYhA6GoQ/otQdk71nUpYZFfbkSKdBkkSj4CuPTPYrzGp6JrU64iAgKtIdmtKKuZrH7f2R4iIU8RWVOrCdHVWBCS+0e9pZJy/hwCCMt3MAAAgAEAAIAAAACAAgAAgAEAAAAAAAAAIgIDoH074LrWPIA10hyXtBCJDT06GdLkA6+z/PxoJqomPHYcc8XaCjAAAIABAACAAAAAgAIAAIABAAAAAAAAACICA6GoQ/otQdk71nUpYZFfbkSKdBkkSj4CuPTPYrzGp6JrHCa7g8QwAACAAQAAgAAAAIACAACAAQAAAAAAAAAAAA=="
 
@@ -560,3 +685,169 @@ def test_bbqr_psbt_p2wsh_qr():
     assert tx.inputs[4].witness_utxo.value == 2811 # input 5 amount in psbt
 
     assert len(tx.outputs) == 1
+
+
+
+def test_bbqr_psbt_encoder_roundtrip():
+    """ BBQrPsbtQrEncoder's parts should decode back to the same PSBT, in any order """
+    for base64_psbt in [PSBTTestData.SINGLE_SIG_LEGACY_P2PKH_1_INPUT, PSBTTestData.MULTISIG_NATIVE_SEGWIT_1_INPUT]:
+        psbt = PSBT.parse(a2b_base64(base64_psbt))
+        for qr_density in [SettingsConstants.DENSITY__LOW, SettingsConstants.DENSITY__MEDIUM, SettingsConstants.DENSITY__HIGH]:
+            encoder = BBQrPsbtQrEncoder(psbt=psbt, qr_density=qr_density)
+            parts = [encoder.next_part() for i in range(encoder.seq_len())]
+
+            # Compressed, in parts that fit the target QR version
+            assert all(part.startswith("B$ZP") for part in parts)
+            for part in parts:
+                qr = qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_L)
+                qr.add_data(part)
+                qr.make(fit=True)
+                assert qr.version <= encoder.qr_version
+
+            random.Random(len(parts)).shuffle(parts)
+            d = DecodeQR()
+            for part in parts:
+                status = d.add_data(part)
+            assert status == DecodeQRStatus.COMPLETE
+            assert d.qr_type == QRType.PSBT__BBQR
+            assert d.get_psbt().serialize() == psbt.serialize()
+
+
+
+def test_bbqr_psbt_encoder_uncompressed_roundtrip():
+    """ Should fall back to plain base32 ("2" encoding) when zlib doesn't help """
+    psbt = PSBT.parse(a2b_base64(PSBTTestData.SINGLE_SIG_LEGACY_P2PKH_1_INPUT))
+    psbt.unknown[b"\xfc\x00"] = random.Random(0).randbytes(1000)
+    encoder = BBQrPsbtQrEncoder(psbt=psbt, qr_density=SettingsConstants.DENSITY__MEDIUM)
+    assert encoder.seq_len() > 1
+
+    d = DecodeQR()
+    for i in range(encoder.seq_len()):
+        part = encoder.next_part()
+        assert part.startswith("B$2P")
+        status = d.add_data(part)
+    assert status == DecodeQRStatus.COMPLETE
+    assert d.get_psbt().serialize() == psbt.serialize()
+
+
+
+def test_bbqr_psbt_decodes_segments_as_they_arrive():
+    """ Contiguous segments should be decoded (and freed) right away rather than all at the end """
+    psbt = PSBT.parse(a2b_base64(PSBTTestData.MULTISIG_NATIVE_SEGWIT_1_INPUT))
+    parts = BBQrPsbtQrEncoder(psbt=psbt, qr_density=SettingsConstants.DENSITY__LOW).parts
+    assert len(parts) >= 4
+
+    d = DecodeQR()
+
+    # Out of order: nothing can be decompressed until the first segment shows up
+    d.add_data(parts[1])
+    assert d.decoder.num_decoded_segments == 0
+    assert d.decoder.data == b""
+
+    d.add_data(parts[0])
+    assert d.decoder.num_decoded_segments == 2
+    assert d.decoder.segments[:2] == [b"", b""]
+    assert len(d.decoder.data) > 0
+
+    for i in range(2, len(parts)):
+        status = d.add_data(parts[i])
+        assert d.decoder.num_decoded_segments == i + 1
+    assert status == DecodeQRStatus.COMPLETE
+    assert d.get_psbt().serialize() == psbt.serialize()
+
+
+
+def test_bbqr_psbt_corrupt_segment():
+    """ Data that won't decompress should make that frame INVALID, not the last one """
+    psbt = PSBT.parse(a2b_base64(PSBTTestData.MULTISIG_NATIVE_SEGWIT_1_INPUT))
+    parts = BBQrPsbtQrEncoder(psbt=psbt, qr_density=SettingsConstants.DENSITY__LOW).parts
+    assert len(parts) >= 4
+
+    # Overwrite the first 5 bytes of the deflate stream with 0xFF: an invalid block type
+    parts[0] = parts[0][:8] + "77777777" + parts[0][16:]
+
+    d = DecodeQR()
+    assert d.add_data(parts[2]) == DecodeQRStatus.PART_COMPLETE
+    assert d.add_data(parts[1]) == DecodeQRStatus.PART_COMPLETE
+
+    # Completes a contiguous run, so it's decompressed right away
+    assert d.add_data(parts[0]) == DecodeQRStatus.INVALID
+    assert not d.is_complete
+
+
+
+def test_bbqr_psbt_unparseable_segment():
+    """ A misread part mid-scan is just a missed frame; a clean re-scan of it still counts """
+    psbt = PSBT.parse(a2b_base64(PSBTTestData.MULTISIG_NATIVE_SEGWIT_1_INPUT))
+    parts = BBQrPsbtQrEncoder(psbt=psbt, qr_density=SettingsConstants.DENSITY__LOW).parts
+    assert len(parts) >= 4
+
+    # "1" isn't in the base32 alphabet
+    bad_part = parts[2][:10] + "1" + parts[2][11:]
+
+    d = DecodeQR()
+    assert d.add_data(parts[0]) == DecodeQRStatus.PART_COMPLETE
+    assert d.add_data(parts[1]) == DecodeQRStatus.PART_COMPLETE
+    assert d.add_data(bad_part) == DecodeQRStatus.FALSE
+    assert d.decoder.collected_segments == 2
+
+    assert d.add_data(parts[2]) == DecodeQRStatus.PART_COMPLETE
+    for part in parts[3:]:
+        status = d.add_data(part)
+    assert status == DecodeQRStatus.COMPLETE
+    assert d.get_psbt().serialize() == psbt.serialize()
+
+
+
+def test_detect_segment_type():
+    """ Every QR type DecodeQR can receive, plus near misses that must fall through """
+    def base43_encode(data: bytes) -> str:
+        chars = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ$*+-./:"
+        value = int.from_bytes(data, "big")
+        encoded = ""
+        while value:
+            (value, digit) = divmod(value, 43)
+            encoded = chars[digit] + encoded
+        return encoded
+
+    base64_psbt = PSBTTestData.SINGLE_SIG_NATIVE_SEGWIT_1_INPUT
+    wif = bip32.HDKey.from_seed(PSBTTestData.seed.seed_bytes).derive("m/84h/1h/0h/0/0").key.wif()
+    mnemonic = "height demise useless trap grow lion found off key clown transfer enroll"
+
+    segments = [
+        (QRType.PSBT__UR2, "UR:CRYPTO-PSBT/1-3/LPADAXCFAXHLCYYNUEHDEE"),
+        (QRType.PSBT__UR2, "ur:crypto-psbt/1-3/lpadaxcfaxhlcyynuehdee"),
+        (QRType.OUTPUT__UR, "UR:CRYPTO-OUTPUT/TAADMETAADDLONAXHDCLAX"),
+        (QRType.ACCOUNT__UR, "UR:CRYPTO-ACCOUNT/OEADCYEMRETITEAOLYTAAD"),
+        (QRType.BYTES__UR, "UR:BYTES/HDCXLKAHSSQZWFVSLOFZOXWKRSGRKIAHL"),
+        (QRType.PSBT__SPECTER, "p1of3 " + base64_psbt[:100]),
+        (QRType.PSBT__BASE64, base64_psbt),
+        (QRType.PSBT__BASE43, base43_encode(a2b_base64(base64_psbt))),
+        (QRType.PSBT__BBQR, "B$ZP0100FMUE4KXZZ7EHBEUJQGAYDGMXLP2O34WEVGERCKNOQWTY3URDYX"),
+        (QRType.WALLET__SPECTER, 'p1of2 {"label": "Dev Funds", "descriptor": "wsh(sortedmulti('),
+        (QRType.WALLET__SPECTER, '\n{"label": "Dev Funds",\n "descriptor": "wpkh([990a73ad/84h/1h/0h]tpub/0/*)"}'),
+        (QRType.WALLET__CONFIGFILE, "# Multisig setup file (created by Sparrow)\nName: Dev Funds\nPolicy: 2 of 3"),
+        (QRType.WALLET__GENERIC, "wsh(sortedmulti(2,[e0811b6b/48h/0h/0h/2h]xpub6E8v/0/*))"),
+        (QRType.SEED__SEEDQR, "121802020768124106400009195602431595117715840445"),
+        (QRType.SEED__COMPACTSEEDQR, b"\xff" * 16),
+        (QRType.SEED__MNEMONIC, mnemonic),
+        (QRType.SEED__FOUR_LETTER_MNEMONIC, " ".join(word[:4] for word in mnemonic.split())),
+        (QRType.BITCOIN_ADDRESS, native_segwit_address_mainnet),
+        (QRType.BITCOIN_ADDRESS, legacy_address_testnet),
+        (QRType.BITCOIN_ADDRESS, "BITCOIN:" + native_segwit_address_mainnet.upper()),
+        (QRType.PRIVATE_KEY__WIF, wif),
+        (QRType.PRIVATE_KEY__WIF, f" {wif}\n"),
+        (QRType.SIGN_MESSAGE, "signmessage m/84h/0h/0h/0/0 ascii:hello world"),
+        (QRType.SETTINGS, "settings::v1 name=Foo"),
+
+        # Close, but not quite
+        (QRType.INVALID, "UR:CRYPTO-SEED/OYADGDIYWLAMAEJSZSWDWYTLTIFEENFTLNMNWKBDHNSSRO"),
+        (QRType.INVALID, "cHNidP8BADMCAAAAAU4T"),
+        (QRType.INVALID, base43_encode(b"not a psbt")),
+        (QRType.INVALID, wif[:-1] + ("A" if wif[-1] != "A" else "B")),
+        (QRType.INVALID, "Settings::v1 name=Foo"),
+        (QRType.INVALID, ""),
+    ]
+    for (expected_qr_type, segment) in segments:
+        for data in [segment, segment.encode() if isinstance(segment, str) else segment]:
+            assert DecodeQR.detect_segment_type(data, wordlist_language_code=SettingsConstants.WORDLIST_LANGUAGE__ENGLISH) == expected_qr_type, segment
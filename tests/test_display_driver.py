@@ -0,0 +1,231 @@
+import array
+import struct
+import sys
+import time
+import pytest
+import types
+
+from PIL import Image, ImageDraw
+from unittest.mock import patch
+
+from seedsigner.hardware.displays.display_driver import DISPLAY_TYPE__ILI9341, DISPLAY_TYPE__ST7789, DisplayDriver
+
+
+# Every driver uses the same D/C pin
+DC_PIN = 22
+
+CASET = 0x2A
+RASET = 0x2B
+RAMWR = 0x2C
+
+
+def _supports_bgr16() -> bool:
+    try:
+        Image.new("RGB", (1, 1)).convert("BGR;16")
+        return True
+    except ValueError:
+        return False
+
+# The drivers' RGB565 conversion relies on Pillow's "BGR;16" mode, which newer Pillow
+# releases (11+) dropped; see the version pinned in requirements.txt.
+pytestmark = pytest.mark.skipif(not _supports_bgr16(), reason="Pillow lacks \"BGR;16\" conversion")
+
+
+
+class MockGPIO(types.ModuleType):
+    """ Stand-in for RPi.GPIO that just remembers pin levels """
+    BOARD = "BOARD"
+    OUT = "OUT"
+    HIGH = 1
+    LOW = 0
+
+    def __init__(self):
+        super().__init__("RPi.GPIO")
+        self.pins = {}
+
+    def setmode(self, mode):
+        pass
+
+    def setwarnings(self, enabled):
+        pass
+
+    def setup(self, pin, mode):
+        pass
+
+    def output(self, pin, value):
+        self.pins[pin] = bool(value)
+
+
+
+class MockSpiDev:
+    """
+        Stand-in for spidev.SpiDev that counts the bytes written and replays the
+        column/row address and RAM write commands into a simulated panel, so tests can
+        check exactly what ended up on the display.
+    """
+    def __init__(self, gpio: MockGPIO, panel_size: tuple[int, int], bus: int = 0, device: int = 0):
+        self.gpio = gpio
+        (self.panel_width, self.panel_height) = panel_size
+        self.ram = bytearray(self.panel_width * self.panel_height * 2)
+        self.max_speed_hz = None
+        self.num_bytes = 0
+        self.command = None
+        self.params = bytearray()
+        self.window = None
+
+
+    def writebytes(self, data):
+        self.write(bytes(data))
+
+
+    def writebytes2(self, data):
+        self.write(bytes(data))
+
+
+    def write(self, data: bytes):
+        self.num_bytes += len(data)
+        if not self.gpio.pins.get(DC_PIN):
+            self.command = data[-1]
+            self.params = bytearray()
+            if self.command == RAMWR:
+                (x0, x1) = struct.unpack(">HH", self.x_params)
+                (y0, y1) = struct.unpack(">HH", self.y_params)
+                assert x0 <= x1 < self.panel_width and y0 <= y1 < self.panel_height, f"Window out of bounds: {(x0, y0, x1, y1)}"
+                self.window = (x0, y0, x1, y1)
+                self.write_pos = 0
+            return
+
+        if self.command in [CASET, RASET]:
+            self.params += data
+            if self.command == CASET:
+                self.x_params = bytes(self.params[:4])
+            else:
+                self.y_params = bytes(self.params[:4])
+
+        elif self.command == RAMWR:
+            # Fill the window row by row, starting where the last write left off
+            (x0, y0, x1, y1) = self.window
+            row_len = (x1 - x0 + 1) * 2
+            for i in range(0, len(data), 2):
+                (row, col) = divmod(self.write_pos, row_len)
+                offset = ((y0 + row) * self.panel_width + x0) * 2 + col
+                self.ram[offset:offset + 2] = data[i:i + 2]
+                self.write_pos += 2
+
+
+    def reset_stats(self):
+        self.num_bytes = 0
+
+
+
+def rgb565(image: Image.Image) -> bytes:
+    """ Big-endian RGB565, the way the drivers send pixels """
+    arr = array.array("H", image.convert("BGR;16").tobytes())
+    arr.byteswap()
+    return arr.tobytes()
+
+
+
+def make_display(display_type: str, width: int, height: int, panel_size: tuple[int, int]) -> tuple[DisplayDriver, MockSpiDev]:
+    gpio = MockGPIO()
+    spi_devices = []
+
+    def SpiDev(bus, device):
+        spi = MockSpiDev(gpio, panel_size, bus, device)
+        spi_devices.append(spi)
+        return spi
+
+    rpi = types.ModuleType("RPi")
+    rpi.GPIO = gpio
+    spidev = types.ModuleType("spidev")
+    spidev.SpiDev = SpiDev
+
+    # Import fresh copies of the drivers against the mocked hardware modules; skip the
+    # reset delays.
+    driver_modules = [name for name in sys.modules if name.startswith("seedsigner.hardware.displays.") and name != "seedsigner.hardware.displays.display_driver"]
+    with patch.dict(sys.modules, {"RPi": rpi, "RPi.GPIO": gpio, "spidev": spidev}), patch("time.sleep"):
+        for name in driver_modules:
+            del sys.modules[name]
+        disp = DisplayDriver(display_type, width=width, height=height)
+
+    spi = spi_devices[0]
+    spi.reset_stats()
+    return (disp, spi)
+
+
+
+# (display type, DisplayDriver width x height, canvas size, native panel size)
+DISPLAY_CONFIGS = [
+    (DISPLAY_TYPE__ST7789, (240, 240), (240, 240), (240, 240)),
+    (DISPLAY_TYPE__ST7789, (320, 240), (320, 240), (320, 240)),
+    (DISPLAY_TYPE__ILI9341, (320, 240), (320, 240), (240, 320)),
+]
+
+
+
+def test_dirty_windows():
+    """ Only the changed bands should be reported, with adjacent bands merged """
+    (disp, spi) = make_display(DISPLAY_TYPE__ST7789, 240, 240, (240, 240))
+    canvas = Image.new("RGB", (240, 240), "black")
+
+    # Nothing is known to be on the display yet
+    assert disp.get_dirty_windows(canvas) == [(0, 0, 240, 240)]
+    disp.show_image_windows(canvas, disp.get_dirty_windows(canvas))
+    assert disp.get_dirty_windows(canvas) == []
+
+    draw = ImageDraw.Draw(canvas)
+    draw.rectangle((10, 100, 99, 139), fill="orange")       # spans 3 bands
+    draw.rectangle((200, 10, 229, 19), fill="white")        # separate band
+    assert disp.get_dirty_windows(canvas) == [(200, 10, 230, 20), (10, 100, 100, 140)]
+
+
+
+def test_partial_updates_reach_the_panel():
+    """ Every driver should put each window in the right spot and send a fraction of a full frame """
+    for (display_type, (width, height), canvas_size, panel_size) in DISPLAY_CONFIGS:
+        (disp, spi) = make_display(display_type, width, height, panel_size)
+        canvas = Image.new("RGB", canvas_size, (31, 31, 31))
+        draw = ImageDraw.Draw(canvas)
+        draw.text((20, 20), "SeedSigner", fill="white")
+
+        def update() -> tuple[int, float]:
+            spi.reset_stats()
+            start = time.perf_counter()
+            disp.show_image_windows(canvas, disp.get_dirty_windows(canvas))
+            return (spi.num_bytes, (time.perf_counter() - start) * 1000)
+
+        def assert_panel_matches_canvas():
+            expected = canvas.rotate(disp.display.rotation, expand=True) if display_type == DISPLAY_TYPE__ILI9341 else canvas
+            assert spi.ram == rgb565(expected)
+
+        (full_frame_bytes, full_frame_ms) = update()
+        assert full_frame_bytes >= canvas_size[0] * canvas_size[1] * 2
+        assert_panel_matches_canvas()
+
+        # A button highlight and a progress counter
+        draw.rectangle((15, 150, 124, 189), fill="orange")
+        draw.text((canvas_size[0] - 40, 5), "3/10", fill="white")
+        (partial_bytes, partial_ms) = update()
+        assert_panel_matches_canvas()
+        assert partial_bytes < full_frame_bytes / 5
+
+        # No change, nothing sent
+        assert update()[0] == 0
+
+        print(f"{display_type} {width}x{height}: full frame {full_frame_bytes} bytes / {full_frame_ms:0.1f}ms, partial update {partial_bytes} bytes / {partial_ms:0.1f}ms")
+
+
+
+def test_direct_writes_tracked():
+    """ Writes that bypass get_dirty_windows (e.g. the screensaver) should still be diffed against """
+    (disp, spi) = make_display(DISPLAY_TYPE__ST7789, 240, 240, (240, 240))
+    canvas = Image.new("RGB", (240, 240), "black")
+    disp.show_image_windows(canvas, disp.get_dirty_windows(canvas))
+
+    # Screensaver draws straight to the display...
+    disp.show_image(Image.new("RGB", (240, 240), "blue"), 0, 0)
+
+    # ...so restoring the unchanged canvas has to repaint all of it
+    assert disp.get_dirty_windows(canvas) == [(0, 0, 240, 240)]
+    disp.show_image_windows(canvas, disp.get_dirty_windows(canvas))
+    assert spi.ram == rgb565(canvas)
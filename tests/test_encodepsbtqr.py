@@ -56,10 +56,9 @@ def test_specter_xpub_qr():
 
     e = SpecterLegacyXPubQrEncoder(seed=Seed(mnemonic.split(" "), passphrase="pass"), network=SettingsConstants.TESTNET, derivation="m/48h/1h/0h/2h", qr_density=SettingsConstants.DENSITY__LOW)
 
-    assert e.next_part() == "p1of4 [c49122a5/48h/1h/0h/2h]Vpub5mXgECaX5yYDN"
-    assert e.next_part() == "p2of4 c5VnUG4jVNptyEg65qUjuofWchQeuMWWiq8rcPBo"
-    assert e.next_part() == "p3of4 MxfrVggXj5NJmaNEToWpax8GMMucozvAdqf1bW1J"
-    assert e.next_part() == "p4of4 sZsfdBzsK3VUC5"
+    assert e.next_part() == "p1of3 [c49122a5/48h/1h/0h/2h]Vpub5mXgECaX5yYDNc5VnUG4"
+    assert e.next_part() == "p2of3 jVNptyEg65qUjuofWchQeuMWWiq8rcPBoMxfrVggXj5NJma"
+    assert e.next_part() == "p3of3 NEToWpax8GMMucozvAdqf1bW1JsZsfdBzsK3VUC5"
 
 
 
@@ -73,10 +72,9 @@ def test_ur_xpub_qr():
         qr_density=SettingsConstants.DENSITY__MEDIUM
     )
 
-    assert e.next_part() == "UR:CRYPTO-ACCOUNT/1-4/LPADAACSKPCYMOMNLGRYHDCKOEADCYSSMECPONAOLYTAADMETAADDLOXAXHDCLAOKSRLNLKPUEGYATHPMNSNIYMUECBY"
-    assert e.next_part() == "UR:CRYPTO-ACCOUNT/2-4/LPAOAACSKPCYMOMNLGRYHDCKKKGHZMLUZORPVDGUOTECSTTKTOLPCWPTNTLKZTTIZTBEAAHDCXVDTPMYRSTDMOPSCXFZ"
-    assert e.next_part() == "UR:CRYPTO-ACCOUNT/3-4/LPAXAACSKPCYMOMNLGRYHDCKSPZSBZSPGERLGDATUYNLPYBTGYIYYKBTWTAOSWKSVTSGCHBYDKYAVDAMTAADMONDGDFD"
-    assert e.next_part() == "UR:CRYPTO-ACCOUNT/4-4/LPAAAACSKPCYMOMNLGRYHDCKDYOTADLOCSDYYKADYKAEYKAOYKAOCYSSMECPONAXAAAYCYIOREKKJKAEAEAEWZWDMYON"    
+    assert e.next_part() == "UR:CRYPTO-ACCOUNT/1-3/LPADAXCSKPCYMOMNLGRYHDDIOEADCYSSMECPONAOLYTAADMETAADDLOXAXHDCLAOKSRLNLKPUEGYATHPMNSNKKGHZMLUZORPVDGUOTLTCNCNBE"
+    assert e.next_part() == "UR:CRYPTO-ACCOUNT/2-3/LPAOAXCSKPCYMOMNLGRYHDDIECSTTKTOLPCWPTNTLKZTTIZTBEAAHDCXVDTPMYRSTDSPZSBZSPGERLGDATUYNLPYBTGYIYYKBTWTAOCFRKWTAE"
+    assert e.next_part() == "UR:CRYPTO-ACCOUNT/3-3/LPAXAXCSKPCYMOMNLGRYHDDISWKSVTSGCHBYDKYAVDAMTAADDYOTADLOCSDYYKADYKAEYKAOYKAOCYSSMECPONAXAAAYCYIOREKKJKYLJEGTFE"
 
 
     e = UrXpubQrEncoder(
@@ -86,8 +84,6 @@ def test_ur_xpub_qr():
         qr_density=SettingsConstants.DENSITY__MEDIUM
     )
 
-    assert e.next_part() == "UR:CRYPTO-ACCOUNT/1-5/LPADAHCSKECYRTPEDKMOHDCFOEADCYSSMECPONAOLYTAADMETAADDLONAXHDCLAOKSRLNLKPUENSAHBTHS"
-    assert e.next_part() == "UR:CRYPTO-ACCOUNT/2-5/LPAOAHCSKECYRTPEDKMOHDCFGYATHPMNSNKKGHZMLUZORPVDGUOTECSTTKTOLPCWPTNTLKZTTIZTNDJSCF"
-    assert e.next_part() == "UR:CRYPTO-ACCOUNT/3-5/LPAXAHCSKECYRTPEDKMOHDCFZTBEAAHDCXVDTPMYRSTDSPZSBZSPGERLGDATUYNLPYBTGYIYYKBDFGWPKE"
-    assert e.next_part() == "UR:CRYPTO-ACCOUNT/4-5/LPAAAHCSKECYRTPEDKMOHDCFBTWTAOSWKSVTSGCHBYDKYAVDAHTAADEHOYAOADAMTAADDYOTADGYBKBWFE"
-    assert e.next_part() == "UR:CRYPTO-ACCOUNT/5-5/LPAHAHCSKECYRTPEDKMOHDCFLOCSDYYKADYKAEYKAOYKAOCYSSMECPONAXAAAYCYIOREKKJKAETODLFYWP"
+    assert e.next_part() == "UR:CRYPTO-ACCOUNT/1-3/LPADAXCSKECYRTPEDKMOHDDROEADCYSSMECPONAOLYTAADMETAADDLONAXHDCLAOKSRLNLKPUEGYATHPMNSNKKGHZMLUZORPVDGUOTECSTTKWDJNBGWN"
+    assert e.next_part() == "UR:CRYPTO-ACCOUNT/2-3/LPAOAXCSKECYRTPEDKMOHDDRTOLPCWPTNTLKZTTIZTBEAAHDCXVDTPMYRSTDSPZSBZSPGERLGDATUYNLPYBTGYIYYKBTWTAOSWKSVTSGCHBYSPHNKTTD"
+    assert e.next_part() == "UR:CRYPTO-ACCOUNT/3-3/LPAXAXCSKECYRTPEDKMOHDDRDKYAVDAHTAADEHOYAOADAMTAADDYOTADLOCSDYYKADYKAEYKAOYKAOCYSSMECPONAXAAAYCYIOREKKJKAEAEDRWKVLHL"
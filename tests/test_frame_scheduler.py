@@ -0,0 +1,100 @@
+from seedsigner.models.frame_scheduler import FrameScheduler
+
+
+
+class FakeClock:
+    """ Monotonic clock whose `sleep` just advances time """
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, secs: float):
+        self.now += secs
+
+
+
+def make_scheduler(fps: float = 10) -> tuple[FrameScheduler, FakeClock]:
+    clock = FakeClock()
+    return (FrameScheduler(fps=fps, clock=clock, sleep=clock.sleep), clock)
+
+
+
+def test_absolute_deadlines():
+    """ Variable work per frame shouldn't push later frames back """
+    (scheduler, clock) = make_scheduler(fps=10)
+    for work_secs in [0.01, 0.05, 0.09, 0.0, 0.03] * 4:
+        clock.now += work_secs
+        scheduler.frame_shown()
+        assert scheduler.wait_for_next_frame() == 1
+
+    # 20 frames, each due exactly 0.1s apart
+    assert abs(clock.now - (100.0 + 20 * 0.1)) < 1e-9
+    assert scheduler.num_late_frames == 0
+    assert scheduler.num_skipped_frames == 0
+
+
+
+def test_slightly_late_frame_stays_on_schedule():
+    """ Missing only the next deadline shows the next frame right away without skipping """
+    (scheduler, clock) = make_scheduler(fps=10)
+    clock.now += 0.15
+    scheduler.frame_shown()
+    assert scheduler.wait_for_next_frame() == 1
+    assert abs(clock.now - 100.15) < 1e-9
+
+    # ...and the frame after that is still due on the original schedule
+    scheduler.frame_shown()
+    assert scheduler.wait_for_next_frame() == 1
+    assert abs(clock.now - 100.2) < 1e-9
+
+
+
+def test_skip_late_frames():
+    """ Frames whose deadlines already passed are skipped to stay on time """
+    (scheduler, clock) = make_scheduler(fps=10)
+    clock.now += 0.35
+    scheduler.frame_shown()
+    assert scheduler.wait_for_next_frame(can_skip=True) == 3
+    assert scheduler.num_late_frames == 1
+    assert scheduler.num_skipped_frames == 2
+
+    # Back on the original schedule: frame 3 was due at 100.3, frame 4 at 100.4
+    scheduler.frame_shown()
+    assert scheduler.wait_for_next_frame() == 1
+    assert abs(clock.now - 100.4) < 1e-9
+
+
+
+def test_hold_late_frames():
+    """ Without skipping, a late frame restarts the schedule from now """
+    (scheduler, clock) = make_scheduler(fps=10)
+    clock.now += 0.35
+    scheduler.frame_shown()
+    assert scheduler.wait_for_next_frame(can_skip=False) == 1
+    assert scheduler.num_late_frames == 1
+    assert scheduler.num_skipped_frames == 0
+    assert abs(scheduler.deadline - 100.35) < 1e-9
+
+    scheduler.frame_shown()
+    assert scheduler.wait_for_next_frame() == 1
+    assert abs(clock.now - 100.45) < 1e-9
+
+
+
+def test_stats():
+    """ Should report the measured fps and how late frames went out """
+    (scheduler, clock) = make_scheduler(fps=10)
+    assert scheduler.measured_fps == 0.0
+    assert scheduler.mean_jitter == 0.0
+
+    for i in range(10):
+        # Every other frame goes out 20ms after its deadline
+        clock.now += 0.02 if i % 2 else 0.0
+        scheduler.frame_shown()
+        scheduler.wait_for_next_frame()
+
+    assert abs(scheduler.measured_fps - 10) < 0.5
+    assert abs(scheduler.mean_jitter - 0.01) < 1e-9
+    assert abs(scheduler.max_jitter - 0.02) < 1e-9
@@ -0,0 +1,41 @@
+from unittest.mock import patch
+
+from base import BaseTest
+from embit.psbt import PSBT
+
+from seedsigner.gui.screens.screen import QRDisplayScreen
+from seedsigner.models.encode_qr import BBQrPsbtQrEncoder, UrPsbtQrEncoder
+from seedsigner.models.qr_type import QRType
+from seedsigner.views.psbt_views import PSBTSignedQRDisplayView
+
+from psbt_testing_util import PSBTTestData
+
+
+
+class TestPSBTSignedQRDisplayView(BaseTest):
+    def run_view(self) -> dict:
+        """ Returns the kwargs the View passed to its QRDisplayScreen """
+        self.controller.psbt = PSBT.from_string(PSBTTestData.SINGLE_SIG_LEGACY_P2PKH_1_INPUT)
+        captured_kwargs = {}
+
+        def run_screen_side_effect(_view, screen_cls, **kwargs):
+            assert screen_cls == QRDisplayScreen
+            captured_kwargs.update(kwargs)
+
+        with patch.object(PSBTSignedQRDisplayView, "run_screen", autospec=True, side_effect=run_screen_side_effect):
+            PSBTSignedQRDisplayView().run()
+
+        return captured_kwargs
+
+
+    def test_bbqr_psbt_exported_as_bbqr(self):
+        """ A PSBT that arrived as BBQr should go back out as BBQr """
+        self.controller.psbt_qr_type = QRType.PSBT__BBQR
+        assert type(self.run_view()["qr_encoder"]) == BBQrPsbtQrEncoder
+
+
+    def test_other_psbts_exported_as_ur(self):
+        """ Every other PSBT format gets a UR2 crypto-psbt back """
+        for qr_type in [None, QRType.PSBT__UR2, QRType.PSBT__BASE64, QRType.PSBT__SPECTER]:
+            self.controller.psbt_qr_type = qr_type
+            assert type(self.run_view()["qr_encoder"]) == UrPsbtQrEncoder
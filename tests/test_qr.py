@@ -0,0 +1,71 @@
+import qrcode
+
+from binascii import a2b_base64
+from embit.psbt import PSBT
+
+from seedsigner.helpers.qr import QR
+from seedsigner.models.decode_qr import DecodeQR, DecodeQRStatus
+from seedsigner.models.encode_qr import UrPsbtQrEncoder
+from seedsigner.models.settings_definition import SettingsConstants
+
+from psbt_testing_util import PSBTTestData
+
+
+
+def test_qrimage_io_paints_module_matrix():
+    """ Each QR module should be painted as a solid black or background-colored block """
+    data = "UR:CRYPTO-PSBT/12-3/LPBYAXCFAXHLCYYNUEHDEEHDRYWPFGSOYKBSGAGSVLHPGS"
+    qr = qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_L, border=2)
+    qr.add_data(data)
+    qr.make(fit=True)
+    matrix = qr.get_matrix()
+
+    # Pick a size that's an exact multiple of the matrix so modules are evenly scaled
+    module_size = 6
+    size = len(matrix) * module_size
+    image = QR().qrimage_io(data, size, size, border=2, background_color="bdbdbd")
+    assert image.size == (size, size)
+    assert image.mode == "RGBA"
+
+    for (y, row) in enumerate(matrix):
+        for (x, is_dark) in enumerate(row):
+            expected = (0, 0, 0, 255) if is_dark else (0xbd, 0xbd, 0xbd, 255)
+            assert image.getpixel((x * module_size, y * module_size)) == expected
+            assert image.getpixel((x * module_size + module_size - 1, y * module_size + module_size - 1)) == expected
+
+
+
+def test_qrimage_io_background_color():
+    """ Should accept the background color with or without a leading '#' """
+    image = QR().qrimage_io("hello", 240, 240, border=2, background_color="1f1f1f")
+    assert image.getpixel((0, 0)) == (0x1f, 0x1f, 0x1f, 255)
+
+    image = QR().qrimage_io("hello", 240, 240, border=2, background_color="#444")
+    assert image.getpixel((0, 0)) == (0x44, 0x44, 0x44, 255)
+
+
+
+def test_qrimage_palette_recolor():
+    """ Recoloring a palette QR should only swap its background color """
+    qr = QR()
+    image = qr.qrimage_palette("hello", 240, 240, border=2)
+    assert image.mode == "P"
+    pixels = image.tobytes()
+
+    for background_color in [(31, 31, 31), "bdbdbd", "white"]:
+        QR.set_background_color(image, background_color)
+        assert image.tobytes() == pixels
+        assert image.convert("RGBA").tobytes() == qr.qrimage_io("hello", 240, 240, border=2, background_color=background_color if isinstance(background_color, str) else "1f1f1f").tobytes()
+
+
+
+def test_qrimage_io_decodes():
+    """ Animated PSBT frames rendered in-process should scan back to the PSBT """
+    encoder = UrPsbtQrEncoder(psbt=PSBT.parse(a2b_base64(PSBTTestData.SINGLE_SIG_LEGACY_P2PKH_1_INPUT)), qr_density=SettingsConstants.DENSITY__HIGH)
+    decoder = DecodeQR()
+    for i in range(encoder.seq_len() * 2):
+        image = encoder.next_part_image(240, 240, border=2, background_color="bdbdbd")
+        status = decoder.add_image(image)
+        if status == DecodeQRStatus.COMPLETE:
+            break
+    assert status == DecodeQRStatus.COMPLETE
@@ -0,0 +1,111 @@
+import math
+import qrcode
+import random
+
+from embit.psbt import PSBT
+from embit.script import Script
+from embit.transaction import Transaction, TransactionInput, TransactionOutput
+from urtypes.crypto import PSBT as UR_PSBT
+
+from seedsigner.helpers import qr_capacity
+from seedsigner.helpers.ur2.fountain_encoder import FountainEncoder
+from seedsigner.helpers.ur2.ur import UR
+from seedsigner.helpers.ur2.ur_encoder import UREncoder
+from seedsigner.models.encode_qr import UrPsbtQrEncoder
+from seedsigner.models.settings_definition import SettingsConstants
+
+from binascii import a2b_base64
+from psbt_testing_util import PSBTTestData
+
+
+
+def qr_version_of(data: str) -> int:
+    qr = qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_L)
+    qr.add_data(data)
+    qr.make(fit=True)
+    return qr.version
+
+
+
+def make_psbt(num_inputs: int) -> PSBT:
+    """ An unsigned native segwit PSBT that grows with `num_inputs` like a real one """
+    rng = random.Random(num_inputs)
+    tx = Transaction(
+        vin=[TransactionInput(rng.randbytes(32), 0) for i in range(num_inputs)],
+        vout=[TransactionOutput(rng.randrange(10**4, 10**8), Script(b"\x00\x14" + rng.randbytes(20))) for i in range(2)],
+    )
+    psbt = PSBT(tx)
+    for psbt_in in psbt.inputs:
+        psbt_in.witness_utxo = TransactionOutput(rng.randrange(10**4, 10**8), Script(b"\x00\x14" + rng.randbytes(20)))
+    return psbt
+
+
+
+def test_capacities_match_qrcode():
+    """ A string exactly at capacity should fit the version; one more char should not """
+    for version in [1, 3, 4, 5, 9, 12, 20]:
+        capacity = qr_capacity.alphanumeric_capacity(version)
+        assert qr_version_of("A" * capacity) == version
+        assert qr_version_of("A" * (capacity + 1)) == version + 1
+
+        capacity = qr_capacity.byte_capacity(version)
+        assert qr_version_of("a" * capacity) == version
+        assert qr_version_of("a" * (capacity + 1)) == version + 1
+
+
+
+def test_ur_psbt_parts_fill_qr_version():
+    """ Every fountain part, including the extra ones shown while looping, should fit the target version """
+    for psbt_base64 in [PSBTTestData.SINGLE_SIG_LEGACY_P2PKH_1_INPUT, PSBTTestData.MULTISIG_NATIVE_SEGWIT_1_INPUT]:
+        for qr_density in [SettingsConstants.DENSITY__LOW, SettingsConstants.DENSITY__MEDIUM, SettingsConstants.DENSITY__HIGH]:
+            encoder = UrPsbtQrEncoder(psbt=PSBT.parse(a2b_base64(psbt_base64)), qr_density=qr_density)
+            seq_len = encoder.seq_len()
+            versions = {qr_version_of(encoder.next_part()) for i in range(qr_capacity.SEQ_NUM_HEADROOM * seq_len)}
+            assert max(versions) == encoder.qr_version
+
+
+
+LEGACY_MAX_FRAGMENT_LEN = {
+    SettingsConstants.DENSITY__LOW: 10,
+    SettingsConstants.DENSITY__MEDIUM: 30,
+    SettingsConstants.DENSITY__HIGH: 120,
+}
+
+
+
+def test_fewer_ur_psbt_parts():
+    """ Sizing to a QR version should never take more frames than the old fixed fragment sizes """
+    psbts = [PSBT.parse(a2b_base64(psbt_base64)) for psbt_base64 in [PSBTTestData.SINGLE_SIG_LEGACY_P2PKH_1_INPUT, PSBTTestData.MULTISIG_NATIVE_SEGWIT_1_INPUT]]
+
+    # Multi-KB PSBTs, where fragment rounding actually matters (~1.6KB to ~23KB of CBOR)
+    psbts += [make_psbt(num_inputs) for num_inputs in [20, 80, 300]]
+
+    for psbt in psbts:
+        message_len = len(UR_PSBT(psbt.serialize()).to_cbor())
+        for (qr_density, max_fragment_len) in LEGACY_MAX_FRAGMENT_LEN.items():
+            fragment_len = FountainEncoder.find_nominal_fragment_length(message_len, 10, max_fragment_len)
+            encoder = UrPsbtQrEncoder(psbt=psbt, qr_density=qr_density)
+            assert encoder.seq_len() <= math.ceil(message_len / fragment_len)
+
+
+
+def test_ur_psbt_qr_version_matches_legacy():
+    """ Past the smallest PSBTs the old fixed fragment sizes already filled these QR versions """
+    for psbt in [make_psbt(20), make_psbt(80)]:
+        ur = UR("crypto-psbt", UR_PSBT(psbt.serialize()).to_cbor())
+        for (qr_density, max_fragment_len) in LEGACY_MAX_FRAGMENT_LEN.items():
+            legacy_encoder = UREncoder(ur, max_fragment_len)
+            longest_part = max((legacy_encoder.next_part() for i in range(legacy_encoder.fountain_encoder.seq_len())), key=len)
+            legacy_version = qr_version_of(longest_part.upper())
+            assert UrPsbtQrEncoder(psbt=psbt, qr_density=qr_density).qr_version == legacy_version
+
+
+
+def test_pxofy_fragment_len():
+    """ The longest "pXofY " part should exactly fit the target version's byte capacity """
+    for data_len in [40, 111, 500, 2000]:
+        for version in [3, 4, 5]:
+            fragment_len = qr_capacity.max_pxofy_fragment_len(data_len, version)
+            num_parts = math.ceil(data_len / fragment_len)
+            assert len(f"p{num_parts}of{num_parts} ") + fragment_len <= qr_capacity.byte_capacity(version)
+            assert qr_version_of(f"p{num_parts}of{num_parts} " + "a" * fragment_len) == version
@@ -0,0 +1,77 @@
+from binascii import a2b_base64
+from embit.psbt import PSBT
+
+# Must import test base before the Controller
+from base import BaseTest
+
+from seedsigner.gui.screens.screen import QRDisplayScreen
+from seedsigner.models.encode_qr import GenericStaticQrEncoder, UrPsbtQrEncoder
+from seedsigner.models.settings_definition import SettingsConstants
+
+from psbt_testing_util import PSBTTestData
+
+
+
+def run_producer(frame_producer: QRDisplayScreen.QRFrameProducerThread, num_frames: int) -> list:
+    """ Pulls `num_frames` frames the way QRDisplayThread does """
+    frame_producer.start()
+    try:
+        frames = []
+        for frame_num in range(num_frames):
+            frame = frame_producer.get_frame(frame_num, timeout=5)
+            assert frame is not None
+            frames.append(frame)
+        return frames
+    finally:
+        frame_producer.stop()
+        frame_producer.join()
+
+
+
+def ur_psbt_encoder(qr_density: str) -> UrPsbtQrEncoder:
+    return UrPsbtQrEncoder(psbt=PSBT.parse(a2b_base64(PSBTTestData.SINGLE_SIG_LEGACY_P2PKH_1_INPUT)), qr_density=qr_density)
+
+
+
+class TestQRFrameProducerThread(BaseTest):
+    def test_static_qr_renders_once(self):
+        """ A static QR should be a single cached frame, shown over and over """
+        frame_producer = QRDisplayScreen.QRFrameProducerThread(GenericStaticQrEncoder(data="hello"), border=2, extra_fountain_parts=10, max_cached_frames=500)
+        assert frame_producer.num_loop_frames == 1
+
+        frames = run_producer(frame_producer, 5)
+        assert all(frame is frames[0] for frame in frames)
+        assert frames[0].mode == "P"
+
+
+    def test_fountain_qr_loop(self):
+        """ A fountain-coded QR should cache one full cycle plus the extra parts and then replay them """
+        encoder = ur_psbt_encoder(SettingsConstants.DENSITY__HIGH)
+        seq_len = encoder.seq_len()
+        frame_producer = QRDisplayScreen.QRFrameProducerThread(encoder, border=2, extra_fountain_parts=3, max_cached_frames=500)
+        assert frame_producer.is_looping
+        assert frame_producer.num_loop_frames == seq_len + 3
+
+        # By default the loop has 2 * seq_len extra parts
+        assert QRDisplayScreen.QRFrameProducerThread(encoder, border=2, extra_fountain_parts=None, max_cached_frames=500).num_loop_frames == 3 * seq_len
+
+        frames = run_producer(frame_producer, 2 * (seq_len + 3))
+        assert len(frame_producer.frames) == seq_len + 3
+        assert frames[:seq_len + 3] == frames[seq_len + 3:]
+
+
+    def test_stream_when_loop_too_long(self):
+        """ A loop that doesn't fit in the cache should be streamed through a bounded buffer """
+        encoder = ur_psbt_encoder(SettingsConstants.DENSITY__LOW)
+        frame_producer = QRDisplayScreen.QRFrameProducerThread(encoder, border=2, extra_fountain_parts=10, max_cached_frames=4)
+        assert not frame_producer.is_looping
+
+        num_frames = 2 * encoder.seq_len()
+        frames = run_producer(frame_producer, num_frames)
+        assert len(frame_producer.frames) <= 4
+        assert frame_producer.num_discarded_frames == num_frames - 1
+
+        # Every part, in order
+        expected_encoder = ur_psbt_encoder(SettingsConstants.DENSITY__LOW)
+        for frame in frames:
+            assert frame.tobytes() == expected_encoder.part_to_palette_image(expected_encoder.next_part(), border=2).tobytes()
@@ -0,0 +1,65 @@
+from unittest.mock import Mock
+
+from seedsigner.models.decode_qr import DecodeQRStatus
+from seedsigner.models.scan_frame_decoder import ScanFrameDecoder
+from seedsigner.models.scan_governor import ScanGovernor, ScanProfile
+
+
+
+FRAME = (b"\x00" * 4, 2, 2)
+
+
+def make_frame_decoder(decode_pool=None) -> ScanFrameDecoder:
+    governor = Mock(spec=ScanGovernor)
+    governor.record.return_value = None
+    return ScanFrameDecoder(camera=Mock(), decoder=Mock(), governor=governor, decode_pool=decode_pool)
+
+
+
+def test_decodes_in_process():
+    frame_decoder = make_frame_decoder()
+    frame_decoder.decoder.add_luminance.side_effect = [DecodeQRStatus.PART_COMPLETE, DecodeQRStatus.COMPLETE]
+
+    assert frame_decoder.decode_frame(1, FRAME) == [(1, DecodeQRStatus.PART_COMPLETE)]
+    frame_decoder.governor.record.assert_called_once_with(DecodeQRStatus.PART_COMPLETE)
+
+    # No new frame, nothing to decode
+    assert frame_decoder.decode_frame(1, None) == []
+
+    # The final status isn't fed to the governor
+    assert frame_decoder.decode_frame(2, FRAME) == [(2, DecodeQRStatus.COMPLETE)]
+    assert frame_decoder.governor.record.call_count == 1
+
+
+
+def test_governor_switches_camera_profile():
+    frame_decoder = make_frame_decoder()
+    frame_decoder.decoder.add_luminance.return_value = DecodeQRStatus.FALSE
+    frame_decoder.governor.record.return_value = ScanProfile(resolution=(480, 480), framerate=4)
+
+    frame_decoder.decode_frame(1, FRAME)
+    frame_decoder.camera.restart_video_stream_mode.assert_called_once_with(resolution=(480, 480), framerate=4, format="rgb")
+
+
+
+def test_decode_pool_results():
+    decode_pool = Mock()
+    decode_pool.workers = [Mock()]
+    frame_decoder = make_frame_decoder(decode_pool)
+    frame_decoder.decoder.add_data.side_effect = [DecodeQRStatus.PART_COMPLETE, DecodeQRStatus.COMPLETE]
+
+    # Nothing has finished yet
+    decode_pool.get_results.return_value = []
+    assert frame_decoder.decode_frame(1, FRAME) == []
+    decode_pool.submit.assert_called_once_with(1, *FRAME)
+
+    # Results still come in while the camera has no new frame; stops at COMPLETE
+    decode_pool.get_results.return_value = [(1, None), (2, b"part"), (3, b"last part"), (4, b"extra")]
+    assert frame_decoder.decode_frame(2, None) == [(1, DecodeQRStatus.FALSE), (2, DecodeQRStatus.PART_COMPLETE), (3, DecodeQRStatus.COMPLETE)]
+    assert decode_pool.submit.call_count == 1
+    assert frame_decoder.governor.record.call_count == 2
+
+    # Every worker died: decode in-process
+    decode_pool.workers = []
+    frame_decoder.decoder.add_luminance.return_value = DecodeQRStatus.FALSE
+    assert frame_decoder.decode_frame(3, FRAME) == [(3, DecodeQRStatus.FALSE)]
@@ -0,0 +1,102 @@
+from seedsigner.models.decode_qr import DecodeQRStatus
+from seedsigner.models.scan_governor import ScanGovernor
+
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+
+def run_window(governor: ScanGovernor, clock: FakeClock, decode_fps: float, statuses: list[DecodeQRStatus]):
+    """ Feeds one full window of decode outcomes at the given decode rate """
+    changes = []
+    for i in range(ScanGovernor.WINDOW_SIZE):
+        clock.now += 1.0 / decode_fps
+        new_profile = governor.record(statuses[i % len(statuses)])
+        if new_profile:
+            changes.append(new_profile)
+    return changes
+
+
+
+def test_starts_at_original_profile():
+    governor = ScanGovernor()
+    assert governor.profile.resolution == (480, 480)
+    assert governor.profile.framerate == 6
+    assert governor.preview_frame_interval == 1
+    assert governor.max_resolution == (480, 480)
+
+
+
+def test_falling_behind_cuts_preview_before_framerate():
+    clock = FakeClock()
+    governor = ScanGovernor(clock=clock)
+
+    # Decoder only manages half the camera's framerate
+    for expected_interval in range(2, ScanGovernor.MAX_PREVIEW_FRAME_INTERVAL + 1):
+        assert run_window(governor, clock, decode_fps=3, statuses=[DecodeQRStatus.PART_COMPLETE]) == []
+        assert governor.preview_frame_interval == expected_interval
+    assert governor.profile_index == ScanGovernor.DEFAULT_PROFILE_INDEX
+
+    # Preview is fully throttled and still behind: drop to the slower profile
+    changes = run_window(governor, clock, decode_fps=3, statuses=[DecodeQRStatus.PART_COMPLETE])
+    assert changes == [ScanGovernor.PROFILES[0]]
+
+    # Keeping up again restores the preview one step at a time
+    run_window(governor, clock, decode_fps=4, statuses=[DecodeQRStatus.PART_COMPLETE])
+    assert governor.preview_frame_interval == ScanGovernor.MAX_PREVIEW_FRAME_INTERVAL - 1
+
+    # ...but never goes back to a profile that couldn't keep up
+    for i in range(10):
+        clock.now += ScanGovernor.MIN_PROFILE_SECONDS
+        assert run_window(governor, clock, decode_fps=4, statuses=[DecodeQRStatus.PART_COMPLETE]) == []
+    assert governor.preview_frame_interval == 1
+    assert governor.profile_index == 0
+
+
+
+def test_keeping_up_steps_up_framerate():
+    clock = FakeClock()
+    governor = ScanGovernor(clock=clock)
+
+    # Too soon after starting the camera to restart it
+    assert run_window(governor, clock, decode_fps=6, statuses=[DecodeQRStatus.PART_COMPLETE, DecodeQRStatus.PART_EXISTING]) == []
+
+    clock.now += ScanGovernor.MIN_PROFILE_SECONDS
+    changes = run_window(governor, clock, decode_fps=6, statuses=[DecodeQRStatus.PART_COMPLETE, DecodeQRStatus.PART_EXISTING])
+    assert changes == [ScanGovernor.PROFILES[ScanGovernor.DEFAULT_PROFILE_INDEX + 1]]
+    assert governor.profile.framerate > 6
+
+    # Nothing in view (e.g. still aiming the camera): no reason to change anything
+    clock.now += ScanGovernor.MIN_PROFILE_SECONDS
+    assert run_window(governor, clock, decode_fps=governor.profile.framerate, statuses=[DecodeQRStatus.FALSE]) == []
+
+
+
+def test_missing_a_visible_qr_steps_up_resolution():
+    clock = FakeClock()
+    governor = ScanGovernor(profile_index=len(ScanGovernor.PROFILES) - 1, clock=clock)
+    clock.now += ScanGovernor.MIN_PROFILE_SECONDS
+
+    # Keeping up, but the QR only resolves in one of every three frames
+    changes = run_window(governor, clock, decode_fps=governor.profile.framerate, statuses=[DecodeQRStatus.PART_COMPLETE, DecodeQRStatus.FALSE, DecodeQRStatus.FALSE])
+    assert len(changes) == 1
+    assert changes[0].resolution > ScanGovernor.PROFILES[-1].resolution
+
+
+
+def test_missing_a_visible_qr_only_changes_resolution():
+    """ A lower framerate at the same resolution won't resolve a dense QR any better """
+    clock = FakeClock()
+    governor = ScanGovernor(clock=clock)
+    clock.now += ScanGovernor.MIN_PROFILE_SECONDS
+
+    # Already at the highest resolution
+    changes = run_window(governor, clock, decode_fps=governor.profile.framerate, statuses=[DecodeQRStatus.PART_COMPLETE, DecodeQRStatus.FALSE, DecodeQRStatus.FALSE])
+    assert changes == []
+    assert governor.profile_index == ScanGovernor.DEFAULT_PROFILE_INDEX
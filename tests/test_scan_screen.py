@@ -0,0 +1,55 @@
+import time
+
+from unittest.mock import Mock, patch
+
+# Must import test base before the Controller
+from base import BaseTest
+
+from seedsigner.gui.screens.scan_screens import ScanScreen
+from seedsigner.hardware.buttons import HardwareButtonsConstants
+from seedsigner.hardware.camera import Camera
+from seedsigner.models.decode_qr import DecodeQR
+
+
+
+class StalledCamera:
+    """ A camera that has stopped delivering frames, e.g. while it's being restarted """
+    MAX_READS = 20
+
+    def __init__(self):
+        self.is_streaming = False
+        self.num_reads = 0
+
+
+    def start_video_stream_mode(self, resolution=None, framerate=None, format=None):
+        self.is_streaming = True
+
+
+    def stop_video_stream_mode(self):
+        self.is_streaming = False
+
+
+    def read_next_video_frame(self, last_seq_num=0, as_image=False, as_luminance=False, newest=False, timeout=0.5):
+        self.num_reads += 1
+        assert self.num_reads <= self.MAX_READS, "The scan loop never checked the buttons"
+
+        # Stand-in for waiting out the timeout
+        time.sleep(0.001)
+        return (last_seq_num, None)
+
+
+
+class TestScanScreen(BaseTest):
+    def test_back_button_while_camera_stalled(self):
+        """ The user must be able to back out even if no frame ever arrives """
+        camera = StalledCamera()
+        with patch.object(Camera, "get_instance", return_value=camera):
+            screen = ScanScreen(decoder=DecodeQR(), instructions_text="Scan a QR code")
+
+        # KEY_LEFT is pressed after a few empty reads
+        screen.hw_inputs = Mock()
+        screen.hw_inputs.check_for_low.side_effect = lambda key: key == HardwareButtonsConstants.KEY_LEFT and camera.num_reads >= 3
+
+        assert screen._run() == False
+        assert camera.num_reads == 3
+        assert not camera.is_streaming
@@ -1,5 +1,9 @@
 import os
+import pytest
+import random
+
 from embit import bip39
+from seedsigner.helpers import seedqr
 from seedsigner.helpers.qr import QR
 from seedsigner.models.decode_qr import DecodeQR, DecodeQRStatus
 from seedsigner.models.encode_qr import SeedQrEncoder, CompactSeedQrEncoder
@@ -128,3 +132,55 @@ def test_compact_seedqr_bytes_interpretable_as_str():
         entropy_bytes.decode()  # should not raise an exception
         mnemonic_length = 12 if len(entropy_bytes) == 16 else 24
         run_encode_decode_test(entropy_bytes, mnemonic_length=mnemonic_length, qr_type=QRType.SEED__COMPACTSEEDQR)
+
+
+
+def test_seedqr_round_trip_random_mnemonics():
+    """
+    Property test: any valid mnemonic survives SeedQrEncoder / CompactSeedQrEncoder ->
+    DecodeQR, and the bitwise codec agrees with embit's BIP-39 implementation.
+    """
+    rng = random.Random(656)
+    wordlist = bip39.WORDLIST
+    for i in range(500):
+        # Mostly 12/24 words; every 16-32 byte entropy length decodes the same way
+        num_bytes = rng.choice([16, 32, 16, 32, 20, 24, 28])
+        entropy = bytes(rng.choice([0, 255, rng.randrange(256)]) for j in range(num_bytes))
+        mnemonic = bip39.mnemonic_from_bytes(entropy).split()
+
+        standard = SeedQrEncoder(mnemonic=mnemonic).next_part()
+        assert standard == "".join("%04d" % wordlist.index(word) for word in mnemonic)
+        assert seedqr.seedqr_to_mnemonic(standard) == mnemonic
+
+        compact = CompactSeedQrEncoder(mnemonic=mnemonic).next_part()
+        assert compact == entropy
+        assert seedqr.compact_seedqr_to_mnemonic(compact) == mnemonic
+
+        if len(mnemonic) in (12, 24):
+            for (data, qr_type) in [(standard.encode(), QRType.SEED__SEEDQR), (compact, QRType.SEED__COMPACTSEEDQR)]:
+                decoder = DecodeQR()
+                assert decoder.add_data(data) == DecodeQRStatus.COMPLETE
+                assert decoder.qr_type == qr_type
+                assert decoder.get_seed_phrase() == mnemonic
+
+
+
+def test_seedqr_ignores_partial_trailing_word():
+    """ Like the original decoder, digits that don't make up a whole word are ignored """
+    assert seedqr.seedqr_to_mnemonic("0000" * 11 + "0003" + "12") == ["abandon"] * 11 + ["about"]
+
+
+
+def test_seedqr_rejects_malformed_data():
+    # Index out of range
+    decoder = DecodeQR()
+    assert decoder.add_data("0000" * 11 + "2048") == DecodeQRStatus.INVALID
+
+    # CompactSeedQR entropy must be 16-32 bytes, in multiples of 4
+    for entropy in [b"\x00" * 15, b"\x00" * 17, b"\x00" * 18, b"\x00" * 33]:
+        with pytest.raises(ValueError, match="16-32 bytes"):
+            seedqr.compact_seedqr_to_mnemonic(entropy)
+
+    # ...e.g. 15 and 18 words
+    assert len(seedqr.compact_seedqr_to_mnemonic(b"\x00" * 20)) == 15
+    assert len(seedqr.compact_seedqr_to_mnemonic(b"\x00" * 24)) == 18
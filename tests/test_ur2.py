@@ -0,0 +1,334 @@
+import math
+import os
+import pytest
+import random
+import zlib
+
+from seedsigner.helpers.ur2 import crc32 as crc32_module
+from seedsigner.helpers.ur2.bytewords import Bytewords, Bytewords_Style_minimal, Bytewords_Style_standard, Bytewords_Style_uri
+from seedsigner.helpers.ur2.fountain_decoder import FountainDecoder, GaussianFountainDecoder
+from seedsigner.helpers.ur2.cbor_lite import CBORDecoder, CBOREncoder
+from seedsigner.helpers.ur2.fountain_encoder import FountainEncoder, InvalidHeader, Part
+from seedsigner.helpers.ur2.fountain_utils import FragmentSelectionTable, RandomSampler, choose_fragments, shuffled
+from seedsigner.helpers.ur2.ur import UR
+from seedsigner.helpers.ur2.ur_decoder import URDecoder
+from seedsigner.helpers.ur2.ur_encoder import UREncoder
+from seedsigner.helpers.ur2.utils import int_to_bytes, xor_all, xor_bytes, xor_into
+from seedsigner.helpers.ur2.xoshiro256 import Xoshiro256
+
+
+
+def xor_bytewise(a, b):
+    """ Reference implementation: the original one-byte-at-a-time XOR loop """
+    result = bytearray(a)
+    for i in range(len(result)):
+        result[i] ^= b[i]
+    return bytes(result)
+
+
+
+def test_xor_bytes_matches_bytewise_xor():
+    """ The bulk XOR must match the bytewise reference at every fragment length """
+    rand = random.Random(1)
+    for length in [1, 7, 8, 9, 10, 31, 64, 120, 255, 400]:
+        a = bytes(rand.getrandbits(8) for i in range(length))
+        b = bytes(rand.getrandbits(8) for i in range(length))
+        assert xor_bytes(a, b) == xor_bytewise(a, b)
+
+        # Leading and trailing zero bytes must survive the int round trip
+        zeros = bytes(length)
+        assert xor_bytes(a, a) == zeros
+        assert xor_bytes(zeros, b) == b
+
+        target = bytearray(a)
+        xor_into(target, b)
+        assert bytes(target) == xor_bytewise(a, b)
+
+
+def test_xor_all():
+    rand = random.Random(2)
+    bufs = [bytes(rand.getrandbits(8) for i in range(50)) for j in range(5)]
+
+    expected = bytes(50)
+    for buf in bufs:
+        expected = xor_bytewise(expected, buf)
+
+    assert xor_all(bufs, 50) == expected
+    assert xor_all([], 50) == bytes(50)
+
+
+def choose_fragments_full_shuffle(seq_num, seq_len, checksum):
+    """ Reference implementation: fresh alias table and a full shuffle for every part """
+    if seq_num <= seq_len:
+        return set([seq_num - 1])
+    rng = Xoshiro256.from_bytes(int_to_bytes(seq_num) + int_to_bytes(checksum))
+    degree = RandomSampler([1.0 / i for i in range(1, seq_len + 1)]).next(lambda: rng.next_double()) + 1
+    return set(shuffled(list(range(seq_len)), rng)[0:degree])
+
+
+def test_choose_fragments_matches_full_shuffle():
+    """ The cached sampler + partial shuffle must select exactly the same fragments """
+    rand = random.Random(4)
+    for seq_len in [1, 2, 3, 10, 37, 100]:
+        checksum = rand.getrandbits(32)
+        for seq_num in range(1, seq_len * 4 + 1):
+            assert choose_fragments(seq_num, seq_len, checksum) == choose_fragments_full_shuffle(seq_num, seq_len, checksum)
+
+
+def test_fragment_selection_table():
+    table = FragmentSelectionTable(seq_len=20, checksum=12345, cycle_len=50)
+    table.precompute()
+    assert len(table.table) == 50
+    for seq_num in range(1, 60):
+        assert table.get(seq_num) == choose_fragments(seq_num, 20, 12345)
+
+    # seq_nums past the cycle are still correct but aren't memoized
+    assert len(table.table) == 50
+
+
+
+def test_crc32_backends_match():
+    """ The C-accelerated and pure-Python CRC-32 paths must agree, incrementally too """
+    rand = random.Random(5)
+    assert crc32_module.crc32(b"Hello, world!") == 0xebe6c6e6
+    assert crc32_module.crc32_pure(b"Hello, world!") == 0xebe6c6e6
+
+    for i in range(50):
+        buf = bytes(rand.getrandbits(8) for j in range(rand.randint(0, 500)))
+        expected = zlib.crc32(buf)
+        assert crc32_module.crc32(buf) == expected
+        assert crc32_module.crc32_pure(buf) == expected
+
+        split = rand.randint(0, len(buf))
+        assert crc32_module.crc32(buf[split:], crc32_module.crc32(buf[:split])) == expected
+        assert crc32_module.crc32_pure(buf[split:], crc32_module.crc32_pure(buf[:split])) == expected
+
+
+
+def test_crc32n_is_always_four_bytes():
+    # Find a buffer whose checksum has a leading zero byte
+    buf = next(bytes([i]) * 9 for i in range(256) if crc32_module.crc32(bytes([i]) * 9) < 0x01000000)
+    assert len(crc32_module.crc32n(buf)) == 4
+    assert crc32_module.crc32n(buf)[0] == 0
+
+
+
+def test_bytewords_vectors():
+    """ Test vectors from the BC-UR reference implementation """
+    buf = bytes([0, 1, 2, 128, 255])
+    assert Bytewords.encode(Bytewords_Style_standard, buf) == "able acid also lava zoom jade need echo taxi"
+    assert Bytewords.encode(Bytewords_Style_uri, buf) == "able-acid-also-lava-zoom-jade-need-echo-taxi"
+    assert Bytewords.encode(Bytewords_Style_minimal, buf) == "aeadaolazmjendeoti"
+
+    assert Bytewords.decode(Bytewords_Style_standard, "able acid also lava zoom jade need echo taxi") == buf
+    assert Bytewords.decode(Bytewords_Style_uri, "able-acid-also-lava-zoom-jade-need-echo-taxi") == buf
+    assert Bytewords.decode(Bytewords_Style_minimal, "aeadaolazmjendeoti") == buf
+
+    # Case-insensitive, since UR QRs are uppercased for alphanumeric mode
+    assert Bytewords.decode(Bytewords_Style_minimal, "AEADAOLAZMJENDEOTI") == buf
+
+
+def test_bytewords_round_trip():
+    rand = random.Random(6)
+    for i in range(50):
+        buf = bytes(rand.getrandbits(8) for j in range(rand.randint(1, 300)))
+        for style in [Bytewords_Style_standard, Bytewords_Style_uri, Bytewords_Style_minimal]:
+            assert Bytewords.decode(style, Bytewords.encode(style, buf)) == buf
+
+
+@pytest.mark.parametrize("style,encoded", [
+    (Bytewords_Style_standard, "able acid also lava zoom jade need echo tax"),     # truncated word
+    (Bytewords_Style_standard, "able acid also lava zoom jade need echo taxy"),    # bad middle letters
+    (Bytewords_Style_uri, "able-acid-also-lava-zoom-jade-need-echo-abcd"),
+    (Bytewords_Style_minimal, "aeadaolazmjendeot"),     # odd length
+    (Bytewords_Style_minimal, "aeadaolazmjendeoxx"),    # not a word
+    (Bytewords_Style_minimal, "aeadao"),                # too short to hold a checksum
+])
+def test_bytewords_invalid(style, encoded):
+    with pytest.raises(ValueError):
+        Bytewords.decode(style, encoded)
+
+
+
+def test_cbor_part_round_trip():
+    """ Header fields that need each of the 0/1/2/4/8-byte integer encodings """
+    for value in [0, 23, 24, 255, 256, 65535, 65536, 2**32 - 1, 2**32, 2**64 - 1]:
+        part = Part(seq_num=value, seq_len=value, message_len=value, checksum=value, data=os.urandom(value % 200))
+        cbor = part.cbor()
+
+        for buf in [bytes(cbor), bytearray(cbor), memoryview(cbor)]:
+            decoded = Part.from_cbor(buf)
+            assert (decoded.seq_num, decoded.seq_len, decoded.message_len, decoded.checksum) == (value, value, value, value)
+            assert decoded.data == part.data
+            assert type(decoded.data) == bytes
+
+        # Truncated input must be rejected
+        with pytest.raises(InvalidHeader):
+            Part.from_cbor(cbor[:-1])
+
+
+def test_cbor_encode_text():
+    """ Text is written as its UTF-8 bytes, with the byte (not char) length """
+    encoder = CBOREncoder()
+    assert encoder.encodeText("ab€") == 6
+    assert encoder.get_bytes() == bytes([0x65]) + "ab€".encode()
+
+    (value, length) = CBORDecoder(encoder.get_bytes()).decodeText()
+    assert (value, length) == ("ab€".encode(), 6)
+
+
+def test_fountain_encoder_mix():
+    """ Mixed parts must be the XOR of their selected fragments """
+    message = bytearray(os.urandom(1000))
+    encoder = FountainEncoder(message, max_fragment_len=60)
+
+    for i in range(encoder.seq_len() * 3):
+        part = encoder.next_part()
+        expected = bytes(encoder.fragment_len)
+        for index in choose_fragments(part.seq_num, part.seq_len, part.checksum):
+            expected = xor_bytewise(expected, encoder.fragments[index])
+        assert part.data == expected
+
+
+
+def test_fountain_round_trip_mixed_parts_only():
+    """ The decoder must be able to complete using only mixed (XORed) parts """
+    message = bytearray(os.urandom(2000))
+    encoder = FountainEncoder(message, max_fragment_len=100)
+
+    # Skip past the pure fragments so every part has to be reduced
+    for i in range(encoder.seq_len()):
+        encoder.next_part()
+
+    decoder = FountainDecoder()
+    while not decoder.is_complete():
+        decoder.receive_part(encoder.next_part())
+
+    assert decoder.is_success()
+    assert decoder.result_message() == bytes(message)
+
+
+
+def test_ur_round_trip():
+    cbor = bytearray(os.urandom(3001))
+    encoder = UREncoder(UR("bytes", cbor), max_fragment_len=120)
+    decoder = URDecoder()
+
+    while not decoder.is_complete():
+        decoder.receive_part(encoder.next_part().upper())
+
+    assert decoder.is_success()
+    assert decoder.result_message() == UR("bytes", cbor)
+
+
+
+def recomputed_weighted_estimate(decoder):
+    """ Reference implementation: rescore every buffered mixed part from scratch """
+    num_complete = len(decoder.received_part_indexes)
+    mixed_index_scoring = {}
+    for indexes in decoder.mixed_parts.keys():
+        for index in indexes:
+            mixed_index_scoring[index] = mixed_index_scoring.get(index, 0.0) + 1.0 / len(indexes)
+    mixed_score = sum(min(score, 0.75) for score in mixed_index_scoring.values())
+    return (num_complete + mixed_score) / decoder.expected_part_count()
+
+
+def test_fountain_decoder_incremental_progress_matches_recomputation():
+    """ The running weighted progress estimate must track a full rescoring after every part """
+    rand = random.Random(7)
+    for trial in range(10):
+        message = bytearray(rand.getrandbits(8) for i in range(rand.randint(500, 3000)))
+        encoder = FountainEncoder(message, max_fragment_len=60)
+        decoder = FountainDecoder()
+
+        for i in range(rand.randint(0, encoder.seq_len() * 2)):
+            encoder.next_part()
+
+        while not decoder.is_complete():
+            part = encoder.next_part()
+            if rand.random() < 0.3:
+                continue
+            decoder.receive_part(part)
+            if decoder.is_complete():
+                break
+            assert math.isclose(decoder.estimated_percent_complete(weight_mixed_frames=True), recomputed_weighted_estimate(decoder))
+
+        assert decoder.result_message() == bytes(message)
+        assert decoder.estimated_percent_complete(weight_mixed_frames=True) == 1
+
+
+
+def frames_to_complete(decoder, parts):
+    for i, part in enumerate(parts):
+        decoder.receive_part(part)
+        if decoder.is_complete():
+            return i + 1
+    return None
+
+
+def test_gaussian_decoder_frames_to_complete():
+    """
+    On the same (lossy) part streams, the GF(2) decoder must always finish no later
+    than the peeling decoder and on average much closer to `seq_len`.
+    """
+    rand = random.Random(3)
+    peeling_total = 0
+    gaussian_total = 0
+    seq_len_total = 0
+    for trial in range(20):
+        message = bytearray(rand.getrandbits(8) for i in range(rand.randint(500, 3000)))
+        encoder = FountainEncoder(message, max_fragment_len=100)
+
+        # Simulate a camera that starts scanning mid-animation and misses ~30% of
+        # the displayed frames
+        for i in range(rand.randint(0, encoder.seq_len() * 2)):
+            encoder.next_part()
+        parts = []
+        while len(parts) < encoder.seq_len() * 10:
+            part = encoder.next_part()
+            if rand.random() > 0.3:
+                parts.append(part)
+
+        peeling = FountainDecoder()
+        gaussian = GaussianFountainDecoder()
+        peeling_frames = frames_to_complete(peeling, parts)
+        gaussian_frames = frames_to_complete(gaussian, parts)
+
+        assert peeling.result_message() == bytes(message)
+        assert gaussian.result_message() == bytes(message)
+        assert gaussian_frames <= peeling_frames
+
+        peeling_total += peeling_frames
+        gaussian_total += gaussian_frames
+        seq_len_total += encoder.seq_len()
+
+    assert gaussian_total < peeling_total
+    assert gaussian_total < seq_len_total * 1.25
+
+
+def test_gaussian_decoder_ignores_redundant_parts():
+    message = bytearray(os.urandom(1000))
+    encoder = FountainEncoder(message, max_fragment_len=100)
+    decoder = GaussianFountainDecoder()
+
+    part = encoder.next_part()
+    assert decoder.receive_part(part)
+    assert not decoder.receive_part(part)
+    assert decoder.received_part_indexes == {0}
+    assert decoder.estimated_percent_complete(weight_mixed_frames=True) == 1 / encoder.seq_len()
+
+
+def test_ur_decoder_gaussian_engine():
+    cbor = bytearray(os.urandom(2500))
+    encoder = UREncoder(UR("bytes", cbor), max_fragment_len=120)
+    decoder = URDecoder(fountain_decoder_class=GaussianFountainDecoder)
+
+    # Start mid-stream, past the pure fragments
+    for i in range(encoder.fountain_encoder.seq_len()):
+        encoder.next_part()
+
+    while not decoder.is_complete():
+        decoder.receive_part(encoder.next_part().upper())
+
+    assert decoder.is_success()
+    assert decoder.result_message() == UR("bytes", cbor)
@@ -0,0 +1,142 @@
+import argparse
+import random
+import time
+import tracemalloc
+import zlib
+
+from base64 import b32decode
+from dataclasses import dataclass
+
+from synthetic_psbt import make_psbt
+from seedsigner.models.decode_qr import BBQRPsbtQrDecoder, DecodeQRStatus
+from seedsigner.models.encode_qr import BBQrPsbtQrEncoder
+
+"""
+Per-frame latency and peak memory of BBQr PSBT decoding, streaming (each segment
+decoded and decompressed as soon as it's contiguous) vs the original join-everything-
+at-the-end decoder.
+
+tldr:
+    pip3 install -e .
+    cd tools/benchmarks
+    python3 bbqr.py -h
+"""
+
+
+usage = """
+Benchmark BBQr PSBT decoding on large (multi-hundred-KB) synthetic PSBTs.
+
+Usage:
+    # ~75KB to ~300KB PSBTs, parts filling a version 20 QR
+    python3 bbqr.py
+
+    # Bigger PSBTs, smaller QRs (more parts)
+    python3 bbqr.py --inputs 8000 --version 15
+
+    # Parts arrive in a random order, as when frames are dropped
+    python3 bbqr.py --shuffle
+"""
+
+
+
+@dataclass
+class FixedVersionBBQrPsbtQrEncoder(BBQrPsbtQrEncoder):
+    """ Parts sized for any QR version, so huge PSBTs stay under BBQr's 1295 parts """
+    version: int = 20
+
+    @property
+    def qr_version(self):
+        return self.version
+
+
+
+class JoinAtEndBBQRPsbtQrDecoder(BBQRPsbtQrDecoder):
+    """ The original implementation: keep the base32 text, decode it all once complete """
+    def parse_segment(self, segment) -> str:
+        self.encoding = segment[2]
+        return segment[8:].strip()
+
+
+    def segment_added(self, segment_num: int):
+        pass
+
+
+    def get_data(self) -> bytes:
+        if self.complete and self.encoding:
+            if self.encoding == 'H':
+                return b''.join(bytes.fromhex(s) for s in self.segments)
+
+            rv = b''
+            for p in self.segments:
+                padding = (8 - (len(p) % 8)) % 8
+                rv += b32decode(p + (padding*'='))
+
+            if self.encoding == 'Z':
+                z = zlib.decompressobj(wbits=-10)
+                rv = z.decompress(rv)
+                rv += z.flush()
+
+            return rv
+
+        return None
+
+
+
+DECODERS = {
+    "join-at-end": JoinAtEndBBQRPsbtQrDecoder,
+    "streaming": BBQRPsbtQrDecoder,
+}
+
+
+
+def decode(decoder_cls, parts: list[str]) -> tuple[list[float], bytes]:
+    """ Returns the seconds each frame took (the last one includes `get_data`) and the data """
+    decoder = decoder_cls()
+    frame_secs = []
+    for part in parts:
+        start = time.perf_counter()
+        status = decoder.add(part)
+        if status == DecodeQRStatus.COMPLETE:
+            data = decoder.get_data()
+        frame_secs.append(time.perf_counter() - start)
+    assert status == DecodeQRStatus.COMPLETE
+    return (frame_secs, data)
+
+
+
+def peak_memory(decoder_cls, parts: list[str]) -> int:
+    """ Peak bytes allocated while decoding (the parts themselves aren't counted) """
+    tracemalloc.start()
+    decode(decoder_cls, parts)
+    (current, peak) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+
+def benchmark_bbqr(num_inputs_list: list[int], version: int, shuffle: bool):
+    print(f"{'PSBT':>9} | {'parts':>5} | {'decoder':>11} | {'mean frame ms':>13} | {'max frame ms':>12} | {'last frame ms':>13} | {'peak KB':>8}")
+    for num_inputs in num_inputs_list:
+        psbt = make_psbt(num_inputs, seed=num_inputs)
+        psbt_bytes = psbt.serialize()
+        encoder = FixedVersionBBQrPsbtQrEncoder(psbt=psbt, version=version)
+        parts = list(encoder.parts)
+        if shuffle:
+            random.Random(num_inputs).shuffle(parts)
+
+        for (name, decoder_cls) in DECODERS.items():
+            (frame_secs, data) = decode(decoder_cls, parts)
+            assert data == psbt_bytes
+            peak = peak_memory(decoder_cls, parts)
+            print(f"{len(psbt_bytes) / 1024:7.0f}KB | {len(parts):5d} | {name:>11} | {sum(frame_secs) / len(frame_secs) * 1000:13.2f} | {max(frame_secs) * 1000:12.2f} | {frame_secs[-1] * 1000:13.2f} | {peak / 1024:8.0f}")
+
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=usage, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--inputs", nargs="+", type=int, default=[1000, 2000, 4000], help="PSBT sizes to try, in number of inputs")
+    parser.add_argument("--version", type=int, default=20, help="QR version each part fills")
+    parser.add_argument("--shuffle", action="store_true", help="Decode the parts in a random order")
+    args = parser.parse_args()
+
+    benchmark_bbqr(args.inputs, args.version, args.shuffle)
@@ -0,0 +1,199 @@
+import argparse
+import random
+import statistics
+
+from dataclasses import dataclass
+from embit.psbt import PSBT
+
+from synthetic_psbt import make_psbt
+from seedsigner.models.decode_qr import DecodeQR, DecodeQRStatus
+from seedsigner.models.encode_qr import BaseFountainQrEncoder, BaseQrEncoder, BBQrPsbtQrEncoder, SpecterLegacyXPubQrEncoder, UrPsbtQrEncoder
+from seedsigner.models.settings_definition import SettingsConstants
+
+"""
+Simulates an animated QR going from one screen to a camera over a lossy optical
+channel, without any QR rendering or zbar, to see how long a transfer takes for each
+format, density, and PSBT size.
+
+Pure Python; runs anywhere.
+
+tldr:
+    pip3 install -e .
+    cd tools/benchmarks
+    python3 channel.py -h
+"""
+
+
+usage = """
+Estimate seconds-to-complete for animated PSBT QRs over a simulated camera link.
+
+Usage:
+    # Sweep PSBT sizes and densities for every format
+    python3 channel.py
+
+    # A worse link: 30% of frames lost, 10% delivered twice, a slower scanner
+    python3 channel.py --drop-rate 0.3 --duplicate-rate 0.1 --scan-fps 4
+
+    # UR2 vs BBQr (zlib compressed base32) for the same PSBTs
+    python3 channel.py --formats ur bbqr
+
+    # Just UR2, bigger PSBTs, more trials per measurement
+    python3 channel.py --formats ur --inputs 10 50 100 --trials 50
+
+    # Compare QRDisplayScreen's cached loop with endless new fountain parts
+    python3 channel.py --formats ur --extra-parts 0
+    python3 channel.py --formats ur --no-loop
+"""
+
+
+# QRDisplayScreen's default animated QR speed (SETTING__QR_ANIMATION_FPS)
+DISPLAY_FPS = SettingsConstants.QR_ANIMATION_FPS__DEFAULT
+
+# QRDisplayScreen's default loop: fountain parts cached beyond the first cycle, per
+# part in the cycle
+EXTRA_FOUNTAIN_PARTS_PER_PART = 2
+
+# The scan screen's default camera framerate (ScanGovernor.DEFAULT_PROFILE_INDEX)
+SCAN_FPS = 6
+
+DENSITIES = [SettingsConstants.DENSITY__LOW, SettingsConstants.DENSITY__MEDIUM, SettingsConstants.DENSITY__HIGH]
+
+
+
+@dataclass
+class SpecterLegacyPsbtQrEncoder(SpecterLegacyXPubQrEncoder):
+    """
+        SpecterLegacyXPubQrEncoder's "pXofY" framing and fragment sizes around a base64
+        PSBT, which is the form of that format DecodeQR reads (SpecterPsbtQrDecoder).
+    """
+    psbt: PSBT = None
+
+    def prep_xpub(self):
+        self.xpubstring = self.psbt.to_string()
+
+
+FORMATS = {
+    "ur": UrPsbtQrEncoder,
+    "specter": SpecterLegacyPsbtQrEncoder,
+    "bbqr": BBQrPsbtQrEncoder,
+}
+
+
+
+@dataclass
+class Channel:
+    """
+        The optical link between the display and the camera.
+
+        The display shows a new part every 1/`display_fps` seconds; the camera captures
+        a frame every 1/`scan_fps` seconds (+/- `jitter`), starting at a random phase
+        relative to the display. A capture within `exposure_secs` of the display
+        switching parts is a mix of two QRs and is lost; on top of that, `drop_rate`
+        of the captures are lost to blur, glare, etc. `duplicate_rate` of the captures
+        that get through are handed to the decoder twice (a stale camera buffer).
+    """
+    display_fps: float = DISPLAY_FPS
+    scan_fps: float = SCAN_FPS
+    jitter: float = 0.1
+    exposure_secs: float = 0.02
+    drop_rate: float = 0.1
+    duplicate_rate: float = 0.05
+
+
+    def transfer(self, encoder: BaseQrEncoder, rng: random.Random, max_secs: float = 120, num_loop_parts: int = None) -> tuple[float, int] | None:
+        """
+            Plays the encoder's parts through the channel into a new DecodeQR. Returns
+            (seconds, frames captured) when it completes, or None if it doesn't within
+            `max_secs`.
+
+            With `num_loop_parts`, the display replays its first `num_loop_parts` parts
+            over and over, like QRDisplayScreen's cached animation loop.
+        """
+        decoder = DecodeQR()
+        displayed_parts = []
+        display_interval = 1 / self.display_fps
+        scan_interval = 1 / self.scan_fps
+
+        num_captures = 0
+        t = rng.uniform(0, scan_interval)
+        while t < max_secs:
+            frame_index = int(t / display_interval)
+            part_index = frame_index % num_loop_parts if num_loop_parts else frame_index
+            while len(displayed_parts) <= part_index:
+                displayed_parts.append(encoder.next_part().encode())
+
+            num_captures += 1
+            is_torn = t - frame_index * display_interval < self.exposure_secs
+            if not is_torn and rng.random() >= self.drop_rate:
+                copies = 2 if rng.random() < self.duplicate_rate else 1
+                for i in range(copies):
+                    status = decoder.add_data(displayed_parts[part_index])
+                    if status == DecodeQRStatus.COMPLETE:
+                        return (t, num_captures)
+                    elif status == DecodeQRStatus.INVALID:
+                        raise Exception(f"Decoder rejected part {part_index} of {type(encoder).__name__}")
+
+            t += scan_interval * rng.uniform(1 - self.jitter, 1 + self.jitter)
+
+        return None
+
+
+
+def benchmark_channel(channel: Channel, formats: list[str], num_inputs_list: list[int], trials: int, seed: int, loop: bool = True, extra_fountain_parts: int = None):
+    if not loop:
+        loop_description = "endless fountain parts"
+    elif extra_fountain_parts is None:
+        loop_description = f"looping {1 + EXTRA_FOUNTAIN_PARTS_PER_PART} * seq_len fountain parts"
+    else:
+        loop_description = f"looping seq_len + {extra_fountain_parts} fountain parts"
+    print(f"display: {channel.display_fps:0.1f} fps ({loop_description}), scanner: {channel.scan_fps:0.1f} fps, drop rate: {channel.drop_rate:0.2f}, duplicate rate: {channel.duplicate_rate:0.2f}, {trials} trials each")
+    print(f"{'format':>8} | {'density':>7} | {'PSBT':>7} | {'parts':>5} | {'mean secs':>9} | {'p90 secs':>8} | {'frames':>6} | timeouts")
+    rng = random.Random(seed)
+    for num_inputs in num_inputs_list:
+        psbt = make_psbt(num_inputs, seed=seed)
+        psbt_len = len(psbt.serialize())
+        for format in formats:
+            for density in DENSITIES:
+                results = []
+                num_timeouts = 0
+                for i in range(trials):
+                    encoder = FORMATS[format](psbt=psbt, qr_density=density)
+                    num_loop_parts = None
+                    if loop:
+                        # Same loop as QRDisplayScreen.QRFrameProducerThread
+                        num_loop_parts = encoder.seq_len()
+                        if isinstance(encoder, BaseFountainQrEncoder):
+                            num_loop_parts += EXTRA_FOUNTAIN_PARTS_PER_PART * num_loop_parts if extra_fountain_parts is None else extra_fountain_parts
+                    result = channel.transfer(encoder, rng, num_loop_parts=num_loop_parts)
+                    if result is None:
+                        num_timeouts += 1
+                    else:
+                        results.append(result)
+
+                seq_len = FORMATS[format](psbt=psbt, qr_density=density).seq_len()
+                if results:
+                    secs = sorted(secs for (secs, num_captures) in results)
+                    p90 = secs[min(len(secs) - 1, int(len(secs) * 0.9))]
+                    mean_captures = statistics.mean(num_captures for (secs, num_captures) in results)
+                    print(f"{format:>8} | {density:>7} | {psbt_len:>5} B | {seq_len:>5} | {statistics.mean(secs):9.2f} | {p90:8.2f} | {mean_captures:6.1f} | {num_timeouts}")
+                else:
+                    print(f"{format:>8} | {density:>7} | {psbt_len:>5} B | {seq_len:>5} | {'-':>9} | {'-':>8} | {'-':>6} | {num_timeouts}")
+
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=usage, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--formats", nargs="+", choices=list(FORMATS.keys()), default=list(FORMATS.keys()), help="Animated QR formats to simulate")
+    parser.add_argument("--inputs", nargs="+", type=int, default=[1, 5, 20], help="PSBT sizes to sweep, in number of inputs")
+    parser.add_argument("--trials", type=int, default=20, help="Transfers simulated per measurement")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--display-fps", type=float, default=DISPLAY_FPS, help=f"Animated QR frame rate (default: {DISPLAY_FPS:0.1f})")
+    parser.add_argument("--scan-fps", type=float, default=SCAN_FPS, help=f"Frames the scanner decodes per second (default: {SCAN_FPS})")
+    parser.add_argument("--drop-rate", type=float, default=0.1, help="Fraction of captured frames that fail to decode")
+    parser.add_argument("--duplicate-rate", type=float, default=0.05, help="Fraction of decoded frames seen twice")
+    parser.add_argument("--extra-parts", type=int, help=f"Fountain parts in the display's loop beyond the first cycle (default: {EXTRA_FOUNTAIN_PARTS_PER_PART} * seq_len)")
+    parser.add_argument("--no-loop", action="store_true", help="Display endless new fountain parts instead of a cached loop")
+    args = parser.parse_args()
+
+    channel = Channel(display_fps=args.display_fps, scan_fps=args.scan_fps, drop_rate=args.drop_rate, duplicate_rate=args.duplicate_rate)
+    benchmark_channel(channel, args.formats, args.inputs, args.trials, args.seed, loop=not args.no_loop, extra_fountain_parts=args.extra_parts)
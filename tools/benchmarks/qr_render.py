@@ -0,0 +1,133 @@
+import argparse
+import shutil
+import subprocess
+import time
+
+from PIL import Image
+import qrcode
+
+from synthetic_psbt import make_psbt
+from seedsigner.helpers.qr import QR
+from seedsigner.models.encode_qr import UrPsbtQrEncoder
+from seedsigner.models.settings_definition import SettingsConstants
+
+"""
+Benchmark for rendering QRDisplayScreen's animated QR frames.
+
+Mainly meant to be run on the Pi itself (where `qrencode` is installed) to compare
+the in-process `QR.qrimage_io` against the `qrencode` subprocess it replaced.
+
+tldr:
+    pip3 install -e .
+    cd tools/benchmarks
+    python3 qr_render.py -h
+"""
+
+
+usage = """
+Frames per second of animated PSBT QR rendering, in-process vs the qrencode subprocess.
+
+Usage:
+    python3 qr_render.py
+
+    # Bigger PSBT, more frames per measurement
+    python3 qr_render.py --inputs 20 --frames 200
+
+    # On the Pi: run QRDisplayScreen's threads against the real display for 20s and
+    # compare the frame rate and jitter they achieve with their target
+    python3 qr_render.py --display 20 --fps 10
+"""
+
+
+DENSITIES = [SettingsConstants.DENSITY__LOW, SettingsConstants.DENSITY__MEDIUM, SettingsConstants.DENSITY__HIGH]
+
+
+def qrencode_image(data, width=240, height=240, border=3, background_color="808080"):
+    """ The previous `QR.qrimage_io`: shells out to `qrencode` and reads back its PNG """
+    cmd = f"""qrencode -m {border} -s 3 -l L --foreground=000000 --background={background_color} -t PNG -o "/tmp/qrcode.png" "{str(data)}" """
+    if subprocess.call(cmd, shell=True) != 0:
+        raise Exception("qrencode failed")
+    return Image.open("/tmp/qrcode.png").resize((width, height), Image.Resampling.NEAREST).convert("RGBA")
+
+
+
+def frames_per_sec(render, parts: list[str]) -> float:
+    start = time.perf_counter()
+    for part in parts:
+        # Same args as QRDisplayScreen
+        render(part, 240, 240, border=2, background_color="bdbdbd")
+    return len(parts) / (time.perf_counter() - start)
+
+
+
+def benchmark_qr_render(num_inputs: int, num_frames: int):
+    renderers = {"in-process": QR().qrimage_io}
+    if shutil.which("qrencode"):
+        renderers["qrencode"] = qrencode_image
+    else:
+        print("qrencode not installed; only timing the in-process renderer")
+
+    psbt = make_psbt(num_inputs, seed=0)
+    print(f"{'density':>7} | {'version':>7} | " + " | ".join(f"{name:>10}" for name in renderers))
+    for density in DENSITIES:
+        encoder = UrPsbtQrEncoder(psbt=psbt, qr_density=density)
+        parts = [encoder.next_part() for i in range(num_frames)]
+
+        # libqrencode and qrcode can legitimately pick different masks, so a mismatch
+        # is only worth a closer look
+        image = QR().qrimage_io(parts[0], 240, 240, border=2, background_color="bdbdbd")
+        if "qrencode" in renderers and image.tobytes() != qrencode_image(parts[0], 240, 240, border=2, background_color="bdbdbd").tobytes():
+            print(f"Warning: in-process and qrencode frames differ at density {density}")
+
+        qr = qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_L)
+        qr.add_data(parts[0])
+        qr.make(fit=True)
+        results = [frames_per_sec(render, parts) for render in renderers.values()]
+        print(f"{density:>7} | {qr.version:>7} | " + " | ".join(f"{fps:6.1f} fps" for fps in results))
+
+
+
+def benchmark_display(num_inputs: int, secs: float, target_fps: float):
+    """ Measured vs target fps of QRDisplayScreen's threads on the real display (Pi only) """
+    from seedsigner.gui.renderer import Renderer
+    from seedsigner.gui.screens.screen import QRDisplayScreen
+    from seedsigner.models.threads import ThreadsafeCounter
+    Renderer.configure_instance()
+
+    psbt = make_psbt(num_inputs, seed=0)
+    print(f"{'density':>7} | {'parts':>5} | {'cached':>6} | {'target':>10} | {'measured':>10} | {'jitter (mean/max)':>17} | {'late':>4} | skipped")
+    for density in DENSITIES:
+        encoder = UrPsbtQrEncoder(psbt=psbt, qr_density=density)
+        frame_producer = QRDisplayScreen.QRFrameProducerThread(encoder, border=2, extra_fountain_parts=QRDisplayScreen.extra_fountain_parts, max_cached_frames=QRDisplayScreen.max_cached_frames)
+        display_thread = QRDisplayScreen.QRDisplayThread(
+            qr_brightness=ThreadsafeCounter(initial_value=189),
+            tips_start_time=ThreadsafeCounter(initial_value=0),
+            frame_producer=frame_producer,
+            target_fps=target_fps,
+        )
+        frame_producer.start()
+        display_thread.start()
+        time.sleep(secs)
+        display_thread.stop()
+        frame_producer.stop()
+        display_thread.join()
+        frame_producer.join()
+
+        cached = frame_producer.num_loop_frames if frame_producer.is_looping else "-"
+        scheduler = display_thread.scheduler
+        print(f"{density:>7} | {encoder.seq_len():>5} | {cached:>6} | {scheduler.fps:6.1f} fps | {scheduler.measured_fps:6.1f} fps | {scheduler.mean_jitter * 1000:6.1f} / {scheduler.max_jitter * 1000:6.1f} ms | {scheduler.num_late_frames:>4} | {scheduler.num_skipped_frames}")
+
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=usage, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--inputs", type=int, default=5, help="Number of inputs in the synthesised PSBT (default: 5)")
+    parser.add_argument("--frames", type=int, default=50, help="Frames rendered per measurement (default: 50)")
+    parser.add_argument("--display", type=float, metavar="SECS", help="Instead, show each density on the Pi's display for SECS seconds and report the measured fps")
+    parser.add_argument("--fps", type=float, default=SettingsConstants.QR_ANIMATION_FPS__DEFAULT, help=f"Target fps for --display (default: {SettingsConstants.QR_ANIMATION_FPS__DEFAULT})")
+    args = parser.parse_args()
+
+    if args.display:
+        benchmark_display(args.inputs, args.display, args.fps)
+    else:
+        benchmark_qr_render(args.inputs, args.frames)
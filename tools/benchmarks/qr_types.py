@@ -0,0 +1,141 @@
+import argparse
+import random
+import time
+
+from embit import bip32, bip39
+
+from synthetic_psbt import make_psbt
+from seedsigner.models.decode_qr import DecodeQR
+from seedsigner.models.qr_type import QRType
+from seedsigner.models.settings_definition import SettingsConstants
+
+"""
+Benchmark for `DecodeQR.detect_segment_type`, which runs on every frame the scanner
+decodes.
+
+Pure Python; runs anywhere (pyzbar must import, but zbar is never called).
+
+tldr:
+    pip3 install -e .
+    cd tools/benchmarks
+    python3 qr_types.py -h
+"""
+
+
+usage = """
+Time QR type detection for a sample of every QRType that DecodeQR can receive.
+
+Usage:
+    python3 qr_types.py
+
+    # Increase the number of classifications per measurement
+    python3 qr_types.py --iterations 20000
+"""
+
+
+# Only produced by the encoders / views; never detected in a scanned QR
+UNDETECTED_QR_TYPES = [
+    QRType.SEED__UR2,
+    QRType.XPUB,
+    QRType.XPUB__SPECTER,
+    QRType.XPUB__UR,
+    QRType.WALLET__UR,
+]
+
+MULTISIG_SETUP_FILE = """# Multisig setup file (created by Sparrow)
+#
+Name: SeedSigner Dev Funds
+Policy: 2 of 2
+Derivation: m/48'/0'/0'/2'
+Format: P2WSH
+
+E0811B6B: xpub6E8v7uy63pCeJvHe5W8ea8zTnCtKMFgMRb5bueWWcUFMw6sWmUwTqxM8cFiKQRWkA2Fxth9HJZufJwjWTTvU1UGZNpTrh9khrswYMgeHiCt
+852B308F: xpub6ErhgAWfnEqW7xDBm1iLq5JjNyUS65YUFnjHLrRv9zmdDEtuE75bpWQ8o6bSBnpT6AkrrsA8eA5SmEFArZn11KEPaZJzx9mHTXPWZCsxLyh
+"""
+
+DESCRIPTOR = "wsh(sortedmulti(2,[e0811b6b/48h/0h/0h/2h]xpub6E8v7uy63pCeJvHe5W8ea8zTnCtKMFgMRb5bueWWcUFMw6sWmUwTqxM8cFiKQRWkA2Fxth9HJZufJwjWTTvU1UGZNpTrh9khrswYMgeHiCt/0/*,[852b308f/48h/0h/0h/2h]xpub6ErhgAWfnEqW7xDBm1iLq5JjNyUS65YUFnjHLrRv9zmdDEtuE75bpWQ8o6bSBnpT6AkrrsA8eA5SmEFArZn11KEPaZJzx9mHTXPWZCsxLyh/0/*))"
+
+
+def base43_encode(data: bytes) -> str:
+    """ Electrum's base43 (the inverse of `DecodeQR.base43_decode`) """
+    chars = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ$*+-./:"
+    value = int.from_bytes(data, "big")
+    encoded = ""
+    while value:
+        (value, digit) = divmod(value, 43)
+        encoded = chars[digit] + encoded
+    num_leading_zeros = len(data) - len(data.lstrip(b"\x00"))
+    return chars[0] * num_leading_zeros + encoded
+
+
+
+def build_corpus(seed: int = 0) -> list[tuple[str, str | bytes]]:
+    """ (expected QRType, QR payload) for every QRType that can be detected """
+    rng = random.Random(seed)
+    psbt = make_psbt(2, seed=seed)
+    mnemonic = bip39.mnemonic_from_bytes(rng.randbytes(16))
+    root = bip32.HDKey.from_seed(bip39.mnemonic_to_seed(mnemonic))
+
+    return [
+        (QRType.PSBT__UR2, "UR:CRYPTO-PSBT/12-3/LPBYAXCFAXHLCYYNUEHDEEHDRYWPFGSOYKBSGAGSVLHPGS"),
+        (QRType.OUTPUT__UR, "ur:crypto-output/taadmetaaddlonaxhdclaxwmfmdeiamecsdsemgtvsjzcncygrkowtrontzschgezokstswkkscfmklrtauteyaeaeaeaeaeaeaeaeaeae"),
+        (QRType.ACCOUNT__UR, "UR:CRYPTO-ACCOUNT/OEADCYEMRETITEAOLYTAADMETAADDLOXAXHDCLAXNSRFNNWPBSFRAETIAEAEAEAEAE"),
+        (QRType.BYTES__UR, "UR:BYTES/HDCXLKAHSSQZWFVSLOFZOXWKRSGRKIAHLEMOWEJOGETSSWLYHSNBHDRYWPFG"),
+        (QRType.PSBT__SPECTER, "p1of3 " + psbt.to_string()[:120]),
+        (QRType.PSBT__BASE64, psbt.to_string()),
+        (QRType.PSBT__BASE43, base43_encode(psbt.serialize())),
+        (QRType.PSBT__BBQR, "B$ZP0100FMUE4KXZZ7EHBEUJQGAYDGMXLP2O34WEVGERCKNOQWTY3URDYXHGTXTTHOVHKW6YXZQYEVSN6UGQ"),
+        (QRType.WALLET__SPECTER, 'p1of2 {"label": "SeedSigner Dev Funds", "blockheight": 692143, "descriptor": "wsh(sortedmulti(2,'),
+        (QRType.WALLET__SPECTER, '{"label": "SeedSigner Dev Funds", "blockheight": 692143, "descriptor": "' + DESCRIPTOR + '"}'),
+        (QRType.WALLET__CONFIGFILE, MULTISIG_SETUP_FILE),
+        (QRType.WALLET__GENERIC, DESCRIPTOR),
+        (QRType.SEED__SEEDQR, "".join(f"{bip39.WORDLIST.index(word):04d}" for word in mnemonic.split())),
+        (QRType.SEED__COMPACTSEEDQR, b"\xff" + rng.randbytes(15)),
+        (QRType.SEED__MNEMONIC, mnemonic),
+        (QRType.SEED__FOUR_LETTER_MNEMONIC, " ".join(word[:4] for word in mnemonic.split())),
+        (QRType.BITCOIN_ADDRESS, "bc1qcr8te4kr609gcawutmrza0j4xv80jy8z306fyu"),
+        (QRType.BITCOIN_ADDRESS, "bitcoin:bc1qcr8te4kr609gcawutmrza0j4xv80jy8z306fyu?amount=0.001"),
+        (QRType.PRIVATE_KEY__WIF, root.derive("m/84h/0h/0h/0/0").key.wif()),
+        (QRType.SIGN_MESSAGE, "signmessage m/84h/0h/0h/0/0 ascii:hello world"),
+        (QRType.SETTINGS, "settings::v1 name=Foo coordinators=spa,spd denom=thr network=M qr_density=M"),
+        (QRType.INVALID, "Hello, world!"),
+    ]
+
+
+
+def benchmark_qr_types(iterations: int):
+    corpus = build_corpus()
+    detected_qr_types = set(qr_type for (qr_type, data) in corpus)
+    for qr_type in sorted(value for (name, value) in vars(QRType).items() if name.isupper()):
+        if qr_type not in detected_qr_types and qr_type not in UNDETECTED_QR_TYPES:
+            raise Exception(f"No sample of {qr_type} in the corpus")
+
+    print(f"{'QRType':>26} | {'len':>5} | per call")
+    total_secs = 0
+    for (expected_qr_type, data) in corpus:
+        # Scanned QRs arrive as bytes
+        if isinstance(data, str):
+            data = data.encode()
+
+        qr_type = DecodeQR.detect_segment_type(data, wordlist_language_code=SettingsConstants.WORDLIST_LANGUAGE__ENGLISH)
+        if qr_type != expected_qr_type:
+            raise Exception(f"Detected {qr_type} instead of {expected_qr_type}: {data[:40]}")
+
+        start = time.perf_counter()
+        for i in range(iterations):
+            DecodeQR.detect_segment_type(data, wordlist_language_code=SettingsConstants.WORDLIST_LANGUAGE__ENGLISH)
+        secs = (time.perf_counter() - start) / iterations
+        total_secs += secs
+        print(f"{expected_qr_type:>26} | {len(data):>5} | {secs * 10**6:8.1f} µs")
+
+    print(f"{'mean':>26} | {'':>5} | {total_secs * 10**6 / len(corpus):8.1f} µs")
+    print(f"Not detectable in scanned QRs: {', '.join(UNDETECTED_QR_TYPES)}")
+
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=usage, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", "--iterations", type=int, default=2000, help="Number of classifications per measurement")
+    args = parser.parse_args()
+
+    benchmark_qr_types(args.iterations)
@@ -0,0 +1,219 @@
+import glob
+import os
+import random
+import time
+
+from PIL import Image, ImageChops, ImageFilter
+import qrcode
+
+from seedsigner.hardware.camera import Camera
+
+"""
+A stand-in for the Pi camera that plays back recorded or synthesised frames so that
+the scan path can be measured on any machine.
+
+    from replay_camera import ReplayCamera
+    camera = ReplayCamera.install(ReplayCamera.load_png_dir("frames/"), framerate=6)
+    camera.start_video_stream_mode()
+    ...
+    (seq_num, luminance) = camera.read_next_video_frame(seq_num, as_luminance=True)
+"""
+
+
+# Matches ScanScreen's largest scan resolution
+FRAME_SIZE = 480
+
+
+def render_qr_luminance(payload: str, frame_size: int = FRAME_SIZE, border: int = 2) -> Image.Image:
+    """ Renders `payload` as a QR filling most of a grayscale camera-sized frame """
+    qr = qrcode.QRCode(border=border)
+    qr.add_data(payload)
+    qr_image = qr.make_image().convert("L")
+    qr_size = int(frame_size * 0.8)
+    qr_image = qr_image.resize((qr_size, qr_size), Image.Resampling.NEAREST)
+
+    frame = Image.new("L", (frame_size, frame_size), 127)
+    frame.paste(qr_image, (int((frame_size - qr_size) / 2), int((frame_size - qr_size) / 2)))
+    return frame
+
+
+
+class ReplayCamera(Camera):
+    """
+        Implements the video stream side of the `Camera` API on top of a list of
+        grayscale (pixels, width, height) frames.
+
+        With a `framerate`, frames "arrive" in real time like they would from the Pi
+        camera: a consumer that falls behind skips the frames it missed. Without one,
+        each read returns the next frame immediately so the decoder runs flat out and
+        sees every frame exactly once.
+
+        Recorded frames can't be rescaled, so a `restart_video_stream_mode()` only
+        picks up the new framerate.
+    """
+    # Same as PiVideoStream.FRAME_BUFFER_SIZE
+    FRAME_BUFFER_SIZE = 4
+
+    @classmethod
+    def install(cls, frames: list[tuple[bytes, int, int]], framerate: float = None) -> "ReplayCamera":
+        """ Makes this the instance `Camera.get_instance()` returns """
+        camera = cls.__new__(cls)
+        camera._camera_rotation = 0
+        camera.frames = frames
+        camera.framerate = framerate
+        camera.stream_start_time = None
+        camera.last_seq_num = 0
+        Camera._instance = camera
+        return camera
+
+
+    @staticmethod
+    def load_png_dir(path: str) -> list[tuple[bytes, int, int]]:
+        """ Every *.png in `path`, in filename order """
+        frames = []
+        for filename in sorted(glob.glob(os.path.join(path, "*.png"))):
+            with Image.open(filename) as image:
+                image = image.convert("L")
+                frames.append((image.tobytes(), image.width, image.height))
+        if not frames:
+            raise Exception(f"No PNG frames found in {path}")
+        return frames
+
+
+    @staticmethod
+    def load_npz(path: str) -> list[tuple[bytes, int, int]]:
+        """
+            Reads a `numpy.savez_compressed()` dump: either a "frames" array or the
+            first array in the file, shaped (n, height, width) for grayscale frames or
+            (n, height, width, 3) for RGB frames as captured by the Pi camera.
+        """
+        import numpy
+        with numpy.load(path) as npz:
+            frames = npz["frames"] if "frames" in npz.files else npz[npz.files[0]]
+
+        if frames.ndim == 4:
+            return [Camera.frame_to_luminance(frame) for frame in frames]
+        return [(frame.astype(numpy.uint8, copy=False).tobytes(), frame.shape[1], frame.shape[0]) for frame in frames]
+
+
+    @staticmethod
+    def save_npz(path: str, frames: list[tuple[bytes, int, int]]):
+        """ Dumps grayscale frames (all the same size) in the format `load_npz` reads """
+        import numpy
+        (pixels, width, height) = frames[0]
+        numpy.savez_compressed(path, frames=numpy.stack([numpy.frombuffer(pixels, dtype=numpy.uint8).reshape(height, width) for (pixels, width, height) in frames]))
+
+
+    @staticmethod
+    def synthesize_frames(parts: list[str], frame_size: int = FRAME_SIZE, frames_per_part: int = 2, blur: float = 0, noise: float = 0, drop_rate: float = 0, seed: int = None) -> list[tuple[bytes, int, int]]:
+        """
+            Renders each QR part as it would be captured off the screen: `frames_per_part`
+            camera frames per displayed part (the camera runs faster than the animation),
+            a Gaussian `blur` radius in pixels for focus/motion, Gaussian `noise` with
+            that standard deviation in gray levels, and a `drop_rate` fraction of
+            frames lost entirely.
+        """
+        rng = random.Random(seed)
+        frames = []
+        for part in parts:
+            frame = render_qr_luminance(part, frame_size=frame_size)
+            if blur:
+                frame = frame.filter(ImageFilter.GaussianBlur(blur))
+
+            for i in range(frames_per_part):
+                if rng.random() < drop_rate:
+                    continue
+
+                captured = frame
+                if noise:
+                    # effect_noise centers the noise on 128
+                    captured = ImageChops.add(frame, Image.effect_noise(frame.size, noise), scale=1.0, offset=-128)
+                frames.append((captured.tobytes(), captured.width, captured.height))
+        return frames
+
+
+    @property
+    def is_finished(self) -> bool:
+        """ True once the consumer has read the last frame """
+        return self.last_seq_num >= len(self.frames)
+
+
+    def start_video_stream_mode(self, resolution=None, framerate=None, format=None):
+        # The resolution is whatever was recorded and only an explicit replay
+        # framerate is honored; the scan screen's defaults would otherwise override
+        # the replay's pacing.
+        self.stream_start_time = time.perf_counter()
+        self.stream_start_seq_num = 0
+        self.last_seq_num = 0
+
+
+    def restart_video_stream_mode(self, resolution, framerate, format=None):
+        if self.stream_start_time is None:
+            raise Exception("Must call start_video_stream first.")
+        if self.framerate:
+            # Carry on from the frame the stream is currently on
+            self.stream_start_seq_num = self.captured_seq_num()
+            self.stream_start_time = time.perf_counter()
+            self.framerate = framerate
+
+
+    def stop_video_stream_mode(self):
+        self.stream_start_time = None
+
+
+    def captured_seq_num(self) -> int:
+        """ The newest frame that would have been captured by now """
+        if not self.framerate:
+            return len(self.frames)
+        elapsed = time.perf_counter() - self.stream_start_time
+        return min(len(self.frames), self.stream_start_seq_num + int(elapsed * self.framerate) + 1)
+
+
+    def read_video_stream(self, as_image=False):
+        if self.stream_start_time is None:
+            raise Exception("Must call start_video_stream first.")
+        (pixels, width, height) = self.frames[self.captured_seq_num() - 1]
+        image = Image.frombytes("L", (width, height), pixels)
+        if as_image:
+            return image.convert("RGBA")
+        return self.image_to_frame(image)
+
+
+    def read_next_video_frame(self, last_seq_num=0, as_image=False, as_luminance=False, newest=False, timeout=0.5):
+        if self.stream_start_time is None:
+            raise Exception("Must call start_video_stream first.")
+        if last_seq_num >= len(self.frames):
+            # End of the recording
+            return (last_seq_num, None)
+
+        if self.framerate:
+            deadline = time.perf_counter() + timeout
+            while self.captured_seq_num() <= last_seq_num:
+                if time.perf_counter() >= deadline:
+                    return (last_seq_num, None)
+                time.sleep(min(1 / self.framerate, deadline - time.perf_counter()) / 4)
+            captured_seq_num = self.captured_seq_num()
+            if newest:
+                seq_num = captured_seq_num
+            else:
+                # Oldest frame that would still be in the camera's ring buffer
+                seq_num = max(last_seq_num + 1, captured_seq_num - self.FRAME_BUFFER_SIZE + 1)
+        else:
+            seq_num = last_seq_num + 1
+
+        self.last_seq_num = max(self.last_seq_num, seq_num)
+        (pixels, width, height) = self.frames[seq_num - 1]
+        if as_luminance:
+            return (seq_num, (pixels, width, height))
+
+        image = Image.frombytes("L", (width, height), pixels)
+        if as_image:
+            return (seq_num, image.convert("RGBA"))
+        return (seq_num, self.image_to_frame(image))
+
+
+    @staticmethod
+    def image_to_frame(image):
+        # The raw stream is an RGB numpy array, same as PiVideoStream's
+        import numpy
+        return numpy.asarray(image.convert("RGB"), dtype=numpy.uint8)
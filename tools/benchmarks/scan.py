@@ -0,0 +1,291 @@
+import argparse
+import time
+
+from contextlib import contextmanager
+
+import numpy
+from embit.psbt import PSBT
+
+from replay_camera import FRAME_SIZE, ReplayCamera, render_qr_luminance
+from synthetic_psbt import make_psbt
+from seedsigner.hardware.camera import Camera
+from seedsigner.helpers.ur2.ur_decoder import URDecoder
+from seedsigner.models.decode_qr import BaseAnimatedQrDecoder, DecodeQR, DecodeQRStatus
+from seedsigner.models.decode_qr_pool import DecodeQRPool
+from seedsigner.models.encode_qr import UrPsbtQrEncoder
+from seedsigner.models.scan_frame_decoder import ScanFrameDecoder
+from seedsigner.models.scan_governor import ScanGovernor, ScanProfile
+from seedsigner.models.settings_definition import SettingsConstants
+
+"""
+Benchmarks for the camera -> zbar side of QR scanning.
+
+Needs numpy and libzbar, so it's meant to be run on the Pi itself.
+
+tldr:
+    pip3 install -e .
+    cd tools/benchmarks
+    python3 scan.py -h
+"""
+
+
+usage = """
+Benchmark the QR scan decode path.
+
+Usage:
+    # Decode fps of raw RGB frames (the old path) vs grayscale luminance frames
+    python3 scan.py luminance
+
+    # Change the number of decodes per measurement
+    python3 scan.py --iterations 200 luminance
+
+    # Replay a synthesised animated PSBT QR (UR2) through the scan decode loop
+    python3 scan.py replay --inputs 10 --density L --blur 1.5 --noise 20 --drop-rate 0.1
+
+    # ...arriving in real time at 6fps, decoded by 3 worker processes
+    python3 scan.py replay --framerate 6 --workers 3
+
+    # Replay your own PSBT, a text file of QR parts (one per line, e.g. BBQr), a
+    # directory of PNG camera frames, or a numpy .npz frame dump
+    python3 scan.py replay --psbt tx.psbt
+    python3 scan.py replay --parts parts.txt
+    python3 scan.py replay --png-dir frames/
+    python3 scan.py replay --npz frames.npz
+
+    # Save the synthesised frames to replay them again later
+    python3 scan.py replay --inputs 10 --save-npz frames.npz
+"""
+
+# Roughly one frame of each of the animated QR densities
+QR_PAYLOAD_LENGTHS = [50, 150, 400]
+
+
+def render_qr_frame(payload: str, frame_size: int = FRAME_SIZE) -> numpy.ndarray:
+    """ Renders `payload` as a QR filling most of an RGB camera-sized frame """
+    return numpy.asarray(render_qr_luminance(payload, frame_size=frame_size).convert("RGB"), dtype=numpy.uint8)
+
+
+
+def time_decodes(decode, iterations: int) -> float:
+    start = time.perf_counter()
+    for i in range(iterations):
+        if decode() is None:
+            raise Exception("Failed to decode the test frame")
+    return (time.perf_counter() - start) / iterations
+
+
+
+def benchmark_luminance(iterations: int):
+    print(f"{FRAME_SIZE}x{FRAME_SIZE} frames")
+    print(f"{'payload len':>11} | {'RGB frame':>16} | {'luminance':>16} | speedup")
+    for payload_len in QR_PAYLOAD_LENGTHS:
+        frame = render_qr_frame("A" * payload_len)
+
+        # The old scan loop handed the RGB numpy frame straight to pyzbar
+        rgb_secs = time_decodes(lambda: DecodeQR.extract_qr_data(frame, is_binary=True), iterations)
+
+        # Includes pulling the luminance out of the RGB frame
+        luminance_secs = time_decodes(lambda: DecodeQR.extract_qr_data_from_luminance(*Camera.frame_to_luminance(frame), is_binary=True), iterations)
+
+        print(f"{payload_len:>11} | {1 / rgb_secs:10.1f} fps | {1 / luminance_secs:10.1f} fps | {rgb_secs / luminance_secs:5.2f}x")
+
+
+
+@contextmanager
+def timed_stages():
+    """
+        Temporarily wraps each stage of the decode path with a timer. Yields
+        {stage: [total_secs, num_calls]}.
+
+        zbar only shows up when it runs in this process, i.e. not with decode workers.
+    """
+    stages = {
+        "zbar": (DecodeQR, "decode_luminance"),
+        "type detection": (DecodeQR, "detect_segment_type"),
+        "fountain (UR)": (URDecoder, "receive_part"),
+        "segments (BBQr, Specter)": (BaseAnimatedQrDecoder, "add"),
+    }
+    stage_times = {stage: [0.0, 0] for stage in stages}
+
+    def timed(stage, func):
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                stage_times[stage][0] += time.perf_counter() - start
+                stage_times[stage][1] += 1
+        return wrapper
+
+    originals = []
+    for stage, (cls, name) in stages.items():
+        original = cls.__dict__[name]
+        originals.append((cls, name, original))
+        if isinstance(original, staticmethod):
+            setattr(cls, name, staticmethod(timed(stage, original.__func__)))
+        else:
+            setattr(cls, name, timed(stage, original))
+    try:
+        yield stage_times
+    finally:
+        for (cls, name, original) in originals:
+            setattr(cls, name, original)
+
+
+
+class FixedScanGovernor(ScanGovernor):
+    """ Only one profile to pick from, so the replay's framerate is never changed """
+    PROFILES = [ScanProfile(resolution=(FRAME_SIZE, FRAME_SIZE), framerate=0)]
+
+    def __init__(self):
+        super().__init__(profile_index=0)
+
+
+
+def replay_scan(camera: ReplayCamera, decoder: DecodeQR, governor: ScanGovernor, decode_pool: DecodeQRPool = None) -> dict:
+    """
+        Feeds the recording through the scan screen's own per-frame decode step
+        (`ScanFrameDecoder`, as used by `ScanScreen._run()`) until the decoder is done
+        or the recording runs out.
+    """
+    frame_decoder = ScanFrameDecoder(camera=camera, decoder=decoder, governor=governor, decode_pool=decode_pool)
+    camera.start_video_stream_mode()
+    seq_num = 0
+    num_decodes = 0
+    completed_seq_num = None
+    status = None
+    start = time.perf_counter()
+    try:
+        while completed_seq_num is None:
+            (seq_num, luminance) = camera.read_next_video_frame(seq_num, as_luminance=True)
+            if luminance is None and camera.is_finished:
+                if not (decode_pool and decode_pool.pending):
+                    break
+                # Waiting on the workers' last frames
+                time.sleep(0.001)
+
+            for (frame_seq_num, status) in frame_decoder.decode_frame(seq_num, luminance):
+                num_decodes += 1
+                if status in (DecodeQRStatus.COMPLETE, DecodeQRStatus.INVALID):
+                    completed_seq_num = frame_seq_num
+    finally:
+        elapsed = time.perf_counter() - start
+        camera.stop_video_stream_mode()
+
+    return dict(
+        status=status,
+        elapsed=elapsed,
+        num_decodes=num_decodes,
+        frames_to_complete=completed_seq_num,
+    )
+
+
+
+def load_replay_frames(args) -> list[tuple[bytes, int, int]]:
+    if args.png_dir:
+        return ReplayCamera.load_png_dir(args.png_dir)
+
+    if args.npz:
+        return ReplayCamera.load_npz(args.npz)
+
+    if args.parts:
+        with open(args.parts) as parts_file:
+            parts = [line.strip() for line in parts_file if line.strip()]
+        # The display just loops through a fixed set of parts
+        parts = parts * args.loops
+
+    else:
+        if args.psbt:
+            with open(args.psbt, "rb") as psbt_file:
+                psbt_bytes = psbt_file.read()
+            psbt = PSBT.parse(psbt_bytes) if psbt_bytes.startswith(b"psbt\xff") else PSBT.from_string(psbt_bytes.decode().strip())
+        else:
+            psbt = make_psbt(args.inputs, seed=args.seed)
+
+        # The fountain encoder never repeats itself past the first loop
+        encoder = UrPsbtQrEncoder(psbt=psbt, qr_density=args.density)
+        parts = [encoder.next_part() for i in range(encoder.seq_len() * args.loops)]
+        print(f"{len(psbt.serialize())} byte PSBT: {encoder.seq_len()} UR parts")
+
+    return ReplayCamera.synthesize_frames(parts, frame_size=args.frame_size, frames_per_part=args.frames_per_part, blur=args.blur, noise=args.noise, drop_rate=args.drop_rate, seed=args.seed)
+
+
+
+def benchmark_replay(args):
+    frames = load_replay_frames(args)
+    (pixels, width, height) = frames[0]
+    print(f"{len(frames)} frames ({width}x{height})")
+    if args.save_npz:
+        ReplayCamera.save_npz(args.save_npz, frames)
+        print(f"Saved frames to {args.save_npz}")
+
+    governor = ScanGovernor() if args.governor else FixedScanGovernor()
+    framerate = governor.profile.framerate if args.governor else args.framerate
+    camera = ReplayCamera.install(frames, framerate=framerate)
+
+    decode_pool = None
+    if args.workers:
+        frame_size = (max(frame[1] for frame in frames), max(frame[2] for frame in frames))
+        decode_pool = DecodeQRPool(num_workers=args.workers, frame_size=frame_size)
+
+    decoder = DecodeQR()
+    try:
+        with timed_stages() as stage_times:
+            result = replay_scan(camera, decoder, governor=governor, decode_pool=decode_pool)
+    finally:
+        if decode_pool:
+            decode_pool.shutdown()
+
+    elapsed = result["elapsed"]
+    if result["frames_to_complete"]:
+        print(f"{result['status'].name} ({decoder.qr_type}) after {result['frames_to_complete']} of {len(frames)} frames")
+    else:
+        print(f"Not complete after {len(frames)} frames ({decoder.get_percent_complete()}%)")
+    print(f"Decoded {result['num_decodes']} frames in {elapsed:0.2f}s: {result['num_decodes'] / elapsed:0.1f} decode fps")
+    print(f"ROI scans: {decoder.roi_scans}, full frame scans: {decoder.full_frame_scans}, repeated payloads skipped: {decoder.recent_payloads_hits}")
+    if args.governor:
+        print(f"Final scan profile: {governor.profile}")
+
+    print(f"{'stage':>24} | {'calls':>6} | {'total':>10} | {'per call':>10} | {'of elapsed':>10}")
+    for stage, (total_secs, num_calls) in stage_times.items():
+        if not num_calls:
+            continue
+        print(f"{stage:>24} | {num_calls:>6} | {total_secs * 1000:7.1f} ms | {total_secs * 1000 / num_calls:7.3f} ms | {100 * total_secs / elapsed:9.1f}%")
+
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=usage, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", "--iterations", type=int, default=50, help="Number of decodes per measurement")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True, help="Which part of the scan path to benchmark")
+    subparsers.add_parser("luminance", help="Decode fps of RGB vs luminance frames")
+
+    replay_parser = subparsers.add_parser("replay", help="Replay frames through the scan decode loop")
+    source = replay_parser.add_mutually_exclusive_group()
+    source.add_argument("--png-dir", help="Directory of PNG camera frames")
+    source.add_argument("--npz", help="numpy .npz dump of camera frames")
+    source.add_argument("--parts", help="Text file of QR parts (one per line) to render as frames")
+    source.add_argument("--psbt", help="PSBT file (binary or base64) to render as UR2 frames")
+    source.add_argument("--inputs", type=int, default=5, help="Number of inputs in the synthesised PSBT (default: 5)")
+
+    synth_group = replay_parser.add_argument_group("synthesised frames")
+    synth_group.add_argument("--density", choices=[SettingsConstants.DENSITY__LOW, SettingsConstants.DENSITY__MEDIUM, SettingsConstants.DENSITY__HIGH], default=SettingsConstants.DENSITY__MEDIUM, help="Animated QR density (default: M)")
+    synth_group.add_argument("--loops", type=int, default=3, help="Times through the animation (default: 3)")
+    synth_group.add_argument("--frame-size", type=int, default=FRAME_SIZE, help=f"Square frame size in pixels (default: {FRAME_SIZE})")
+    synth_group.add_argument("--frames-per-part", type=int, default=2, help="Camera frames captured per displayed part (default: 2)")
+    synth_group.add_argument("--blur", type=float, default=0, help="Gaussian blur radius in pixels")
+    synth_group.add_argument("--noise", type=float, default=0, help="Std dev of Gaussian sensor noise in gray levels")
+    synth_group.add_argument("--drop-rate", type=float, default=0, help="Fraction of frames lost")
+    synth_group.add_argument("--seed", type=int, help="Random seed for the PSBT and dropped frames")
+    synth_group.add_argument("--save-npz", help="Also save the frames to this .npz file")
+
+    replay_parser.add_argument("--framerate", type=float, default=0, help="Deliver frames in real time at this fps; frames the decoder is too slow for are skipped (default: as fast as the decoder runs)")
+    replay_parser.add_argument("--governor", action="store_true", help="Real time frames at the framerate picked by ScanGovernor, as on the scan screen")
+    replay_parser.add_argument("--workers", type=int, default=0, help="Decode in this many worker processes (DecodeQRPool)")
+    args = parser.parse_args()
+
+    if args.benchmark == "luminance":
+        benchmark_luminance(args.iterations)
+
+    elif args.benchmark == "replay":
+        benchmark_replay(args)
@@ -0,0 +1,19 @@
+import random
+
+from embit.psbt import PSBT
+from embit.script import Script
+from embit.transaction import Transaction, TransactionInput, TransactionOutput
+
+
+
+def make_psbt(num_inputs: int, num_outputs: int = 2, seed: int = None) -> PSBT:
+    """ An unsigned native segwit PSBT; its size grows with `num_inputs` like a real one's """
+    rng = random.Random(seed)
+    tx = Transaction(
+        vin=[TransactionInput(rng.randbytes(32), rng.randrange(4)) for i in range(num_inputs)],
+        vout=[TransactionOutput(rng.randrange(10**4, 10**8), Script(b"\x00\x14" + rng.randbytes(20))) for i in range(num_outputs)],
+    )
+    psbt = PSBT(tx)
+    for psbt_in in psbt.inputs:
+        psbt_in.witness_utxo = TransactionOutput(rng.randrange(10**4, 10**8), Script(b"\x00\x14" + rng.randbytes(20)))
+    return psbt
@@ -0,0 +1,293 @@
+import argparse
+import os
+import time
+import timeit
+import tracemalloc
+
+from seedsigner.helpers.ur2 import bytewords, crc32, fountain_utils, utils
+from seedsigner.helpers.ur2.ur import UR
+from seedsigner.helpers.ur2.ur_decoder import URDecoder
+from seedsigner.helpers.ur2.ur_encoder import UREncoder
+from seedsigner.helpers.ur2.cbor_lite import CBORDecoder
+from seedsigner.helpers.ur2.fountain_encoder import Part
+from seedsigner.helpers.ur2.random_sampler import RandomSampler
+from seedsigner.helpers.ur2.xoshiro256 import Xoshiro256
+
+"""
+Micro-benchmarks for the UR2 fountain code stack.
+
+These run on any machine but are mainly meant to be run on the Pi itself so that we
+can see the real cost of each stage of encoding/decoding an animated QR.
+
+tldr:
+    pip3 install -e .
+    cd tools/benchmarks
+    python3 ur2.py -h
+"""
+
+
+usage = """
+Benchmark individual stages of the UR2 (animated "crypto-psbt" QR) stack.
+
+Usage:
+    # XOR throughput for fragment lengths 10-400 bytes
+    python3 ur2.py xor
+
+    # Fragment selection (degree sampling + shuffle) per mixed part
+    python3 ur2.py fragments
+
+    # Per-part UREncoder.next_part / URDecoder.receive_part cost, pure-Python vs C CRC-32
+    python3 ur2.py crc32
+
+    # Minimal-style bytewords encode/decode of whole UR part bodies
+    python3 ur2.py bytewords
+
+    # Time and tracemalloc'd memory per fountain Part CBOR decode
+    python3 ur2.py cbor
+
+    # Increase the number of iterations per measurement
+    python3 ur2.py --iterations 20000 xor
+"""
+
+
+FRAGMENT_LENGTHS = [10, 30, 60, 120, 200, 300, 400]
+SEQ_LENS = [10, 50, 100, 250]
+
+# Roughly a large multi-input PSBT; fragment lengths match the DENSITY__* settings
+MESSAGE_LEN = 5000
+DENSITY_FRAGMENT_LENGTHS = [10, 30, 120]
+
+
+
+def xor_bytewise(target, source):
+    """ The original one-Python-int-at-a-time implementation, for comparison """
+    count = len(target)
+    assert count == len(source)
+    for i in range(count):
+        target[i] ^= source[i]
+
+
+
+def choose_fragments_full_shuffle(seq_num, seq_len, checksum):
+    """ The original implementation: new alias table and a full shuffle per part """
+    if seq_num <= seq_len:
+        return set([seq_num - 1])
+    rng = Xoshiro256.from_bytes(utils.int_to_bytes(seq_num) + utils.int_to_bytes(checksum))
+    degree = RandomSampler([1.0 / i for i in range(1, seq_len + 1)]).next(lambda: rng.next_double()) + 1
+    return set(fountain_utils.shuffled(list(range(seq_len)), rng)[0:degree])
+
+
+
+def encode_minimal_sliced(buf):
+    """ The original implementation: slice BYTEWORDS and concatenate per byte """
+    result = ''
+    crc_buf = bytewords.add_crc(buf)
+    for i in range(len(crc_buf)):
+        offset = crc_buf[i] * 4
+        result += bytewords.BYTEWORDS[offset] + bytewords.BYTEWORDS[offset + 3]
+    return result
+
+
+
+WORD_ARRAY = [-1] * (26 * 26)
+for i in range(256):
+    WORD_ARRAY[(ord(bytewords.BYTEWORDS[i * 4 + 3]) - ord('a')) * 26 + ord(bytewords.BYTEWORDS[i * 4]) - ord('a')] = i
+
+def decode_minimal_per_word(s):
+    """ The original implementation: per-word ord()/lower() into a 26x26 array """
+    buf = bytearray()
+    for word in utils.partition(s, 2):
+        x = ord(word[0].lower()) - ord('a')
+        y = ord(word[1].lower()) - ord('a')
+        buf.append(WORD_ARRAY[y * 26 + x])
+    return buf[0:-4]
+
+
+
+class BytewiseCBORDecoder(CBORDecoder):
+    """ The original header decoding: builds multi-byte values one input byte at a time """
+    NUM_VALUE_BYTES = {24: 1, 25: 2, 26: 4, 27: 8}
+
+    def decodeTagAndValue(self, flags):
+        (tag, additional, length) = self.decodeTagAndAdditional(flags)
+        if additional < 24:
+            return (tag, additional, length)
+
+        num_bytes = self.NUM_VALUE_BYTES[additional]
+        if len(self.buf) - self.pos < num_bytes:
+            raise Exception("Not enough input")
+        value = 0
+        for i in range(num_bytes):
+            value = (value << 8) | self.buf[self.pos]
+            self.pos += 1
+        return (tag, value, self.pos)
+
+
+
+def print_row(label, baseline_secs, optimized_secs, iterations):
+    baseline_us = baseline_secs / iterations * 1e6
+    optimized_us = optimized_secs / iterations * 1e6
+    print(f"{label:>12} | {baseline_us:10.2f}us | {optimized_us:10.2f}us | {baseline_us / optimized_us:6.1f}x")
+
+
+
+def benchmark_xor(iterations: int):
+    print(f"{'fragment len':>12} | {'bytewise':>12} | {'bulk':>12} | speedup")
+    for fragment_len in FRAGMENT_LENGTHS:
+        a = os.urandom(fragment_len)
+        b = os.urandom(fragment_len)
+
+        baseline = timeit.timeit(lambda: xor_bytewise(bytearray(a), b), number=iterations)
+        optimized = timeit.timeit(lambda: utils.xor_bytes(a, b), number=iterations)
+        print_row(f"{fragment_len} bytes", baseline, optimized, iterations)
+
+
+
+def benchmark_fragments(iterations: int):
+    # Selection is only expensive for the mixed parts, i.e. seq_num > seq_len
+    checksum = 0x12345678
+    print(f"{'seq_len':>12} | {'original':>12} | {'cached':>12} | speedup | {'table hit':>12}")
+    for seq_len in SEQ_LENS:
+        seq_nums = list(range(seq_len + 1, seq_len + 1 + iterations))
+
+        start = time.perf_counter()
+        for seq_num in seq_nums:
+            choose_fragments_full_shuffle(seq_num, seq_len, checksum)
+        baseline = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for seq_num in seq_nums:
+            fountain_utils.choose_fragments(seq_num, seq_len, checksum)
+        optimized = time.perf_counter() - start
+
+        # Second pass through an already-populated table (i.e. a looping animation)
+        table = fountain_utils.FragmentSelectionTable(seq_len, checksum, cycle_len=seq_nums[-1])
+        table.precompute()
+        start = time.perf_counter()
+        for seq_num in seq_nums:
+            table.get(seq_num)
+        table_hit = time.perf_counter() - start
+
+        baseline_us = baseline / iterations * 1e6
+        optimized_us = optimized / iterations * 1e6
+        table_hit_us = table_hit / iterations * 1e6
+        print(f"{seq_len:>12} | {baseline_us:10.2f}us | {optimized_us:10.2f}us | {baseline_us / optimized_us:6.1f}x | {table_hit_us:10.2f}us")
+
+
+
+def benchmark_bytewords(iterations: int):
+    print(f"{'stage':>12} | {'original':>12} | {'table':>12} | speedup")
+    for fragment_len in DENSITY_FRAGMENT_LENGTHS:
+        # A fountain part's CBOR is the fragment plus ~10-20 bytes of header
+        buf = os.urandom(fragment_len + 16)
+        encoded = bytewords.encode_minimal(buf).upper()
+        assert decode_minimal_per_word(encoded) == bytewords.decode(encoded, 0, 2)
+
+        baseline = timeit.timeit(lambda: encode_minimal_sliced(buf), number=iterations)
+        optimized = timeit.timeit(lambda: bytewords.encode_minimal(buf), number=iterations)
+        print_row(f"encode {fragment_len}", baseline, optimized, iterations)
+
+        baseline = timeit.timeit(lambda: decode_minimal_per_word(encoded), number=iterations)
+        optimized = timeit.timeit(lambda: bytewords.decode(encoded, 0, 2), number=iterations)
+        print_row(f"decode {fragment_len}", baseline, optimized, iterations)
+
+
+
+def measure_allocations(func, iterations: int):
+    """ Returns tracemalloc's (total bytes allocated, peak bytes) per call """
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.take_snapshot()
+        results = [func() for i in range(iterations)]
+        total = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(baseline, "filename"))
+        del results
+
+        tracemalloc.reset_peak()
+        start, _ = tracemalloc.get_traced_memory()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return total / iterations, peak - start
+
+
+
+def benchmark_cbor(iterations: int):
+    """
+    Holds on to every decoded Part so that tracemalloc sees what each decode keeps
+    around, and also reports the transient peak of a single decode.
+    """
+    print(f"{'fragment len':>12} | {'decoder':>8} | {'time':>10} | {'retained':>10} | {'peak':>10}")
+    for fragment_len in DENSITY_FRAGMENT_LENGTHS + [400]:
+        # Same type the bytewords decoder hands to Part.from_cbor
+        cbor = bytearray(Part(1000, 500, 50000, 0x12345678, os.urandom(fragment_len)).cbor())
+
+        def decode(decoder_class):
+            decoder = decoder_class(cbor)
+            decoder.decodeArraySize()
+            for i in range(4):
+                decoder.decodeUnsigned()
+            return decoder.decodeBytes()[0]
+
+        for label, decoder_class in [("bytewise", BytewiseCBORDecoder), ("struct", CBORDecoder)]:
+            secs = timeit.timeit(lambda: decode(decoder_class), number=iterations) / iterations
+            retained, peak = measure_allocations(lambda: decode(decoder_class), min(iterations, 1000))
+            print(f"{fragment_len:>12} | {label:>8} | {secs * 1e6:8.2f}us | {retained:8.0f} B | {peak:8.0f} B")
+
+
+
+def time_ur_parts(message: bytearray, fragment_len: int, iterations: int):
+    """ Returns the mean (encode, decode) seconds per part """
+    encoder = UREncoder(UR("crypto-psbt", message), max_fragment_len=fragment_len)
+    start = time.perf_counter()
+    parts = [encoder.next_part() for i in range(iterations)]
+    encode_secs = (time.perf_counter() - start) / iterations
+
+    # Feed the same part stream into fresh decoders, restarting whenever one completes
+    decoder = URDecoder()
+    start = time.perf_counter()
+    for part in parts:
+        if decoder.is_complete():
+            decoder = URDecoder()
+        decoder.receive_part(part)
+    decode_secs = (time.perf_counter() - start) / iterations
+
+    return encode_secs, decode_secs
+
+
+
+def benchmark_crc32(iterations: int):
+    message = bytearray(os.urandom(MESSAGE_LEN))
+    c_crc32 = crc32.BINASCII_CRC32
+    print(f"{MESSAGE_LEN} byte message")
+    print(f"{'fragment len':>12} | {'stage':>7} | {'pure crc32':>12} | {'C crc32':>12} | saved/part")
+    for fragment_len in DENSITY_FRAGMENT_LENGTHS:
+        try:
+            crc32.BINASCII_CRC32 = None
+            pure = time_ur_parts(message, fragment_len, iterations)
+        finally:
+            crc32.BINASCII_CRC32 = c_crc32
+        accelerated = time_ur_parts(message, fragment_len, iterations)
+
+        for label, pure_secs, accelerated_secs in zip(["encode", "decode"], pure, accelerated):
+            print(f"{fragment_len:>12} | {label:>7} | {pure_secs * 1e6:10.1f}us | {accelerated_secs * 1e6:10.1f}us | {(pure_secs - accelerated_secs) * 1e6:8.1f}us")
+
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=usage, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", "--iterations", type=int, default=5000, help="Number of iterations per measurement")
+    parser.add_argument("benchmark", choices=["xor", "fragments", "crc32", "bytewords", "cbor"], help="Which UR2 stage to benchmark")
+    args = parser.parse_args()
+
+    if args.benchmark == "xor":
+        benchmark_xor(args.iterations)
+    elif args.benchmark == "fragments":
+        benchmark_fragments(args.iterations)
+    elif args.benchmark == "crc32":
+        benchmark_crc32(args.iterations)
+    elif args.benchmark == "bytewords":
+        benchmark_bytewords(args.iterations)
+    elif args.benchmark == "cbor":
+        benchmark_cbor(args.iterations)